@@ -0,0 +1,87 @@
+from __future__ import annotations
+import http.client
+import json
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+DB_QUERIES_HEADER = "x-db-queries"
+
+
+@dataclass
+class Result:
+    status: int
+    seconds: float
+    db_queries: Optional[int]
+    body: bytes = b""
+
+
+class Client:
+    """Keep-alive HTTP client with one connection per calling thread.
+
+    Deliberately stdlib-only so the suite runs anywhere the service does,
+    and so client overhead stays small and predictable next to the server's.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.netloc, timeout=self.timeout)
+            conn.connect()
+            # Small requests must not wait on Nagle + delayed ACK (~40 ms).
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method: str, path: str, body: Any = None, keep_body: bool = False) -> Result:
+        payload = None if body is None else json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+
+        start = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request(method, self.prefix + path, body=payload, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException):
+            # Server closed an idle keep-alive socket (or died); reconnect once.
+            self._reset()
+            conn = self._connection()
+            conn.request(method, self.prefix + path, body=payload, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        elapsed = time.perf_counter() - start
+
+        queries = resp.getheader(DB_QUERIES_HEADER)
+        return Result(
+            status=resp.status,
+            seconds=elapsed,
+            db_queries=int(queries) if queries is not None else None,
+            body=data if keep_body else b"",
+        )
+
+    def json(self, method: str, path: str, body: Any = None) -> Any:
+        result = self.request(method, path, body, keep_body=True)
+        if result.status >= 400:
+            raise RuntimeError(f"{method} {path} -> {result.status}: {result.body[:500]!r}")
+        return json.loads(result.body) if result.body else None
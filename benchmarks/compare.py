@@ -0,0 +1,79 @@
+"""Compare two benchmark result files, scenario by scenario.
+
+    python -m benchmarks.compare benchmarks/results/abc123.json benchmarks/results/def456.json
+    python -m benchmarks.compare base.json head.json --fail-over 10   # exit 1 on a >10% p95 regression
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Dict, Optional, Sequence, Tuple
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "db_queries_per_request")
+
+
+def _load(path: str) -> Tuple[dict, Dict[Tuple[str, int], dict]]:
+    with open(path) as fh:
+        data = json.load(fh)
+    return data["meta"], {(row["scenario"], row["concurrency"]): row for row in data["results"]}
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if before is None or after is None or before == 0:
+        return None
+    return (after - before) / before * 100
+
+
+def _label(meta: dict) -> str:
+    return f"{meta.get('commit') or '?'}{'-dirty' if meta.get('dirty') else ''}"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__.split("\n\n")[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument(
+        "--fail-over",
+        type=float,
+        metavar="PCT",
+        help="Exit 1 if any shared scenario's p95 grows by more than PCT percent.",
+    )
+    args = parser.parse_args(argv)
+
+    base_meta, base = _load(args.base)
+    head_meta, head = _load(args.head)
+    if base_meta.get("catalog") != head_meta.get("catalog"):
+        print(f"warning: catalogs differ: {base_meta.get('catalog')} vs {head_meta.get('catalog')}")
+
+    print(f"base {_label(base_meta)} -> head {_label(head_meta)}")
+    print(f"{'scenario':<32} {'c':>4}  " + "  ".join(f"{m:>24}" for m in METRICS))
+
+    regressions = []
+    for key in sorted(set(base) & set(head)):
+        cells = []
+        for metric in METRICS:
+            before, after = base[key].get(metric), head[key].get(metric)
+            change = _change(before, after)
+            text = f"{before if before is not None else '-'} -> {after if after is not None else '-'}"
+            if change is not None:
+                text += f" ({change:+.0f}%)"
+            cells.append(f"{text:>24}")
+        print(f"{key[0]:<32} {key[1]:>4}  " + "  ".join(cells))
+
+        p95 = _change(base[key]["p95_ms"], head[key]["p95_ms"])
+        if args.fail_over is not None and p95 is not None and p95 > args.fail_over:
+            regressions.append((key, p95))
+
+    for key in sorted(set(base) ^ set(head)):
+        print(f"{key[0]:<32} {key[1]:>4}  only in {'base' if key in base else 'head'}")
+
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed p95 by more than {args.fail_over}%:")
+        for (name, concurrency), change in regressions:
+            print(f"  {name} c={concurrency}: {change:+.1f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
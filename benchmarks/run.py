@@ -0,0 +1,324 @@
+"""Drive the service's endpoints at fixed concurrency levels and record latency.
+
+Start the service against a disposable database first, e.g.::
+
+    DB_HOST=/tmp/mysql.sock ... uvicorn main:app --port 8080 --workers 1
+
+or, to measure the service without MySQL, on the in-memory engine::
+
+    STORAGE_BACKEND=memory uvicorn main:app --port 8080 --workers 1
+
+then::
+
+    python -m benchmarks.run --base-url http://127.0.0.1:8080 \\
+        --categories 50 --products 5000 --concurrency 1,8,32 --requests 500
+
+    # only product reads, plus the heavy exports
+    python -m benchmarks.run --scenarios products.get products.list products.export
+
+    # replay a recorded request log (JSON lines: {"method", "path", "body"?})
+    python -m benchmarks.run --replay traffic.jsonl --no-seed
+
+Paths in a replay log may use ``{product_id}``, ``{category_id}`` and
+``{inventory_id}``; each is filled with a random ID from the catalog.
+
+Results go to ``benchmarks/results/<commit>.json``; compare two runs with
+``python -m benchmarks.compare``. Runs are reproducible for a given
+``--seed``. Every request list is generated up front from seeded RNGs, and
+the catalog is rebuilt with the same seed.
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.client import Client, Result
+from benchmarks.scenarios import Request, Scenario, select
+from benchmarks.seed import Catalog, seed, seed_disposable
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+PLACEHOLDER = re.compile(r"\{(product_id|category_id|inventory_id)\}")
+UUID_IN_PATH = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(name: str, concurrency: int, results: List[Result], wall: float) -> dict:
+    latencies = sorted(r.seconds * 1000 for r in results)
+    queries = [r.db_queries for r in results if r.db_queries is not None]
+    statuses: Dict[str, int] = {}
+    for r in results:
+        statuses[str(r.status)] = statuses.get(str(r.status), 0) + 1
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(results),
+        "errors": sum(1 for r in results if r.status >= 400),
+        "statuses": statuses,
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(len(results) / wall, 2) if wall > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        # None when the service does not send X-DB-Queries.
+        "db_queries_per_request": round(sum(queries) / len(queries), 3) if queries else None,
+    }
+
+
+def drive(client: Client, requests: List[Request], concurrency: int) -> Tuple[List[Result], float]:
+    """Send ``requests`` using ``concurrency`` workers; return (results, wall seconds)."""
+    results: List[Optional[Result]] = [None] * len(requests)
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with lock:
+                index = next(counter)
+            if index >= len(requests):
+                return
+            method, path, body = requests[index]
+            try:
+                results[index] = client.request(method, path, body)
+            except Exception:
+                results[index] = Result(status=599, seconds=0.0, db_queries=None)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return results, time.perf_counter() - start
+
+
+# ----------------------------------------------------------------------
+# Replay
+# ----------------------------------------------------------------------
+
+
+def load_replay(path: str) -> List[dict]:
+    entries = []
+    with open(path) as fh:
+        for line_no, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            if "method" not in entry or "path" not in entry:
+                raise ValueError(f"{path}:{line_no}: each entry needs 'method' and 'path'")
+            entries.append(entry)
+    if not entries:
+        raise ValueError(f"{path}: no requests to replay")
+    return entries
+
+
+def replay_key(entry: dict) -> str:
+    """Group replayed requests by route shape so per-ID paths share one row."""
+    if entry.get("name"):
+        return entry["name"]
+    path = UUID_IN_PATH.sub("{id}", entry["path"].split("?", 1)[0])
+    return f"{entry['method'].upper()} {path}"
+
+
+def replay_requests(entries: List[dict], catalog: Catalog, rng: random.Random) -> List[Request]:
+    pools = {
+        "product_id": catalog.product_ids,
+        "category_id": catalog.category_ids,
+        "inventory_id": catalog.inventory_ids,
+    }
+
+    def fill(match: "re.Match") -> str:
+        ids = pools[match.group(1)]
+        if not ids:
+            raise ValueError(f"Replay needs {match.group(1)} values but the catalog has none")
+        return rng.choice(ids)
+
+    return [(e["method"].upper(), PLACEHOLDER.sub(fill, e["path"]), e.get("body")) for e in entries]
+
+
+# ----------------------------------------------------------------------
+# Catalog
+# ----------------------------------------------------------------------
+
+
+def discover(client: Client, limit: int = 1000) -> Catalog:
+    """Use whatever is already in the database instead of seeding."""
+    catalog = Catalog()
+    catalog.category_ids = [r["category_id"] for r in client.json("GET", f"/categories?limit={limit}&fields=category_id")]
+    catalog.product_ids = [r["product_id"] for r in client.json("GET", f"/products?limit={limit}&fields=product_id")]
+    catalog.inventory_ids = [
+        r["inventory_id"] for r in client.json("GET", f"/inventories?limit={limit}&fields=inventory_id")
+    ]
+    return catalog
+
+
+def git_commit() -> Dict[str, Any]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=root,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def print_row(row: dict) -> None:
+    queries = row["db_queries_per_request"]
+    print(
+        f"{row['scenario']:<32} c={row['concurrency']:<4} "
+        f"{row['throughput_rps']:>9.1f} rps  p50 {row['p50_ms']:>8.2f}  p95 {row['p95_ms']:>8.2f}  "
+        f"p99 {row['p99_ms']:>8.2f} ms  db {('-' if queries is None else f'{queries:.1f}'):>5}  "
+        f"err {row['errors']}",
+        flush=True,
+    )
+
+
+def run_scenario(client: Client, scenario: Scenario, catalog: Catalog, args: argparse.Namespace) -> List[dict]:
+    rows = []
+    for concurrency in args.concurrency:
+        level_rng = random.Random(f"{args.seed}:{scenario.name}:{concurrency}")
+        if scenario.consumes:
+            seed_disposable(client, level_rng, catalog, scenario.consumes, args.warmup + args.requests)
+
+        warmup = [scenario.make(catalog, level_rng) for _ in range(args.warmup)]
+        measured = [scenario.make(catalog, level_rng) for _ in range(args.requests)]
+        if warmup:
+            drive(client, warmup, concurrency)
+        results, wall = drive(client, measured, concurrency)
+
+        row = summarize(scenario.name, concurrency, results, wall)
+        print_row(row)
+        rows.append(row)
+    return rows
+
+
+
+# ----------------------------------------------------------------------
+# Entry point
+# ----------------------------------------------------------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default=os.environ.get("BENCH_BASE_URL", "http://127.0.0.1:8080"))
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--inventories-per-product", type=int, default=1)
+    parser.add_argument("--no-seed", action="store_true", help="Benchmark the data already in the database.")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda s: [int(c) for c in s.split(",") if c],
+        default=[1, 8, 32],
+        help="Comma-separated worker counts, e.g. 1,8,32.",
+    )
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests per scenario and level.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each level.")
+    parser.add_argument("--scenarios", nargs="*", help="Names or group prefixes like products. (default: all but exports).")
+    parser.add_argument("--replay", help="JSON-lines request log to replay instead of the scenarios.")
+    parser.add_argument("--seed", type=int, default=4153)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    client = Client(args.base_url)
+    rng = random.Random(args.seed)
+    started_at = datetime.now(timezone.utc).isoformat()
+
+    started = time.perf_counter()
+    if args.no_seed:
+        catalog = discover(client)
+    else:
+        catalog = seed(client, rng, args.categories, args.products, args.inventories_per_product)
+    print(
+        f"catalog: {len(catalog.category_ids)} categories, {len(catalog.product_ids)} products, "
+        f"{len(catalog.inventory_ids)} inventories ({time.perf_counter() - started:.1f}s)",
+        flush=True,
+    )
+
+    rows: List[dict] = []
+    if args.replay:
+        entries = load_replay(args.replay)
+        keys = [replay_key(e) for e in entries]
+        for concurrency in args.concurrency:
+            level_rng = random.Random(f"{args.seed}:replay:{concurrency}")
+            requests = replay_requests(entries, catalog, level_rng)
+            results, wall = drive(client, requests, concurrency)
+            row = summarize(f"replay:{os.path.basename(args.replay)}", concurrency, results, wall)
+            print_row(row)
+            rows.append(row)
+            # Per-route breakdown; throughput is the route's share of the mixed run.
+            by_key: Dict[str, List[Result]] = {}
+            for key, result in zip(keys, results):
+                by_key.setdefault(key, []).append(result)
+            for key, group in sorted(by_key.items()):
+                sub = summarize(key, concurrency, group, wall)
+                sub["replay"] = True
+                rows.append(sub)
+    else:
+        for scenario in select(args.scenarios):
+            rows.extend(run_scenario(client, scenario, catalog, args))
+
+    meta = {
+        **git_commit(),
+        "started_at": started_at,
+        "base_url": args.base_url,
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "catalog": {
+            "categories": len(catalog.category_ids),
+            "products": len(catalog.product_ids),
+            "inventories": len(catalog.inventory_ids),
+            "seeded": not args.no_seed,
+        },
+        "requests_per_level": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "replay": args.replay,
+    }
+
+    output = args.output
+    if output is None:
+        name = meta["commit"] or "unknown"
+        if meta["dirty"]:
+            name += "-dirty"
+        output = os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump({"meta": meta, "results": rows}, fh, indent=2)
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
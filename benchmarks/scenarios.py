@@ -0,0 +1,171 @@
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.seed import (
+    ADJECTIVES,
+    NOUNS,
+    Catalog,
+    category_payload,
+    inventory_payload,
+    product_name,
+    product_payload,
+)
+
+# (method, path, json body or None)
+Request = Tuple[str, str, Any]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    make: Callable[[Catalog, random.Random], Request]
+    # Delete scenarios consume pre-created rows of this kind, one per request.
+    consumes: Optional[str] = None
+    # Whole-table streams; excluded unless asked for by name.
+    heavy: bool = False
+
+
+def _ids(rng: random.Random, ids: List[str], count: int) -> str:
+    return ",".join(rng.sample(ids, min(count, len(ids))))
+
+
+def _query(path: str, **params: Any) -> str:
+    params = {k: v for k, v in params.items() if v is not None}
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+SCENARIOS: List[Scenario] = [
+    # ---------------------------------------------------------------- products
+    Scenario("products.list", lambda c, r: ("GET", "/products?limit=20", None)),
+    Scenario(
+        "products.list_filtered",
+        lambda c, r: (
+            "GET",
+            _query(
+                "/products",
+                category_id=r.choice(c.category_ids),
+                min_price=r.choice([None, 50, 200]),
+                min_rating=r.choice([None, 3.5]),
+                sort=r.choice(["price", "-price", "rating", "-rating"]),
+                limit=20,
+            ),
+            None,
+        ),
+    ),
+    Scenario("products.get", lambda c, r: ("GET", f"/products/{r.choice(c.product_ids)}", None)),
+    Scenario(
+        "products.get_fields",
+        lambda c, r: ("GET", f"/products/{r.choice(c.product_ids)}?fields=name,price", None),
+    ),
+    Scenario("products.batch_get", lambda c, r: ("GET", f"/products:batchGet?ids={_ids(r, c.product_ids, 20)}", None)),
+    Scenario(
+        "products.search",
+        lambda c, r: ("GET", _query("/products/search", q=f"{r.choice(ADJECTIVES)} {r.choice(NOUNS)[:3]}"), None),
+    ),
+    Scenario("products.export", lambda c, r: ("GET", "/products/export", None), heavy=True),
+    Scenario("products.create", lambda c, r: ("POST", "/products", product_payload(r, c.category_ids))),
+    Scenario(
+        "products.create_batch",
+        lambda c, r: ("POST", "/products:batch", [product_payload(r, c.category_ids) for _ in range(20)]),
+    ),
+    Scenario(
+        "products.update",
+        lambda c, r: (
+            "PUT",
+            f"/products/{r.choice(c.product_ids)}",
+            {"name": product_name(r), "price": round(r.uniform(1, 2000), 2)},
+        ),
+    ),
+    Scenario(
+        "products.delete",
+        lambda c, r: ("DELETE", f"/products/{c.disposable['products'].popleft()}", None),
+        consumes="products",
+    ),
+    # -------------------------------------------------------------- categories
+    Scenario("categories.list", lambda c, r: ("GET", "/categories?limit=20", None)),
+    Scenario("categories.get", lambda c, r: ("GET", f"/categories/{r.choice(c.category_ids)}", None)),
+    Scenario(
+        "categories.batch_get",
+        lambda c, r: ("GET", f"/categories:batchGet?ids={_ids(r, c.category_ids, 20)}", None),
+    ),
+    Scenario("categories.stats", lambda c, r: ("GET", "/categories/stats", None)),
+    Scenario("categories.stats_one", lambda c, r: ("GET", f"/categories/{r.choice(c.category_ids)}/stats", None)),
+    Scenario("categories.export", lambda c, r: ("GET", "/categories/export", None), heavy=True),
+    Scenario("categories.create", lambda c, r: ("POST", "/categories", category_payload(r))),
+    Scenario(
+        "categories.create_batch",
+        lambda c, r: ("POST", "/categories:batch", [category_payload(r) for _ in range(20)]),
+    ),
+    Scenario(
+        "categories.update",
+        lambda c, r: ("PUT", f"/categories/{r.choice(c.category_ids)}", {"description": product_name(r)}),
+    ),
+    Scenario(
+        "categories.delete",
+        lambda c, r: ("DELETE", f"/categories/{c.disposable['categories'].popleft()}", None),
+        consumes="categories",
+    ),
+    # ------------------------------------------------------------- inventories
+    Scenario("inventories.list", lambda c, r: ("GET", "/inventories?limit=20", None)),
+    Scenario("inventories.get", lambda c, r: ("GET", f"/inventories/{r.choice(c.inventory_ids)}", None)),
+    Scenario(
+        "inventories.batch_get",
+        lambda c, r: ("GET", f"/inventories:batchGet?ids={_ids(r, c.inventory_ids, 20)}", None),
+    ),
+    Scenario("inventories.export", lambda c, r: ("GET", "/inventories/export", None), heavy=True),
+    Scenario(
+        "inventories.create",
+        lambda c, r: ("POST", "/inventories", inventory_payload(r, r.choice(c.product_ids))),
+    ),
+    Scenario(
+        "inventories.create_batch",
+        lambda c, r: (
+            "POST",
+            "/inventories:batch",
+            [inventory_payload(r, r.choice(c.product_ids)) for _ in range(20)],
+        ),
+    ),
+    Scenario(
+        "inventories.update",
+        lambda c, r: ("PUT", f"/inventories/{r.choice(c.inventory_ids)}", {"stock_quantity": r.randint(500, 5000)}),
+    ),
+    Scenario(
+        "inventories.adjust",
+        lambda c, r: ("POST", f"/inventories/{r.choice(c.inventory_ids)}/adjust", {"delta": r.randint(-2, 3)}),
+    ),
+    Scenario(
+        "inventories.adjust_batch",
+        lambda c, r: (
+            "POST",
+            "/inventories:adjust",
+            [{"inventory_id": i, "delta": r.randint(-2, 3)} for i in r.sample(c.inventory_ids, min(20, len(c.inventory_ids)))],
+        ),
+    ),
+    Scenario(
+        "inventories.delete",
+        lambda c, r: ("DELETE", f"/inventories/{c.disposable['inventories'].popleft()}", None),
+        consumes="inventories",
+    ),
+]
+
+BY_NAME: Dict[str, Scenario] = {s.name: s for s in SCENARIOS}
+
+
+def select(patterns: Optional[List[str]]) -> List[Scenario]:
+    """Scenarios named exactly, or by a group prefix ending in a dot (``products.``).
+
+    With no patterns, every scenario except the heavy whole-table exports.
+    """
+    if not patterns:
+        return [s for s in SCENARIOS if not s.heavy]
+    chosen = [
+        s
+        for s in SCENARIOS
+        if any(s.name == p or (p.endswith(".") and s.name.startswith(p) and not s.heavy) for p in patterns)
+    ]
+    if not chosen:
+        raise ValueError(f"No scenario matches {patterns}; known: {', '.join(BY_NAME)}")
+    return chosen
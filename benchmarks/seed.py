@@ -0,0 +1,142 @@
+from __future__ import annotations
+import random
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterator, List, Sequence
+
+from benchmarks.client import Client
+
+# Matches utils.batch.MAX_BATCH_SIZE; larger batches are rejected with 413.
+SEED_BATCH_SIZE = 1000
+
+ADJECTIVES = [
+    "wireless", "ergonomic", "compact", "mechanical", "portable", "premium", "silent",
+    "gaming", "ultra", "smart", "rugged", "slim", "classic", "modular", "pro",
+]
+NOUNS = [
+    "mouse", "keyboard", "monitor", "headset", "webcam", "speaker", "charger", "cable",
+    "dock", "laptop", "tablet", "router", "microphone", "controller", "stand",
+]
+
+
+@dataclass
+class Catalog:
+    """IDs created by :func:`seed`, for scenarios to pick from."""
+
+    category_ids: List[str] = field(default_factory=list)
+    product_ids: List[str] = field(default_factory=list)
+    inventory_ids: List[str] = field(default_factory=list)
+    # Rows created only to be deleted by the delete scenarios.
+    disposable: Dict[str, Deque[str]] = field(
+        default_factory=lambda: {"products": deque(), "categories": deque(), "inventories": deque()}
+    )
+
+
+def _chunks(items: Sequence[dict], size: int = SEED_BATCH_SIZE) -> Iterator[Sequence[dict]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def product_name(rng: random.Random) -> str:
+    return f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()} {rng.randint(100, 999)}"
+
+
+def category_payload(rng: random.Random) -> dict:
+    return {
+        "category_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "name": f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()}s",
+        "description": "Benchmark category",
+    }
+
+
+def product_payload(rng: random.Random, category_ids: Sequence[str]) -> dict:
+    return {
+        "name": product_name(rng),
+        "description": f"{rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}",
+        "price": round(rng.uniform(1, 2000), 2),
+        # About one product in ten is unrated, like the real catalog.
+        "rating": None if rng.random() < 0.1 else round(rng.uniform(1, 5), 1),
+        "category_id": rng.choice(category_ids) if category_ids else None,
+    }
+
+
+def inventory_payload(rng: random.Random, product_id: str) -> dict:
+    return {
+        "inventory_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "product_id": product_id,
+        "stock_quantity": rng.randint(500, 5000),
+        "warehouse_location": f"Warehouse {rng.choice('ABCD')} - Shelf {rng.randint(1, 40)}",
+        "update_time": _now(),
+    }
+
+
+def _create(client: Client, path: str, items: List[dict], key: str) -> List[str]:
+    ids: List[str] = []
+    for chunk in _chunks(items):
+        result = client.json("POST", f"{path}?atomic=true", list(chunk))
+        ids.extend(row[key] for row in result["created"])
+    return ids
+
+
+def seed(
+    client: Client,
+    rng: random.Random,
+    categories: int,
+    products: int,
+    inventories_per_product: int,
+) -> Catalog:
+    """Create a catalog of the requested size through the batch endpoints.
+
+    Going through the API (rather than SQL) keeps seeding valid for any
+    backend the service runs on, and keeps its caches and indexes in step.
+    """
+    catalog = Catalog()
+    catalog.category_ids = _create(
+        client, "/categories:batch", [category_payload(rng) for _ in range(categories)], "category_id"
+    )
+    catalog.product_ids = _create(
+        client,
+        "/products:batch",
+        [product_payload(rng, catalog.category_ids) for _ in range(products)],
+        "product_id",
+    )
+    catalog.inventory_ids = _create(
+        client,
+        "/inventories:batch",
+        [inventory_payload(rng, pid) for pid in catalog.product_ids for _ in range(inventories_per_product)],
+        "inventory_id",
+    )
+    return catalog
+
+
+def seed_disposable(client: Client, rng: random.Random, catalog: Catalog, kind: str, count: int) -> None:
+    """Pre-create ``count`` rows for a delete scenario to consume."""
+    queue: Deque[str] = catalog.disposable[kind]
+    if kind == "categories":
+        queue.extend(_create(client, "/categories:batch", [category_payload(rng) for _ in range(count)], "category_id"))
+    elif kind == "products":
+        queue.extend(
+            _create(
+                client,
+                "/products:batch",
+                [product_payload(rng, catalog.category_ids) for _ in range(count)],
+                "product_id",
+            )
+        )
+    elif kind == "inventories":
+        queue.extend(
+            _create(
+                client,
+                "/inventories:batch",
+                [inventory_payload(rng, rng.choice(catalog.product_ids)) for _ in range(count)],
+                "inventory_id",
+            )
+        )
+    else:
+        raise ValueError(f"Unknown kind: {kind}")
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import hashlib
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+# Opt-in migrations (e.g. storage format changes) are never applied automatically.
+OPTIONAL_MIGRATIONS_DIR = MIGRATIONS_DIR / "optional"
+LOCK_NAME = "product_service_schema_migrations"
+
+_FILENAME = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+
+class MigrationError(Exception):
+    """Raised when migrations cannot be applied safely."""
+
+
+class Migration:
+    def __init__(self, version: int, name: str, path: Path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self.sql = path.read_text(encoding="utf-8")
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+
+    def statements(self) -> List[str]:
+        """Split on ';'. Migrations must not contain procedures or ';' in literals."""
+        lines = [
+            line for line in self.sql.splitlines()
+            if not line.strip().startswith("--")
+        ]
+        return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME.match(path.name)
+        if not match:
+            raise MigrationError(f"Badly named migration file: {path.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError("Duplicate migration version numbers")
+    return migrations
+
+
+class MigrationRunner:
+    """Apply numbered SQL files from ``migrations/`` exactly once, in order.
+
+    Applied versions are tracked in ``schema_migrations``. A MySQL advisory
+    lock serializes runners, so several instances starting at once is safe.
+    MySQL DDL auto-commits, so each migration is recorded right after its
+    statements succeed; a failure part-way leaves it pending for a fix-up.
+    """
+
+    def __init__(
+        self,
+        get_connection: Callable[[], Any],
+        directory: Path = MIGRATIONS_DIR,
+        lock_timeout: int = 60,
+    ):
+        self._get_connection = get_connection
+        self.directory = directory
+        self.lock_timeout = lock_timeout
+
+    def _ensure_table(self, cur) -> None:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+              version    INT PRIMARY KEY,
+              name       VARCHAR(255) NOT NULL,
+              checksum   CHAR(64) NOT NULL,
+              applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+    def _applied(self, cur) -> Dict[int, dict]:
+        cur.execute("SELECT version, name, checksum, applied_at FROM schema_migrations")
+        return {row["version"]: row for row in cur.fetchall()}
+
+    def status(self) -> List[dict]:
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                self._ensure_table(cur)
+                applied = self._applied(cur)
+        finally:
+            conn.close()
+
+        return [
+            {
+                "version": m.version,
+                "name": m.name,
+                "applied_at": applied[m.version]["applied_at"] if m.version in applied else None,
+                "checksum_mismatch": (
+                    m.version in applied and applied[m.version]["checksum"] != m.checksum
+                ),
+            }
+            for m in discover(self.directory)
+        ]
+
+    def migrate(self, target: Optional[int] = None) -> List[Migration]:
+        return self._apply([
+            m for m in discover(self.directory)
+            if target is None or m.version <= target
+        ])
+
+    def apply_optional(self, version: int, directory: Path = OPTIONAL_MIGRATIONS_DIR) -> List[Migration]:
+        """Apply one opt-in migration, tracked like any other so it runs once."""
+        migrations = [m for m in discover(directory) if m.version == version]
+        if not migrations:
+            raise MigrationError(f"No optional migration with version {version}")
+        return self._apply(migrations)
+
+    def _apply(self, migrations: List[Migration]) -> List[Migration]:
+        applied_now: List[Migration] = []
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT GET_LOCK(%s, %s) AS locked", (LOCK_NAME, self.lock_timeout))
+                if not cur.fetchone()["locked"]:
+                    raise MigrationError("Timed out waiting for the migration lock")
+                try:
+                    self._ensure_table(cur)
+                    applied = self._applied(cur)
+
+                    for migration in migrations:
+                        if migration.version in applied:
+                            if applied[migration.version]["checksum"] != migration.checksum:
+                                logger.warning(
+                                    "Migration %04d_%s was edited after being applied",
+                                    migration.version, migration.name,
+                                )
+                            continue
+
+                        logger.info("Applying migration %04d_%s", migration.version, migration.name)
+                        for statement in migration.statements():
+                            cur.execute(statement)
+                        cur.execute(
+                            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                            (migration.version, migration.name, migration.checksum),
+                        )
+                        conn.commit()
+                        applied_now.append(migration)
+                finally:
+                    cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+        finally:
+            conn.close()
+
+        return applied_now
+
+
+def _main(argv: List[str]) -> int:
+    """CLI: ``python -m framework.migrations [status|migrate [VERSION]|apply-optional VERSION]``."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Reuse the service's own connection settings (DB_HOST, DB_USER, ...).
+    from main import get_db_connection
+
+    runner = MigrationRunner(get_db_connection)
+    command = argv[0] if argv else "status"
+
+    if command == "migrate":
+        target = int(argv[1]) if len(argv) > 1 else None
+        done = runner.migrate(target)
+        print(f"Applied {len(done)} migration(s)")
+        return 0
+
+    if command == "apply-optional" and len(argv) > 1:
+        done = runner.apply_optional(int(argv[1]))
+        print(f"Applied {len(done)} migration(s)")
+        return 0
+
+    if command == "status":
+        for row in runner.status():
+            state = "applied" if row["applied_at"] else "pending"
+            flag = "  (CHECKSUM MISMATCH)" if row["checksum_mismatch"] else ""
+            print(f"{row['version']:04d}_{row['name']}: {state}{flag}")
+        return 0
+
+    print(_main.__doc__, file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -1,41 +1,189 @@
 from __future__ import annotations
 import os
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 # Import your Pydantic models
-from models.product import ProductCreate, ProductRead, ProductUpdate
-from models.category import CategoryCreate, CategoryRead, CategoryUpdate
-from models.inventory import InventoryCreate, InventoryRead, InventoryUpdate
+from models.product import ProductCreate, ProductRead, ProductSearchHit, ProductUpdate
+from models.category import CategoryCreate, CategoryRead, CategoryStats, CategoryUpdate
+from models.inventory import (
+    InventoryAdjust,
+    InventoryAdjustItem,
+    InventoryCreate,
+    InventoryRead,
+    InventoryStockLevel,
+    InventoryUpdate,
+)
+from models.batch import BatchCreateResult, BatchGetResult
 
 # Import your resource classes
-from resources.product_resource import ProductResource
-from resources.category_resource import CategoryResource
-from resources.inventory_resource import InventoryResource
+from resources.product_resource import PRODUCT_EXPANSIONS, PRODUCT_FIELDS, ProductResource
+from resources.category_resource import CATEGORY_FIELDS, CategoryResource
+from resources.inventory_resource import INVENTORY_FIELDS, InventoryResource
 
 import pymysql
 from pymysql.cursors import DictCursor
 
+from framework.migrations import MigrationRunner
+from middleware.compression import CompressedBodyCache, CompressionMiddleware, CompressionStats
+from middleware.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, MetricsRegistry
+from middleware.query_stats import DB_QUERIES_HEADER, DB_TIME_HEADER, QueryStatsMiddleware
+from middleware.read_your_writes import ReadYourWritesMiddleware
+from services.category_snapshot import CategorySnapshot
+from services.category_stats import CategoryAggregates
+from services.inventory_write_buffer import InventoryWriteBuffer
+from services.product_search import ProductSearchIndex
+from storage.base import ReadOnlyStorage
+from storage.memory import MemoryStorage
+
+from utils.batch import parse_ids, validate_batch
+from utils.cache import TTLCache
+from utils.db_instrument import QueryStats
+from utils.db_pool import ConnectionPool
+from utils.db_router import ROUND_ROBIN, ConnectionRouter
+from utils.export import NDJSON_MEDIA_TYPE, ndjson_chunks
+from utils.fast_json import FastJSONResponse, trusted_response
+from utils.fields import expand_variant, fields_variant, parse_expand, parse_fields, project, with_columns
+from utils.http_cache import (
+    conditional_response,
+    field_of,
+    has_conditional_headers,
+    if_match_version,
+    page_validators,
+    set_validators,
+    version_etag,
+)
+from utils.pagination import DEFAULT_LIMIT, MAX_LIMIT, NEXT_CURSOR_HEADER
+from utils.uuid_codec import uuid_codec
+
+CURSOR_DESCRIPTION = "Opaque cursor from the previous page's X-Next-Cursor header."
+FIELDS_DESCRIPTION = "Comma-separated columns to return (the id is always included)."
+EXPAND_DESCRIPTION = "Related resources to embed: category, inventory (comma-separated)."
+
 # --------------------------------------------------------------------------
 # CONFIGURATION for Cloud SQL + Local Development
 # --------------------------------------------------------------------------
 
-def get_db_connection():
-    return pymysql.connect(
-        unix_socket=os.environ["DB_HOST"],  # Cloud SQL socket
+# Every statement is timed per fingerprint; DB_SLOW_QUERY_MS= (empty) turns
+# the slow-query log off.
+SLOW_QUERY_MS = os.environ.get("DB_SLOW_QUERY_MS", "200")
+query_stats = QueryStats(slow_threshold=float(SLOW_QUERY_MS) / 1000 if SLOW_QUERY_MS else None)
+
+
+def get_db_connection(host: Optional[str] = None):
+    return query_stats.wrap(pymysql.connect(
+        unix_socket=host or os.environ["DB_HOST"],  # Cloud SQL socket
         user=os.environ["DB_USER"],
         password=os.environ["DB_PASSWORD"],
         database=os.environ["DB_NAME"],
         cursorclass=pymysql.cursors.DictCursor,
+    ))
+
+
+# IDs are CHAR(36) by default; BINARY(16) after the optional 9001 migration.
+uuid_codec.configure(binary=os.environ.get("DB_BINARY_UUIDS", "false").lower() == "true")
+
+
+def make_pool(host: Optional[str] = None) -> ConnectionPool:
+    # Reuse connections instead of paying the socket handshake + auth per call.
+    # Connections are opened lazily, so importing main does not touch the DB.
+    return ConnectionPool(
+        lambda: get_db_connection(host),
+        pool_size=int(os.environ.get("DB_POOL_SIZE", 5)),
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        recycle=float(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        pre_ping=os.environ.get("DB_POOL_PRE_PING", "true").lower() != "false",
     )
 
 
+db_pool = make_pool()
+
+# Read replicas: comma-separated Cloud SQL sockets. Unset = everything on the
+# primary; locally DB_READ_HOSTS=$DB_HOST exercises the routing on one server.
+READ_HOSTS = [h.strip() for h in os.environ.get("DB_READ_HOSTS", "").split(",") if h.strip()]
+READ_YOUR_WRITES_WINDOW = float(os.environ.get("DB_READ_YOUR_WRITES_WINDOW", 5))
+db_router = ConnectionRouter(
+    db_pool,
+    replicas={host: make_pool(host) for host in READ_HOSTS},
+    strategy=os.environ.get("DB_READ_STRATEGY", ROUND_ROBIN),
+    read_your_writes=READ_YOUR_WRITES_WINDOW,
+)
+
 # Make database connection available to Resource classes
-ProductResource.get_connection = staticmethod(get_db_connection)
-CategoryResource.get_connection = staticmethod(get_db_connection)
-InventoryResource.get_connection = staticmethod(get_db_connection)
+ProductResource.get_connection = staticmethod(db_router.write_connection)
+CategoryResource.get_connection = staticmethod(db_router.write_connection)
+InventoryResource.get_connection = staticmethod(db_router.write_connection)
+ProductResource.get_read_connection = staticmethod(db_router.read_connection)
+CategoryResource.get_read_connection = staticmethod(db_router.read_connection)
+InventoryResource.get_read_connection = staticmethod(db_router.read_connection)
+
+# STORAGE_BACKEND=memory runs every resource on an in-process engine instead
+# of MySQL (edge, benchmark and test runs). It starts from the NDJSON exports
+# in STORAGE_SEED_DIR, if set, and STORAGE_READ_ONLY=true rejects writes.
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "mysql").lower()
+if STORAGE_BACKEND not in ("mysql", "memory"):
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+storage = (
+    MemoryStorage(read_only=os.environ.get("STORAGE_READ_ONLY", "false").lower() == "true")
+    if STORAGE_BACKEND == "memory"
+    else None
+)
+ProductResource.storage = storage
+CategoryResource.storage = storage
+InventoryResource.storage = storage
+
+if storage is None:
+    # Read-through caches for single-entity lookups. Hot SKUs are re-requested
+    # constantly; writes through the resources invalidate their own entries.
+    CACHE_MAXSIZE = int(os.environ.get("CACHE_MAXSIZE", 10000))
+    ProductResource.cache = TTLCache(CACHE_MAXSIZE, float(os.environ.get("CACHE_PRODUCT_TTL", 60)))
+    CategoryResource.cache = TTLCache(CACHE_MAXSIZE, float(os.environ.get("CACHE_CATEGORY_TTL", 300)))
+    # Stock moves fast, so inventory entries live only briefly.
+    InventoryResource.cache = TTLCache(CACHE_MAXSIZE, float(os.environ.get("CACHE_INVENTORY_TTL", 5)))
+
+    # Opt-in write-behind for PUT /inventories/{id}: hot rows are coalesced
+    # in memory and written at most INVENTORY_WRITE_BEHIND_MS later (or once
+    # INVENTORY_WRITE_BEHIND_MAX rows are waiting). Other instances see the
+    # change only after the flush.
+    if os.environ.get("INVENTORY_WRITE_BEHIND", "false").lower() == "true":
+        InventoryResource.write_buffer = InventoryWriteBuffer(
+            db_router.write_connection,
+            flush_interval=float(os.environ.get("INVENTORY_WRITE_BEHIND_MS", 100)) / 1000,
+            max_pending=int(os.environ.get("INVENTORY_WRITE_BEHIND_MAX", 500)),
+        )
+
+    # Categories are tiny and rarely change: serve every category read from memory.
+    CategoryResource.snapshot = CategorySnapshot(
+        db_pool.connect,
+        refresh_interval=float(os.environ.get("CATEGORY_SNAPSHOT_REFRESH", 60)),
+    )
+
+# The in-memory views below rebuild from the primary (db_pool), not a replica:
+# a lagging replica could roll them back past writes this instance patched in.
+# With a storage engine they rebuild from it directly.
+scan = storage.scan if storage is not None else None
+
+# Per-category counts/averages/stock, moved by every product and inventory write.
+category_aggregates = CategoryAggregates(
+    db_pool.connect,
+    refresh_interval=float(os.environ.get("CATEGORY_STATS_REFRESH", 300)),
+    scan=scan,
+)
+ProductResource.aggregates = category_aggregates
+InventoryResource.aggregates = category_aggregates
+CategoryResource.aggregates = category_aggregates
+
+# Product search runs against an in-memory inverted index, never MySQL.
+ProductResource.search_index = ProductSearchIndex(
+    db_pool.connect,
+    refresh_interval=float(os.environ.get("PRODUCT_SEARCH_REFRESH", 300)),
+    scan=scan,
+)
 
 # --------------------------------------------------------------------------
 # FastAPI App
@@ -43,10 +191,38 @@ InventoryResource.get_connection = staticmethod(get_db_connection)
 
 port = int(os.environ.get("FASTAPIPORT", 8003))
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if storage is not None:
+        if os.environ.get("STORAGE_SEED_DIR"):
+            storage.load_dir(os.environ["STORAGE_SEED_DIR"])
+    # Several instances may start together; the runner holds a DB lock.
+    elif os.environ.get("DB_MIGRATE_ON_STARTUP", "true").lower() != "false":
+        MigrationRunner(db_pool.connect).migrate()
+    if CategoryResource.snapshot is not None:
+        CategoryResource.snapshot.start()
+    ProductResource.search_index.start()
+    category_aggregates.start()
+    if InventoryResource.write_buffer is not None:
+        InventoryResource.write_buffer.start()
+    yield
+    # Flush buffered inventory updates while the pools are still open.
+    if InventoryResource.write_buffer is not None:
+        InventoryResource.write_buffer.stop()
+    category_aggregates.stop()
+    ProductResource.search_index.stop()
+    if CategoryResource.snapshot is not None:
+        CategoryResource.snapshot.stop()
+    db_router.dispose()
+
+
 app = FastAPI(
     title="Product/Category/Inventory API",
     description="FastAPI Microservice backed by Cloud SQL.",
     version="0.3.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -56,7 +232,116 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],        # 关键：允许 Authorization / Content-Type
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", DB_QUERIES_HEADER, DB_TIME_HEADER],
 )
+app.add_middleware(ReadYourWritesMiddleware, window=READ_YOUR_WRITES_WINDOW)
+app.add_middleware(QueryStatsMiddleware)
+
+# gzip/br for textual responses of COMPRESSION_MIN_SIZE bytes or more.
+# Compressed bodies of ETagged responses (hot list pages) are cached, up to
+# COMPRESSION_CACHE_MB in total; 0 turns the cache off.
+COMPRESSION_CACHE_MB = float(os.environ.get("COMPRESSION_CACHE_MB", 16))
+compression_cache = CompressedBodyCache(int(COMPRESSION_CACHE_MB * 1024 * 1024)) if COMPRESSION_CACHE_MB > 0 else None
+compression_stats = CompressionStats()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_SIZE", 1024)),
+    cache=compression_cache,
+    stats=compression_stats,
+)
+
+# Added last so it is outermost and times everything, CORS included.
+metrics = MetricsRegistry()
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
+
+@app.exception_handler(ReadOnlyStorage)
+def read_only_storage(request: Request, exc: ReadOnlyStorage):
+    return FastJSONResponse({"detail": str(exc)}, status_code=503)
+
+
+def _db_pool_metrics():
+    pools = {"primary": db_router.primary, **db_router.replicas}
+    samples = []
+    for name, pool in pools.items():
+        stats = pool.stats()
+        for state in ("checked_out", "idle", "opened"):
+            samples.append(({"pool": name, "state": state}, stats[state]))
+    yield "db_pool_connections", "gauge", "Connections per pool by state.", samples
+    yield "db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.", [
+        ({"pool": name}, pool.stats()["timeouts"]) for name, pool in pools.items()
+    ]
+
+
+metrics.register(_db_pool_metrics)
+
+
+def _db_query_metrics():
+    timings = query_stats.snapshot()
+    yield "db_queries_total", "counter", "Statements executed, by SQL fingerprint.", [
+        ({"fingerprint": key}, t["count"]) for key, t in timings.items()
+    ]
+    yield "db_query_seconds_total", "counter", "Time spent executing statements, by SQL fingerprint.", [
+        ({"fingerprint": key}, t["seconds"]) for key, t in timings.items()
+    ]
+    yield "db_slow_queries_total", "counter", "Statements over the slow-query threshold, by SQL fingerprint.", [
+        ({"fingerprint": key}, t["slow"]) for key, t in timings.items()
+    ]
+
+
+metrics.register(_db_query_metrics)
+
+
+def _write_buffer_metrics():
+    if InventoryResource.write_buffer is None:
+        return
+    stats = InventoryResource.write_buffer.stats()
+    yield "inventory_write_buffer_pending", "gauge", "Inventory rows with buffered updates not yet written.", [
+        ({}, stats["pending"])
+    ]
+    yield "inventory_write_buffer_updates_total", "counter", "Inventory updates accepted by the write buffer.", [
+        ({}, stats["enqueued"])
+    ]
+    yield "inventory_write_buffer_coalesced_total", "counter", "Buffered updates merged into an already pending row.", [
+        ({}, stats["coalesced"])
+    ]
+    yield "inventory_write_buffer_flushes_total", "counter", "Write-behind flush transactions committed.", [
+        ({}, stats["flushes"])
+    ]
+    yield "inventory_write_buffer_rows_flushed_total", "counter", "Rows written by write-behind flushes.", [
+        ({}, stats["rows_flushed"])
+    ]
+    yield "inventory_write_buffer_failures_total", "counter", "Write-behind flushes that failed and were retried.", [
+        ({}, stats["failures"])
+    ]
+
+
+metrics.register(_write_buffer_metrics)
+
+
+def _compression_metrics():
+    by_coding = compression_stats.snapshot()
+    yield "http_compressed_responses_total", "counter", "Responses compressed, by content coding.", [
+        ({"coding": coding}, s["responses"]) for coding, s in by_coding.items()
+    ]
+    yield "http_compression_bytes_in_total", "counter", "Response bytes before compression, by content coding.", [
+        ({"coding": coding}, s["bytes_in"]) for coding, s in by_coding.items()
+    ]
+    yield "http_compression_bytes_out_total", "counter", "Response bytes after compression, by content coding.", [
+        ({"coding": coding}, s["bytes_out"]) for coding, s in by_coding.items()
+    ]
+    if compression_cache is not None:
+        cache = compression_cache.stats()
+        yield "http_compression_cache_lookups_total", "counter", "Compressed-body cache lookups, by result.", [
+            ({"result": "hit"}, cache["hits"]),
+            ({"result": "miss"}, cache["misses"]),
+        ]
+        yield "http_compression_cache_bytes", "gauge", "Bytes held by the compressed-body cache.", [
+            ({}, cache["bytes"])
+        ]
+
+
+metrics.register(_compression_metrics)
 # --------------------------------------------------------------------------
 # Product endpoints
 # --------------------------------------------------------------------------
@@ -66,27 +351,138 @@ def create_product(product: ProductCreate):
     return ProductResource.create_product(product)
 
 
+@app.post("/products:batch", response_model=BatchCreateResult[ProductRead], status_code=201, tags=["Product"])
+def create_products_batch(
+    response: Response,
+    items: List[Any] = Body(...),
+    atomic: bool = Query(False, description="Reject the whole batch if any item is invalid."),
+):
+    products, errors = validate_batch(ProductCreate, items)
+    if errors and atomic:
+        raise HTTPException(status_code=422, detail=[e.model_dump() for e in errors])
+    created = ProductResource.create_products(products) if products else []
+    if errors:
+        response.status_code = 207
+    return BatchCreateResult[ProductRead](created=created, errors=errors)
+
+
 @app.get("/products", response_model=List[ProductRead], tags=["Product"])
 def list_products(
+    request: Request,
+    response: Response,
     category_id: Optional[UUID] = Query(None),
     inventory_id: Optional[UUID] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    sort: Optional[str] = Query(None, description="price, rating, -price or -rating; product_id order by default."),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[List[str]] = Query(None, description=EXPAND_DESCRIPTION),
 ):
-    return ProductResource.get_products(category_id=category_id, inventory_id=inventory_id)
+    projection = parse_fields(fields, PRODUCT_FIELDS, "product_id")
+    relations = parse_expand(expand, tuple(PRODUCT_EXPANSIONS))
+    products, next_cursor = ProductResource.get_products(
+        category_id=category_id,
+        inventory_id=inventory_id,
+        limit=limit,
+        cursor=cursor,
+        # Expansion follows the foreign keys, so read them even if not returned.
+        fields=with_columns(projection, *(PRODUCT_EXPANSIONS[r] for r in relations)),
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        sort=sort,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    variant = fields_variant(projection)
+    if relations:
+        rows = ProductResource.expand_products(products, relations, fields=projection)
+        variant += "|" + expand_variant(rows, relations)
+    else:
+        rows = [project(p, projection) for p in products]
+    # The page is still read, but a match skips serialization and the body.
+    # Only the ETag is trusted: a deleted row does not move max(updated_at).
+    not_modified = conditional_response(
+        request, response,
+        *page_validators(products, "product_id", "updated_at", next_cursor, variant),
+        honor_if_modified_since=False,
+    )
+    # Partial rows don't fit ProductRead, so they always take the trusted path.
+    return not_modified or trusted_response(rows, response)
+
+
+@app.get("/products:batchGet", response_model=BatchGetResult[ProductRead], tags=["Product"])
+def batch_get_products(ids: List[str] = Query(..., description="Product IDs, repeated or comma-separated.")):
+    products, missing = ProductResource.get_products_by_ids(parse_ids(ids))
+    return BatchGetResult[ProductRead](items=products, missing=missing)
+
+
+@app.get("/products/export", tags=["Product"])
+def export_products(
+    category_id: Optional[UUID] = Query(None),
+    inventory_id: Optional[UUID] = Query(None),
+):
+    rows = ProductResource.export_products(category_id=category_id, inventory_id=inventory_id)
+    return StreamingResponse(ndjson_chunks(rows), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.get("/products/search", response_model=List[ProductSearchHit], tags=["Product"])
+def search_products(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Search terms; each term also matches words that start with it."),
+    limit: int = Query(20, ge=1, le=100),
+):
+    return trusted_response(ProductResource.search_products(q, limit), response)
 
 
 @app.get("/products/{product_id}", response_model=ProductRead, tags=["Product"])
-def get_product(product_id: UUID):
-    return ProductResource.get_product_by_id(product_id)
+def get_product(
+    product_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    expand: Optional[List[str]] = Query(None, description=EXPAND_DESCRIPTION),
+):
+    projection = parse_fields(fields, PRODUCT_FIELDS, "product_id")
+    relations = parse_expand(expand, tuple(PRODUCT_EXPANSIONS))
+    variant = fields_variant(projection)
+    # With expansions the validator depends on the embedded rows too, so
+    # the cheap version-only check cannot answer for them.
+    if has_conditional_headers(request) and not relations:
+        version, updated_at = ProductResource.get_product_validators(product_id)
+        not_modified = conditional_response(request, response, version_etag(version, variant), updated_at)
+        if not_modified:
+            return not_modified
+
+    product = ProductResource.get_product_by_id(
+        product_id, fields=with_columns(projection, *(PRODUCT_EXPANSIONS[r] for r in relations))
+    )
+    updated_at = field_of(product, "updated_at")
+    if relations:
+        body = ProductResource.expand_products([product], relations, fields=projection)[0]
+        etag = version_etag(field_of(product, "version"), variant + "|" + expand_variant([body], relations))
+        not_modified = conditional_response(request, response, etag, updated_at, honor_if_modified_since=False)
+        return not_modified or trusted_response(body, response)
+
+    set_validators(response, version_etag(field_of(product, "version"), variant), updated_at)
+    if projection is not None:
+        return trusted_response(project(product, projection), response)
+    return product
 
 
 @app.put("/products/{product_id}", response_model=ProductRead, tags=["Product"])
-def update_product(product_id: UUID, update: ProductUpdate):
-    return ProductResource.update_product(product_id, update)
+def update_product(product_id: UUID, update: ProductUpdate, request: Request, response: Response):
+    updated = ProductResource.update_product(product_id, update, expected_version=if_match_version(request))
+    response.headers["ETag"] = version_etag(field_of(updated, "version"))
+    return updated
 
 
 @app.delete("/products/{product_id}", response_model=dict, tags=["Product"])
-def delete_product(product_id: UUID):
-    return ProductResource.delete_product(product_id)
+def delete_product(product_id: UUID, request: Request):
+    return ProductResource.delete_product(product_id, expected_version=if_match_version(request))
 
 @app.get(
     "/products/{product_id}/inventory",
@@ -104,24 +500,103 @@ def create_category(category: CategoryCreate):
     return CategoryResource.create_category(category)
 
 
+@app.post("/categories:batch", response_model=BatchCreateResult[CategoryRead], status_code=201, tags=["Category"])
+def create_categories_batch(
+    response: Response,
+    items: List[Any] = Body(...),
+    atomic: bool = Query(False, description="Reject the whole batch if any item is invalid."),
+):
+    categories, errors = validate_batch(CategoryCreate, items)
+    if errors and atomic:
+        raise HTTPException(status_code=422, detail=[e.model_dump() for e in errors])
+    created = CategoryResource.create_categories(categories) if categories else []
+    if errors:
+        response.status_code = 207
+    return BatchCreateResult[CategoryRead](created=created, errors=errors)
+
+
 @app.get("/categories", response_model=List[CategoryRead], tags=["Category"])
-def list_categories(name: Optional[str] = Query(None)):
-    return CategoryResource.get_categories(name=name)
+def list_categories(
+    request: Request,
+    response: Response,
+    name: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    projection = parse_fields(fields, CATEGORY_FIELDS, "category_id")
+    categories, next_cursor = CategoryResource.get_categories(
+        name=name, limit=limit, cursor=cursor, fields=projection
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    not_modified = conditional_response(
+        request, response,
+        *page_validators(categories, "category_id", "updated_at", next_cursor, fields_variant(projection)),
+        honor_if_modified_since=False,
+    )
+    return not_modified or trusted_response([project(c, projection) for c in categories], response)
+
+
+@app.get("/categories:batchGet", response_model=BatchGetResult[CategoryRead], tags=["Category"])
+def batch_get_categories(ids: List[str] = Query(..., description="Category IDs, repeated or comma-separated.")):
+    categories, missing = CategoryResource.get_categories_by_ids(parse_ids(ids))
+    return BatchGetResult[CategoryRead](items=categories, missing=missing)
+
+
+@app.get("/categories/export", tags=["Category"])
+def export_categories(name: Optional[str] = Query(None)):
+    rows = CategoryResource.export_categories(name=name)
+    return StreamingResponse(ndjson_chunks(rows), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.get("/categories/stats", response_model=List[CategoryStats], tags=["Category"])
+def list_category_stats(
+    response: Response,
+    ids: Optional[List[str]] = Query(None, description="Category IDs, repeated or comma-separated; default is every non-empty category."),
+):
+    category_ids = parse_ids(ids) if ids else None
+    return trusted_response(CategoryResource.get_all_category_stats(category_ids), response)
+
+
+@app.get("/categories/{category_id}/stats", response_model=CategoryStats, tags=["Category"])
+def get_category_stats(category_id: UUID):
+    return CategoryResource.get_category_stats(category_id)
 
 
 @app.get("/categories/{category_id}", response_model=CategoryRead, tags=["Category"])
-def get_category(category_id: UUID):
-    return CategoryResource.get_category_by_id(category_id)
+def get_category(
+    category_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    projection = parse_fields(fields, CATEGORY_FIELDS, "category_id")
+    variant = fields_variant(projection)
+    if has_conditional_headers(request):
+        version, updated_at = CategoryResource.get_category_validators(category_id)
+        not_modified = conditional_response(request, response, version_etag(version, variant), updated_at)
+        if not_modified:
+            return not_modified
+
+    category = CategoryResource.get_category_by_id(category_id, fields=projection)
+    updated_at = field_of(category, "updated_at")
+    set_validators(response, version_etag(field_of(category, "version"), variant), updated_at)
+    if projection is not None:
+        return trusted_response(project(category, projection), response)
+    return category
 
 
 @app.put("/categories/{category_id}", response_model=CategoryRead, tags=["Category"])
-def update_category(category_id: UUID, update: CategoryUpdate):
-    return CategoryResource.update_category(category_id, update)
+def update_category(category_id: UUID, update: CategoryUpdate, request: Request, response: Response):
+    updated = CategoryResource.update_category(category_id, update, expected_version=if_match_version(request))
+    response.headers["ETag"] = version_etag(field_of(updated, "version"))
+    return updated
 
 
 @app.delete("/categories/{category_id}", response_model=dict, tags=["Category"])
-def delete_category(category_id: UUID):
-    return CategoryResource.delete_category(category_id)
+def delete_category(category_id: UUID, request: Request):
+    return CategoryResource.delete_category(category_id, expected_version=if_match_version(request))
 
 # --------------------------------------------------------------------------
 # Inventory endpoints
@@ -132,27 +607,104 @@ def create_inventory(inventory: InventoryCreate):
     return InventoryResource.create_inventory(inventory)
 
 
+@app.post("/inventories:batch", response_model=BatchCreateResult[InventoryRead], status_code=201, tags=["Inventory"])
+def create_inventories_batch(
+    response: Response,
+    items: List[Any] = Body(...),
+    atomic: bool = Query(False, description="Reject the whole batch if any item is invalid."),
+):
+    inventories, errors = validate_batch(InventoryCreate, items)
+    if errors and atomic:
+        raise HTTPException(status_code=422, detail=[e.model_dump() for e in errors])
+    created = InventoryResource.create_inventories(inventories) if inventories else []
+    if errors:
+        response.status_code = 207
+    return BatchCreateResult[InventoryRead](created=created, errors=errors)
+
+
 @app.get("/inventories", response_model=List[InventoryRead], tags=["Inventory"])
 def list_inventories(
+    request: Request,
+    response: Response,
+    product_id: Optional[UUID] = Query(None),
+    warehouse_location: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    projection = parse_fields(fields, INVENTORY_FIELDS, "inventory_id")
+    inventories, next_cursor = InventoryResource.get_inventories(
+        product_id=product_id, warehouse_location=warehouse_location, limit=limit, cursor=cursor,
+        fields=projection,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    not_modified = conditional_response(
+        request, response,
+        *page_validators(inventories, "inventory_id", "update_time", next_cursor, fields_variant(projection)),
+        honor_if_modified_since=False,
+    )
+    return not_modified or trusted_response([project(i, projection) for i in inventories], response)
+
+
+@app.get("/inventories:batchGet", response_model=BatchGetResult[InventoryRead], tags=["Inventory"])
+def batch_get_inventories(ids: List[str] = Query(..., description="Inventory IDs, repeated or comma-separated.")):
+    inventories, missing = InventoryResource.get_inventories_by_ids(parse_ids(ids))
+    return BatchGetResult[InventoryRead](items=inventories, missing=missing)
+
+
+@app.get("/inventories/export", tags=["Inventory"])
+def export_inventories(
     product_id: Optional[UUID] = Query(None),
     warehouse_location: Optional[str] = Query(None),
 ):
-    return InventoryResource.get_inventories(product_id=product_id, warehouse_location=warehouse_location)
+    rows = InventoryResource.export_inventories(product_id=product_id, warehouse_location=warehouse_location)
+    return StreamingResponse(ndjson_chunks(rows), media_type=NDJSON_MEDIA_TYPE)
 
 
 @app.get("/inventories/{inventory_id}", response_model=InventoryRead, tags=["Inventory"])
-def get_inventory(inventory_id: UUID):
-    return InventoryResource.get_inventory_by_id(inventory_id)
+def get_inventory(
+    inventory_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    projection = parse_fields(fields, INVENTORY_FIELDS, "inventory_id")
+    variant = fields_variant(projection)
+    if has_conditional_headers(request):
+        version, update_time = InventoryResource.get_inventory_validators(inventory_id)
+        not_modified = conditional_response(request, response, version_etag(version, variant), update_time)
+        if not_modified:
+            return not_modified
+
+    inventory = InventoryResource.get_inventory_by_id(inventory_id, fields=projection)
+    update_time = field_of(inventory, "update_time")
+    set_validators(response, version_etag(field_of(inventory, "version"), variant), update_time)
+    if projection is not None:
+        return trusted_response(project(inventory, projection), response)
+    return inventory
 
 
 @app.put("/inventories/{inventory_id}", response_model=InventoryRead, tags=["Inventory"])
-def update_inventory(inventory_id: UUID, update: InventoryUpdate):
-    return InventoryResource.update_inventory(inventory_id, update)
+def update_inventory(inventory_id: UUID, update: InventoryUpdate, request: Request, response: Response):
+    updated = InventoryResource.update_inventory(inventory_id, update, expected_version=if_match_version(request))
+    response.headers["ETag"] = version_etag(field_of(updated, "version"))
+    return updated
+
+
+@app.post("/inventories:adjust", response_model=List[InventoryStockLevel], tags=["Inventory"])
+def adjust_inventories(items: List[InventoryAdjustItem] = Body(..., min_length=1, max_length=1000)):
+    return InventoryResource.adjust_stock_batch(items)
+
+
+@app.post("/inventories/{inventory_id}/adjust", response_model=InventoryStockLevel, tags=["Inventory"])
+def adjust_inventory(inventory_id: UUID, adjust: InventoryAdjust):
+    return InventoryResource.adjust_stock(inventory_id, adjust.delta)
 
 
 @app.delete("/inventories/{inventory_id}", response_model=dict, tags=["Inventory"])
-def delete_inventory(inventory_id: UUID):
-    return InventoryResource.delete_inventory(inventory_id)
+def delete_inventory(inventory_id: UUID, request: Request):
+    return InventoryResource.delete_inventory(inventory_id, expected_version=if_match_version(request))
 
 # --------------------------------------------------------------------------
 # Root
@@ -162,6 +714,42 @@ def delete_inventory(inventory_id: UUID):
 def root():
     return {"message": "Product/Category/Inventory API is running. See /docs."}
 
+
+@app.get("/health/db-pool", tags=["Health"])
+def db_pool_stats():
+    return db_router.stats()
+
+
+@app.get("/health/db-queries", tags=["Health"])
+def db_query_stats(limit: int = Query(20, ge=1, le=500)):
+    return {
+        "slow_query_ms": query_stats.slow_threshold * 1000 if query_stats.slow_threshold is not None else None,
+        "fingerprints": query_stats.top(limit),
+    }
+
+
+@app.get("/health/cache", tags=["Health"])
+def cache_stats():
+    def stats(component):
+        return component.stats() if component is not None else None
+
+    return {
+        "products": stats(ProductResource.cache),
+        "categories": stats(CategoryResource.cache),
+        "inventories": stats(InventoryResource.cache),
+        "category_snapshot": stats(CategoryResource.snapshot),
+        "product_search": ProductResource.search_index.stats(),
+        "category_stats": category_aggregates.stats(),
+        "storage": stats(storage),
+        "inventory_write_buffer": stats(InventoryResource.write_buffer),
+        "compression_cache": stats(compression_cache),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # --------------------------------------------------------------------------
 # Entrypoint
 # --------------------------------------------------------------------------
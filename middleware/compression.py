@@ -0,0 +1,308 @@
+from __future__ import annotations
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.http_cache import coded_etag
+
+try:
+    import brotli
+except ImportError:  # gzip only until the Brotli package is installed
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "+json", "+xml")
+# Bodies at least this big are compressed on a worker thread, off the event loop.
+OFFLOAD_SIZE = 64 * 1024
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+def available_codings() -> Tuple[str, ...]:
+    """Codings this process can produce, most preferred first."""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Pick the coding the client weights highest; ties go to the order of ``available``."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies, keyed by URL, ETag and coding, bounded by total bytes.
+
+    A hit also has to match the length and CRC-32 of the uncompressed body,
+    in case a route's ETag does not move with every byte of it (a stale
+    compressed copy would otherwise be served). CRC-32 runs at memory
+    speed, far cheaper than recompressing.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Tuple[int, int, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple, body: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == len(body) and entry[1] == zlib.crc32(body):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2]
+            self._misses += 1
+            return None
+
+    def put(self, key: tuple, body: bytes, compressed: bytes) -> None:
+        if len(compressed) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = (len(body), zlib.crc32(body), compressed)
+            self._bytes += len(compressed)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[2])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+class CompressionStats:
+    """Responses compressed per coding, with bytes before and after."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses: Dict[str, int] = {}
+        self._bytes_in: Dict[str, int] = {}
+        self._bytes_out: Dict[str, int] = {}
+
+    def record(self, coding: str, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            self._responses[coding] = self._responses.get(coding, 0) + 1
+            self._bytes_in[coding] = self._bytes_in.get(coding, 0) + bytes_in
+            self._bytes_out[coding] = self._bytes_out.get(coding, 0) + bytes_out
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                coding: {
+                    "responses": count,
+                    "bytes_in": self._bytes_in[coding],
+                    "bytes_out": self._bytes_out[coding],
+                }
+                for coding, count in self._responses.items()
+            }
+
+
+class CompressionMiddleware:
+    """Compress responses with Brotli or gzip, as negotiated by Accept-Encoding.
+
+    Only textual content types are touched, and single-body responses
+    below ``minimum_size`` go out as they are. Streamed responses (the
+    NDJSON exports) are compressed and flushed chunk by chunk. Compressed
+    bodies of responses that carry an ETag are kept in a CompressedBodyCache,
+    so hot list pages are compressed once per version rather than on every hit.
+    Compressed responses carry a coding-specific ETag (``"5-gzip"``, see
+    coded_etag), as RFC 9110 requires of strong validators, and
+    ``Vary: Accept-Encoding``. If-None-Match and If-Match accept either form.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache: Optional[CompressedBodyCache] = None,
+        stats: Optional[CompressionStats] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+        self.stats = stats if stats is not None else CompressionStats()
+        self.codings = available_codings()
+
+    def _encoder(self, coding: str):
+        return _Brotli(self.brotli_quality) if coding == BROTLI else _Gzip(self.gzip_level)
+
+    def _compress(self, coding: str, body: bytes) -> bytes:
+        encoder = self._encoder(coding)
+        return encoder.compress(body) + encoder.finish()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        coding = negotiate(request_headers.get("accept-encoding", ""), self.codings)
+
+        start: Optional[Message] = None
+        encoder = None
+        streamed = [0, 0]
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if message["status"] == 304:
+                    # Same Vary as the 200 it stands in for (RFC 9110 15.4.5).
+                    not_modified = MutableHeaders(scope=message)
+                    not_modified.add_vary_header("Accept-Encoding")
+                    if coding is not None and "etag" in headers:
+                        # Answer in the tag the client holds, if that was the coded one.
+                        coded = coded_etag(headers["etag"], coding)
+                        held = request_headers.get("if-none-match", "").split(",")
+                        if coded in (tag.strip().removeprefix("W/") for tag in held):
+                            not_modified["etag"] = coded
+                    passthrough = True
+                    await send(message)
+                elif (
+                    message["status"] == 204
+                    or "content-encoding" in headers
+                    or not any(t in content_type for t in COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                elif coding is None:
+                    # Identity for this client, but shared caches must not
+                    # hand it a compressed copy (or vice versa).
+                    MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held back until the first body message shows whether to compress.
+                    start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None and encoder is None and not more_body:
+                # Whole body in one message: the common JSON case.
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    return
+
+                etag = headers.get("etag")
+                key = (scope["path"], scope["query_string"], etag, coding)
+                compressed = self.cache.get(key, body) if self.cache is not None and etag else None
+                if compressed is None:
+                    if len(body) >= OFFLOAD_SIZE:
+                        compressed = await anyio.to_thread.run_sync(self._compress, coding, body)
+                    else:
+                        compressed = self._compress(coding, body)
+                    if self.cache is not None and etag:
+                        self.cache.put(key, body, compressed)
+                self.stats.record(coding, len(body), len(compressed))
+
+                headers["content-encoding"] = coding
+                headers["content-length"] = str(len(compressed))
+                if etag:
+                    headers["etag"] = coded_etag(etag, coding)
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if start is not None:
+                # Streamed: size unknown up front, so always compress.
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                headers["content-encoding"] = coding
+                del headers["content-length"]
+                if "etag" in headers:
+                    headers["etag"] = coded_etag(headers["etag"], coding)
+                await send(start)
+                start = None
+                encoder = self._encoder(coding)
+
+            # Sync-flush every message so each chunk reaches the client now,
+            # not once the compressor's window fills (thousands of rows later).
+            chunk = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+            streamed[0] += len(body)
+            streamed[1] += len(chunk)
+            if not more_body:
+                self.stats.record(coding, streamed[0], streamed[1])
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus client defaults; covers cache hits (ms) through slow exports (s).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label used for requests that matched no route, so 404 scans of random
+# paths cannot blow up the number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+# A collector returns (name, type, help, [(labels, value), ...]) families.
+Sample = Tuple[Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+Collector = Callable[[], Iterable[Family]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """HTTP request metrics plus pluggable collectors, rendered as Prometheus text.
+
+    Recording is one lock, a bisect and a few dict updates per request;
+    all formatting work happens on scrape.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # (method, route, status) -> count
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        # (method, route) -> [per-bucket counts..., +Inf count, sum]
+        self._latency: Dict[Tuple[str, str], List[float]] = {}
+        self._collectors: List[Collector] = []
+
+    def register(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        key = (method, route)
+        with self._lock:
+            self._in_flight -= 1
+            status_key = (method, route, str(status))
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            series = self._latency.get(key)
+            if series is None:
+                series = self._latency[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    # ------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------
+
+    def render(self) -> str:
+        with self._lock:
+            in_flight = self._in_flight
+            requests = dict(self._requests)
+            latency = {k: list(v) for k, v in self._latency.items()}
+
+        lines: List[str] = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP http_requests_total Requests served, by route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(
+                f"http_requests_total{_labels({'method': method, 'route': route, 'status': status})} {count}"
+            )
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency, by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), series in sorted(latency.items()):
+            labels = {"method": method, "route": route}
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                lines.append(
+                    f"http_request_duration_seconds_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}"
+                )
+            lines.append(f"http_request_duration_seconds_sum{_labels(labels)} {series[-1]!r}")
+            lines.append(f"http_request_duration_seconds_count{_labels(labels)} {cumulative}")
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request by its route template.
+
+    The router stores the matched route on the (shared) scope, so the
+    template -- ``/products/{product_id}``, not the raw path -- is read
+    after the app returns. Timing covers the whole response, including
+    streamed bodies.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.registry.request_started()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.registry.request_finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - start,
+            )
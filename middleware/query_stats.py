@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.db_instrument import begin_request, current_request, end_request
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time"
+
+
+class QueryStatsMiddleware:
+    """Report how many statements a request ran and how long they took.
+
+    ``X-DB-Queries`` is the statement count and ``X-DB-Time`` the summed
+    execution time in milliseconds. Headers go out with the response start,
+    so for streamed exports they cover only the statements issued before
+    the first byte.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = begin_request()
+        tally = current_request()
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[DB_QUERIES_HEADER] = str(tally.queries)
+                headers[DB_TIME_HEADER] = f"{tally.seconds * 1000:.3f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            end_request(token)
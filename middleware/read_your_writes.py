@@ -0,0 +1,63 @@
+from __future__ import annotations
+import math
+import time
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.db_router import begin_session, current_session, end_session
+
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """Keep a client's reads on the primary for ``window`` seconds after it writes.
+
+    Each request gets a routing session (read by ``ConnectionRouter``). When
+    the request writes, the response sets a short-lived cookie holding the
+    time until which that client's reads should skip the replicas, so a
+    client never reads a replica that has not caught up with its own write.
+    """
+
+    def __init__(self, app: ASGIApp, window: float = 5.0, cookie_name: str = PRIMARY_UNTIL_COOKIE):
+        self.app = app
+        self.window = window
+        self.cookie_name = cookie_name
+
+    def _primary_until(self, scope: Scope) -> float:
+        for name, value in scope.get("headers", ()):
+            if name != b"cookie":
+                continue
+            morsel = SimpleCookie(value.decode("latin-1")).get(self.cookie_name)
+            if morsel is None:
+                continue
+            try:
+                # Never trust the client for longer than one window.
+                return min(float(morsel.value), time.time() + self.window)
+            except ValueError:
+                return 0.0
+        return 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = begin_session(self._primary_until(scope))
+        session = current_session()
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and session.wrote and self.window > 0:
+                until = time.time() + self.window
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.cookie_name}={until:.3f}; Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            end_session(token)
@@ -0,0 +1,9 @@
+-- Secondary indexes for the filtered list / lookup paths.
+-- Each filter column is paired with the primary key so keyset pages
+-- (WHERE col = ? AND pk > ? ORDER BY pk LIMIT n) are a single index range scan.
+
+CREATE INDEX idx_products_category ON products (category_id, product_id);
+CREATE INDEX idx_products_inventory ON products (inventory_id, product_id);
+
+CREATE INDEX idx_inventories_product ON inventories (product_id, inventory_id);
+CREATE INDEX idx_inventories_warehouse ON inventories (warehouse_location, inventory_id);
@@ -0,0 +1,8 @@
+-- LOWER(name) = LOWER(?) cannot use an index. Keep a generated, case-folded
+-- copy of the name and index that instead.
+
+ALTER TABLE categories
+  ADD COLUMN name_folded VARCHAR(100)
+    GENERATED ALWAYS AS (LOWER(name)) VIRTUAL;
+
+CREATE INDEX idx_categories_name_folded ON categories (name_folded, category_id);
@@ -0,0 +1,10 @@
+-- Range filters and sorting on price / rating for GET /products.
+-- Each index ends with the primary key so sorted keyset pages
+-- (WHERE ... AND (col, pk) after cursor ORDER BY col, pk LIMIT n) are a
+-- single index range scan, forwards or backwards, with no filesort.
+
+CREATE INDEX idx_products_category_price ON products (category_id, price, product_id);
+CREATE INDEX idx_products_category_rating ON products (category_id, rating, product_id);
+
+CREATE INDEX idx_products_price ON products (price, product_id);
+CREATE INDEX idx_products_rating ON products (rating, product_id);
@@ -0,0 +1,7 @@
+-- Optimistic concurrency: every write bumps version, GETs return it as the
+-- ETag, and PUT/DELETE with If-Match add "AND version = %s" to their WHERE.
+-- Existing rows start at 1, the same value new rows get.
+
+ALTER TABLE products ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1;
+ALTER TABLE categories ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1;
+ALTER TABLE inventories ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1;
@@ -0,0 +1,88 @@
+-- Opt-in: convert every CHAR(36) UUID column to BINARY(16).
+--
+--   python -m framework.migrations apply-optional 9001
+--   then deploy with DB_BINARY_UUIDS=true
+--
+-- Apply it after all numbered migrations; it rebuilds their indexes.
+--
+-- Rewrites all three tables; take a backup and run it in a maintenance
+-- window. Existing ids keep their value (only the encoding changes).
+
+ALTER TABLE inventories DROP FOREIGN KEY fk_inventory_product;
+
+-- products ------------------------------------------------------------------
+
+ALTER TABLE products
+  ADD COLUMN product_id_bin BINARY(16) NULL,
+  ADD COLUMN category_id_bin BINARY(16) NULL,
+  ADD COLUMN inventory_id_bin BINARY(16) NULL;
+
+UPDATE products SET
+  product_id_bin = UNHEX(REPLACE(product_id, '-', '')),
+  category_id_bin = UNHEX(REPLACE(category_id, '-', '')),
+  inventory_id_bin = UNHEX(REPLACE(inventory_id, '-', ''));
+
+-- Indexes whose columns are all dropped go away with them; the others
+-- would only shrink, so drop and re-create them explicitly.
+ALTER TABLE products
+  DROP INDEX idx_products_category_price,
+  DROP INDEX idx_products_category_rating,
+  DROP INDEX idx_products_price,
+  DROP INDEX idx_products_rating,
+  DROP PRIMARY KEY,
+  DROP COLUMN product_id,
+  DROP COLUMN category_id,
+  DROP COLUMN inventory_id;
+
+ALTER TABLE products
+  CHANGE COLUMN product_id_bin product_id BINARY(16) NOT NULL FIRST,
+  CHANGE COLUMN category_id_bin category_id BINARY(16) NULL AFTER rating,
+  CHANGE COLUMN inventory_id_bin inventory_id BINARY(16) NULL AFTER category_id,
+  ADD PRIMARY KEY (product_id),
+  ADD INDEX idx_products_category (category_id, product_id),
+  ADD INDEX idx_products_inventory (inventory_id, product_id),
+  ADD INDEX idx_products_category_price (category_id, price, product_id),
+  ADD INDEX idx_products_category_rating (category_id, rating, product_id),
+  ADD INDEX idx_products_price (price, product_id),
+  ADD INDEX idx_products_rating (rating, product_id);
+
+-- categories ----------------------------------------------------------------
+
+ALTER TABLE categories ADD COLUMN category_id_bin BINARY(16) NULL;
+
+UPDATE categories SET category_id_bin = UNHEX(REPLACE(category_id, '-', ''));
+
+ALTER TABLE categories
+  DROP INDEX idx_categories_name_folded,
+  DROP PRIMARY KEY,
+  DROP COLUMN category_id;
+
+ALTER TABLE categories
+  CHANGE COLUMN category_id_bin category_id BINARY(16) NOT NULL FIRST,
+  ADD PRIMARY KEY (category_id),
+  ADD INDEX idx_categories_name_folded (name_folded, category_id);
+
+-- inventories ---------------------------------------------------------------
+
+ALTER TABLE inventories
+  ADD COLUMN inventory_id_bin BINARY(16) NULL,
+  ADD COLUMN product_id_bin BINARY(16) NULL;
+
+UPDATE inventories SET
+  inventory_id_bin = UNHEX(REPLACE(inventory_id, '-', '')),
+  product_id_bin = UNHEX(REPLACE(product_id, '-', ''));
+
+ALTER TABLE inventories
+  DROP INDEX idx_inventories_warehouse,
+  DROP PRIMARY KEY,
+  DROP COLUMN inventory_id,
+  DROP COLUMN product_id;
+
+ALTER TABLE inventories
+  CHANGE COLUMN inventory_id_bin inventory_id BINARY(16) NOT NULL FIRST,
+  CHANGE COLUMN product_id_bin product_id BINARY(16) NOT NULL AFTER inventory_id,
+  ADD PRIMARY KEY (inventory_id),
+  ADD INDEX idx_inventories_product (product_id, inventory_id),
+  ADD INDEX idx_inventories_warehouse (warehouse_location, inventory_id),
+  ADD CONSTRAINT fk_inventory_product
+    FOREIGN KEY (product_id) REFERENCES products (product_id);
@@ -0,0 +1,34 @@
+from __future__ import annotations
+from typing import Any, Generic, List, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class BatchItemError(BaseModel):
+    index: int = Field(..., description="Position of the rejected item in the request body.")
+    errors: List[Any] = Field(..., description="Validation or database errors for this item.")
+
+
+class BatchGetResult(BaseModel, Generic[T]):
+    items: List[T] = Field(
+        default_factory=list,
+        description="Found records, in the order their IDs were requested.",
+    )
+    missing: List[UUID] = Field(
+        default_factory=list,
+        description="Requested IDs that do not exist.",
+    )
+
+
+class BatchCreateResult(BaseModel, Generic[T]):
+    created: List[T] = Field(
+        default_factory=list,
+        description="Created records, in the same relative order as the accepted input items.",
+    )
+    errors: List[BatchItemError] = Field(
+        default_factory=list,
+        description="Items that were rejected; the rest of the batch was still inserted.",
+    )
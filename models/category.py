@@ -63,6 +63,12 @@ class CategoryRead(CategoryBase):
         description="Last category update timestamp (UTC).",
         json_schema_extra={"example": "2025-01-16T12:00:00Z"},
     )
+    version: int = Field(
+        default=1,
+        ge=1,
+        description="Incremented on every update; the category's ETag.",
+        json_schema_extra={"example": 3},
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -73,12 +79,32 @@ class CategoryRead(CategoryBase):
                     "description": "All peripheral devices and accessories for computers.",
                     "created_at": "2025-01-15T10:20:30Z",
                     "updated_at": "2025-01-16T12:00:00Z",
+                    "version": 3,
                 }
             ]
         }
     }
 
 
+class CategoryStats(BaseModel):
+    category_id: UUID = Field(
+        ...,
+        description="Category the figures belong to.",
+        json_schema_extra={"example": "9c37a7e4-6f6d-49f5-b2ea-34a3b29d9a11"},
+    )
+    product_count: int = Field(..., description="Number of products in the category.", example=42)
+    average_price: Optional[float] = Field(
+        None, description="Mean product price in USD (null when empty).", example=54.25
+    )
+    rated_product_count: int = Field(..., description="Products that have a rating.", example=37)
+    average_rating: Optional[float] = Field(
+        None, description="Mean rating over rated products (null when none).", example=4.31
+    )
+    total_stock: int = Field(
+        ..., description="Units in stock across the category's inventory rows.", example=1830
+    )
+
+
 class CategoryDelete(BaseModel):
     """Placeholder for Category deletion request model."""
     pass
@@ -71,12 +71,56 @@ class InventoryUpdate(BaseModel):
     }
 
 
+class InventoryAdjust(BaseModel):
+    delta: int = Field(
+        ...,
+        description="Signed change to apply to stock_quantity; rejected if it would go below zero.",
+        example=-2,
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"delta": -2},
+                {"delta": 50},
+            ]
+        }
+    }
+
+
+class InventoryAdjustItem(InventoryAdjust):
+    inventory_id: UUID = Field(
+        ...,
+        description="Inventory record to adjust.",
+        json_schema_extra={"example": "b6f63b25-15d8-4e12-8c6e-8a87a1254e22"},
+    )
+
+
+class InventoryStockLevel(BaseModel):
+    inventory_id: UUID = Field(
+        ...,
+        description="Adjusted inventory record.",
+        json_schema_extra={"example": "b6f63b25-15d8-4e12-8c6e-8a87a1254e22"},
+    )
+    stock_quantity: int = Field(
+        ...,
+        description="Stock quantity after the adjustment.",
+        example=318,
+    )
+
+
 class InventoryRead(InventoryBase):
     created_at: datetime = Field(
         default_factory=datetime.utcnow,
         description="Creation timestamp of inventory record (UTC).",
         json_schema_extra={"example": "2025-01-15T10:20:30Z"},
     )
+    version: int = Field(
+        default=1,
+        ge=1,
+        description="Incremented by every update and stock adjustment; the record's ETag.",
+        json_schema_extra={"example": 3},
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -88,6 +132,7 @@ class InventoryRead(InventoryBase):
                     "warehouse_location": "Warehouse A - Section B3",
                     "update_time": "2025-01-16T12:00:00Z",
                     "created_at": "2025-01-15T10:20:30Z",
+                    "version": 3,
                 }
             ]
         }
@@ -103,6 +103,12 @@ class ProductRead(ProductBase):
         description="Last update timestamp (UTC).",
         json_schema_extra={"example": "2025-01-16T12:00:00Z"},
     )
+    version: int = Field(
+        default=1,
+        ge=1,
+        description="Row version, bumped by every write. Returned as the ETag; send it back in If-Match.",
+        json_schema_extra={"example": 3},
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -117,12 +123,21 @@ class ProductRead(ProductBase):
                     "inventory_id": "b6f63b25-15d8-4e12-8c6e-8a87a1254e22",
                     "created_at": "2025-01-15T10:20:30Z",
                     "updated_at": "2025-01-16T12:00:00Z",
+                    "version": 3,
                 }
             ]
         }
     }
 
 
+class ProductSearchHit(ProductRead):
+    score: float = Field(
+        ...,
+        description="Relevance score (BM25); higher is better.",
+        example=7.42,
+    )
+
+
 class ProductDelete(BaseModel):
     """Placeholder for Product deletion request model."""
     pass
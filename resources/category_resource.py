@@ -79,103 +79,362 @@
 #         del categories[category_id]
 #         return {"detail": "Category deleted successfully"}
 
-from typing import List, Optional
-from uuid import UUID, uuid4
+from typing import Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
 from datetime import datetime
 from fastapi import HTTPException, Query
+from pymysql.err import IntegrityError
 
-from models.category import CategoryCreate, CategoryRead, CategoryUpdate
+from models.category import CategoryCreate, CategoryRead, CategoryStats, CategoryUpdate
+from storage.base import DuplicateKey, VersionConflict
+from utils.batch import chunked
+from utils.export import stream_query
+from utils.fields import select_list
+from utils.http_cache import version_conflict
+from utils.pagination import DEFAULT_LIMIT, decode_id_cursor, keyset_page
+from utils.uuid_codec import uuid_codec
+
+# Columns a client may ask for with ?fields=
+CATEGORY_FIELDS = ("category_id", "name", "description", "created_at", "updated_at", "version")
 
 
 class CategoryResource:
     """Resource class for Category CRUD operations (Cloud SQL backed)"""
 
-    # get_connection is injected from main.py
+    # get_connection is injected from main.py (a pooled checkout; close() returns it)
     get_connection = None
+    # Read-only methods use get_read_connection (may be a replica), also injected from main.py
+    get_read_connection = None
+    # Optional read-through cache for get_category_by_id, also injected from main.py
+    cache = None
+    # Optional in-memory CategorySnapshot serving all reads, also injected from main.py
+    snapshot = None
+    # Optional CategoryAggregates (moved by product/inventory writes), also injected from main.py
+    aggregates = None
+    # Optional Storage engine used instead of MySQL (e.g. MemoryStorage), also injected from main.py
+    storage = None
+
+    @staticmethod
+    def _from_row(row: dict) -> CategoryRead:
+        # Rows come from our own table, so skip re-running Pydantic validation.
+        return CategoryRead.model_construct(
+            category_id=uuid_codec.from_db(row["category_id"]),
+            name=row["name"],
+            description=row["description"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            version=row["version"],
+        )
 
     @staticmethod
     def create_category(category: CategoryCreate) -> CategoryRead:
-        conn = CategoryResource.get_connection()
-        category_id = str(uuid4())
+        category_id = uuid_codec.new_id()
         now = datetime.utcnow()
-
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO categories
-                (category_id, name, description, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (
-                    category_id,
-                    category.name,
-                    category.description,
-                    now,
-                    now,
-                ),
-            )
-        conn.commit()
-
-        return CategoryRead(
-            category_id=UUID(category_id),
+        created = CategoryRead(
+            category_id=category_id,
             name=category.name,
             description=category.description,
             created_at=now,
             updated_at=now,
         )
 
+        if CategoryResource.storage is not None:
+            CategoryResource.storage.insert("categories", [created.model_dump()])
+        else:
+            conn = CategoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO categories
+                        (category_id, name, description, created_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        (
+                            uuid_codec.to_db(category_id),
+                            category.name,
+                            category.description,
+                            now,
+                            now,
+                        ),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+
+        if CategoryResource.snapshot is not None:
+            CategoryResource.snapshot.upsert(created)
+        return created
+
     @staticmethod
-    def get_categories(name: Optional[str] = Query(None)) -> List[CategoryRead]:
-        conn = CategoryResource.get_connection()
+    def create_categories(categories: List[CategoryCreate]) -> List[CategoryRead]:
+        """Insert many categories with one executemany in a single transaction."""
+        now = datetime.utcnow()
+        created = [
+            CategoryRead(
+                category_id=uuid_codec.new_id(),
+                name=category.name,
+                description=category.description,
+                created_at=now,
+                updated_at=now,
+            )
+            for category in categories
+        ]
 
-        query = "SELECT * FROM categories WHERE 1=1"
+        if CategoryResource.storage is not None:
+            try:
+                CategoryResource.storage.insert("categories", [c.model_dump() for c in created])
+            except DuplicateKey as exc:
+                raise HTTPException(status_code=409, detail=f"Batch insert failed: {exc}")
+        else:
+            conn = CategoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        """
+                        INSERT INTO categories
+                        (category_id, name, description, created_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (uuid_codec.to_db(c.category_id), c.name, c.description, now, now)
+                            for c in created
+                        ],
+                    )
+                conn.commit()
+            except IntegrityError as exc:
+                conn.rollback()
+                raise HTTPException(status_code=409, detail=f"Batch insert failed: {exc.args[-1]}")
+            finally:
+                conn.close()
+
+        if CategoryResource.snapshot is not None:
+            CategoryResource.snapshot.upsert(*created)
+        return created
+
+    @staticmethod
+    def get_categories(
+        name: Optional[str] = Query(None),
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[CategoryRead], Optional[str]]:
+        """Return one keyset page ordered by category_id, plus the next cursor.
+
+        The snapshot holds whole rows already, so ``fields`` only narrows the
+        SELECT on the database fallback; callers project the result.
+        """
+        snapshot = CategoryResource.snapshot
+        if snapshot is not None and snapshot.loaded:
+            return snapshot.page(name, limit, cursor)
+
+        if CategoryResource.storage is not None:
+            rows = CategoryResource.storage.find(
+                "categories",
+                where={"name_folded": name.lower()} if name else None,
+                after=(decode_id_cursor(cursor),) if cursor else None,
+                limit=limit + 1,
+            )
+            categories = [CategoryResource._from_row(row) for row in rows]
+            return keyset_page(categories, limit, key=lambda c: [str(c.category_id)])
+
+        conn = CategoryResource.get_read_connection()
+
+        query = f"SELECT {select_list(fields, 'category_id', 'updated_at', 'version')} FROM categories WHERE 1=1"
         params = []
 
         if name:
-            query += " AND LOWER(name) = LOWER(%s)"
+            query += " AND name_folded = LOWER(%s)"
             params.append(name)
 
-        with conn.cursor() as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
+        if cursor:
+            query += " AND category_id > %s"
+            params.append(uuid_codec.to_db(decode_id_cursor(cursor)))
 
-        return [
-            CategoryRead(
-                category_id=UUID(row["category_id"]),
-                name=row["name"],
-                description=row["description"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
+        query += " ORDER BY category_id LIMIT %s"
+        params.append(limit + 1)
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+        finally:
+            conn.close()
+
+        if fields is not None:
+            rows = [uuid_codec.decode_row(row, "category_id") for row in rows]
+            return keyset_page(rows, limit, key=lambda r: [r["category_id"]])
+
+        categories = [CategoryResource._from_row(row) for row in rows]
+        return keyset_page(categories, limit, key=lambda c: [str(c.category_id)])
+
+    @staticmethod
+    def export_categories(name: Optional[str] = None) -> Iterator[dict]:
+        """Stream every matching row through a server-side cursor."""
+        if CategoryResource.storage is not None:
+            return CategoryResource.storage.scan(
+                "categories", where={"name_folded": name.lower()} if name else None
             )
-            for row in rows
-        ]
+
+        query = "SELECT category_id, name, description, created_at, updated_at FROM categories WHERE 1=1"
+        params = []
+
+        if name:
+            query += " AND name_folded = LOWER(%s)"
+            params.append(name)
+
+        query += " ORDER BY category_id"
+        return stream_query(
+            CategoryResource.get_read_connection,
+            query,
+            params,
+            transform=lambda row: uuid_codec.decode_row(row, "category_id"),
+        )
 
     @staticmethod
-    def get_category_by_id(category_id: UUID) -> CategoryRead:
-        conn = CategoryResource.get_connection()
+    def get_category_by_id(category_id: UUID, fields: Optional[Sequence[str]] = None) -> CategoryRead:
+        snapshot = CategoryResource.snapshot
+        if snapshot is not None:
+            category = snapshot.get(category_id)
+            if category is not None:
+                return category
+
+        # Snapshot miss: not loaded yet, or created elsewhere since the last refresh.
+        cache = CategoryResource.cache
+        if cache is not None:
+            cached = cache.get(category_id)
+            if cached is not None:
+                return cached
+
+        category = CategoryResource._fetch_category(category_id, fields)
+        # Partial rows never go into the cache.
+        if cache is not None and fields is None:
+            cache.set(category_id, category)
+        return category
 
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT * FROM categories WHERE category_id = %s",
-                (str(category_id),),
-            )
-            row = cur.fetchone()
+    @staticmethod
+    def _fetch_category(category_id: UUID, fields: Optional[Sequence[str]] = None) -> CategoryRead:
+        """Read one row; with ``fields`` it returns the raw projected row instead."""
+        storage = CategoryResource.storage
+        if storage is not None:
+            row = storage.get("categories", category_id)
+        else:
+            conn = CategoryResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"SELECT {select_list(fields, 'category_id', 'updated_at', 'version')} FROM categories WHERE category_id = %s",
+                        (uuid_codec.to_db(category_id),),
+                    )
+                    row = cur.fetchone()
+            finally:
+                conn.close()
 
         if not row:
             raise HTTPException(status_code=404, detail="Category not found")
 
-        return CategoryRead(
-            category_id=UUID(row["category_id"]),
-            name=row["name"],
-            description=row["description"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
+        if fields is not None:
+            return uuid_codec.decode_row(row, "category_id")
+        return CategoryResource._from_row(row)
+
+    @staticmethod
+    def get_category_validators(category_id: UUID) -> Tuple[int, datetime]:
+        """(version, updated_at) for conditional GETs: snapshot, cache, or a two-column SELECT."""
+        snapshot = CategoryResource.snapshot
+        category = snapshot.get(category_id) if snapshot is not None else None
+        if category is None and CategoryResource.cache is not None:
+            category = CategoryResource.cache.get(category_id)
+        if category is not None:
+            return category.version, category.updated_at
+
+        if CategoryResource.storage is not None:
+            row = CategoryResource.storage.get("categories", category_id)
+        else:
+            conn = CategoryResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT version, updated_at FROM categories WHERE category_id = %s",
+                        (uuid_codec.to_db(category_id),),
+                    )
+                    row = cur.fetchone()
+            finally:
+                conn.close()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Category not found")
+        return row["version"], row["updated_at"]
+
+    @staticmethod
+    def get_categories_by_ids(category_ids: List[UUID]) -> Tuple[List[CategoryRead], List[UUID]]:
+        """Fetch many categories: snapshot first, then chunked IN queries.
+
+        Returns (found categories in request order, ids that do not exist).
+        """
+        snapshot = CategoryResource.snapshot
+        found = {}
+        pending = []
+        for category_id in category_ids:
+            category = snapshot.get(category_id) if snapshot is not None else None
+            if category is not None:
+                found[category_id] = category
+            else:
+                pending.append(category_id)
+
+        if pending and CategoryResource.storage is not None:
+            for row in CategoryResource.storage.get_many("categories", pending).values():
+                category = CategoryResource._from_row(row)
+                found[category.category_id] = category
+        elif pending:
+            conn = CategoryResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    for chunk in chunked(pending):
+                        cur.execute(
+                            f"SELECT * FROM categories WHERE category_id IN ({', '.join(['%s'] * len(chunk))})",
+                            uuid_codec.to_db_many(chunk),
+                        )
+                        for row in cur.fetchall():
+                            category = CategoryResource._from_row(row)
+                            found[category.category_id] = category
+            finally:
+                conn.close()
+
+        return (
+            [found[i] for i in category_ids if i in found],
+            [i for i in category_ids if i not in found],
         )
 
+    @staticmethod
+    def get_category_stats(category_id: UUID) -> CategoryStats:
+        """O(1) per-category figures from the in-memory aggregates."""
+        # 404 for unknown ids rather than a row of zeros.
+        CategoryResource.get_category_by_id(category_id)
+        stats = CategoryResource._aggregates_or_503().get(category_id)
+        return CategoryStats.model_construct(**stats)
+
+    @staticmethod
+    def get_all_category_stats(category_ids: Optional[List[UUID]] = None) -> List[CategoryStats]:
+        """Stats for the given ids (zeros when empty), or every non-empty category."""
+        aggregates = CategoryResource._aggregates_or_503()
+        if category_ids is None:
+            rows = aggregates.all()
+        else:
+            rows = [aggregates.get(category_id) for category_id in category_ids]
+        return [CategoryStats.model_construct(**row) for row in rows]
+
+    @staticmethod
+    def _aggregates_or_503():
+        aggregates = CategoryResource.aggregates
+        if aggregates is None or not aggregates.loaded:
+            raise HTTPException(status_code=503, detail="Category stats are not available yet")
+        return aggregates
+
     @staticmethod
     def update_category(
         category_id: UUID,
-        category_update: CategoryUpdate
+        category_update: CategoryUpdate,
+        expected_version: Optional[int] = None,
     ) -> CategoryRead:
 
         updates = category_update.model_dump(exclude_unset=True)
@@ -184,36 +443,89 @@ class CategoryResource:
 
         updates["updated_at"] = datetime.utcnow()
 
-        set_clause = ", ".join(f"{k} = %s" for k in updates.keys())
-        params = list(updates.values()) + [str(category_id)]
-
-        conn = CategoryResource.get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                f"""
-                UPDATE categories
-                SET {set_clause}
-                WHERE category_id = %s
-                """,
-                params,
-            )
-            if cur.rowcount == 0:
+        if CategoryResource.storage is not None:
+            try:
+                updated = CategoryResource.storage.update("categories", category_id, updates, expected_version)
+            except VersionConflict as exc:
+                raise version_conflict(exc.expected, exc.current)
+            if updated is None:
                 raise HTTPException(status_code=404, detail="Category not found")
-
-        conn.commit()
-        return CategoryResource.get_category_by_id(category_id)
+        else:
+            set_clause = ", ".join(f"{k} = %s" for k in updates.keys())
+            params = list(updates.values()) + [uuid_codec.to_db(category_id)]
+            version_clause = ""
+            if expected_version is not None:
+                version_clause = " AND version = %s"
+                params.append(expected_version)
+
+            conn = CategoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        UPDATE categories
+                        SET {set_clause}, version = version + 1
+                        WHERE category_id = %s{version_clause}
+                        """,
+                        params,
+                    )
+                    if cur.rowcount == 0:
+                        CategoryResource._missing_or_conflict(cur, category_id, expected_version)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+        # Re-read from the database (not the snapshot) and refresh both layers.
+        category = CategoryResource._fetch_category(category_id)
+        if CategoryResource.cache is not None:
+            CategoryResource.cache.set(category_id, category)
+        if CategoryResource.snapshot is not None:
+            CategoryResource.snapshot.upsert(category)
+        return category
 
     @staticmethod
-    def delete_category(category_id: UUID) -> dict:
-        conn = CategoryResource.get_connection()
+    def _missing_or_conflict(cur, category_id: UUID, expected_version: Optional[int]) -> None:
+        """Raise 412 if a conditional write missed because the row moved on, else 404."""
+        if expected_version is not None:
+            cur.execute("SELECT version FROM categories WHERE category_id = %s", (uuid_codec.to_db(category_id),))
+            row = cur.fetchone()
+            if row:
+                raise version_conflict(expected_version, row["version"])
+        raise HTTPException(status_code=404, detail="Category not found")
 
-        with conn.cursor() as cur:
-            cur.execute(
-                "DELETE FROM categories WHERE category_id = %s",
-                (str(category_id),),
-            )
-            if cur.rowcount == 0:
+    @staticmethod
+    def delete_category(category_id: UUID, expected_version: Optional[int] = None) -> dict:
+        if CategoryResource.storage is not None:
+            try:
+                deleted = CategoryResource.storage.delete("categories", category_id, expected_version)
+            except VersionConflict as exc:
+                raise version_conflict(exc.expected, exc.current)
+            if not deleted:
                 raise HTTPException(status_code=404, detail="Category not found")
-
-        conn.commit()
+        else:
+            conn = CategoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    if expected_version is None:
+                        cur.execute(
+                            "DELETE FROM categories WHERE category_id = %s",
+                            (uuid_codec.to_db(category_id),),
+                        )
+                    else:
+                        cur.execute(
+                            "DELETE FROM categories WHERE category_id = %s AND version = %s",
+                            (uuid_codec.to_db(category_id), expected_version),
+                        )
+                    if cur.rowcount == 0:
+                        CategoryResource._missing_or_conflict(cur, category_id, expected_version)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+        if CategoryResource.cache is not None:
+            CategoryResource.cache.invalidate(category_id)
+        if CategoryResource.snapshot is not None:
+            CategoryResource.snapshot.remove(category_id)
         return {"detail": "Category deleted successfully"}
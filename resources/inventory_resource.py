@@ -85,111 +85,389 @@
 #         del inventories[inventory_id]
 #         return {"detail": "Inventory deleted successfully"}
 
-from typing import List, Optional
-from uuid import UUID, uuid4
+from typing import Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
 from datetime import datetime
 from fastapi import HTTPException, Query
-
-from models.inventory import InventoryCreate, InventoryRead, InventoryUpdate
+from pymysql.err import IntegrityError
+
+from models.inventory import (
+    InventoryAdjustItem,
+    InventoryCreate,
+    InventoryRead,
+    InventoryStockLevel,
+    InventoryUpdate,
+)
+from storage.base import CheckViolation, DuplicateKey, MissingRows, VersionConflict
+from utils.batch import chunked
+from utils.export import stream_query
+from utils.fields import select_list
+from utils.http_cache import version_conflict
+from utils.pagination import DEFAULT_LIMIT, decode_id_cursor, keyset_page
+from utils.uuid_codec import uuid_codec
+
+ID_FIELDS = ("inventory_id", "product_id")
+# Columns a client may ask for with ?fields=
+INVENTORY_FIELDS = (
+    "inventory_id", "product_id", "stock_quantity", "warehouse_location", "update_time", "created_at", "version",
+)
 
 
 class InventoryResource:
     """Resource class for Inventory CRUD operations (Cloud SQL backed)"""
 
-    # get_connection is injected from main.py
+    # get_connection is injected from main.py (a pooled checkout; close() returns it)
     get_connection = None
+    # Read-only methods use get_read_connection (may be a replica), also injected from main.py
+    get_read_connection = None
+    # Optional read-through cache for get_inventory_by_id, also injected from main.py
+    cache = None
+    # Optional CategoryAggregates kept current by every write, also injected from main.py
+    aggregates = None
+    # Optional Storage engine used instead of MySQL (e.g. MemoryStorage), also injected from main.py
+    storage = None
+    # Optional InventoryWriteBuffer for update_inventory (write-behind), also injected from main.py
+    write_buffer = None
 
     @staticmethod
-    def create_inventory(inventory: InventoryCreate) -> InventoryRead:
-        conn = InventoryResource.get_connection()
-        inventory_id = str(uuid4())
-        now = inventory.update_time or datetime.utcnow()
+    def _from_row(row: dict) -> InventoryRead:
+        # Rows come from our own table, so skip re-running Pydantic validation.
+        return InventoryRead.model_construct(
+            inventory_id=uuid_codec.from_db(row["inventory_id"]),
+            product_id=uuid_codec.from_db(row["product_id"]),
+            stock_quantity=row["stock_quantity"],
+            warehouse_location=row["warehouse_location"],
+            update_time=row["update_time"],
+            created_at=row["created_at"],
+            version=row["version"],
+        )
 
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO inventories
-                (inventory_id, product_id, stock_quantity, warehouse_location, update_time)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (
-                    inventory_id,
-                    str(inventory.product_id),
-                    inventory.stock_quantity,
-                    inventory.warehouse_location,
-                    now,
-                ),
-            )
-        conn.commit()
+    @staticmethod
+    def _overlay(row: dict) -> dict:
+        """Apply values still waiting in the write buffer to a row read from MySQL.
+
+        Every read path goes through here, so this instance never shows a
+        row older than its own PUT. Filters (product_id, warehouse_location)
+        still match the stored values until the flush.
+        """
+        buffer = InventoryResource.write_buffer
+        pending = buffer.pending(uuid_codec.from_db(row["inventory_id"])) if buffer is not None else None
+        if pending:
+            values, bumps = pending
+            row.update((k, v) for k, v in values.items() if k in row)
+            if "version" in row:
+                row["version"] += bumps
+        return row
 
-        return InventoryRead(
-            inventory_id=UUID(inventory_id),
+    @staticmethod
+    def _flush_pending(inventory_ids: List[UUID]) -> None:
+        # Direct writes must land after any buffered value for the same rows.
+        if InventoryResource.write_buffer is not None:
+            InventoryResource.write_buffer.flush(inventory_ids)
+
+    @staticmethod
+    def _to_row(inventory: InventoryRead) -> dict:
+        # created_at has no column DEFAULT, so every insert path sets it.
+        return {**inventory.model_dump(), "created_at": inventory.created_at or datetime.utcnow()}
+
+    @staticmethod
+    def create_inventory(inventory: InventoryCreate) -> InventoryRead:
+        inventory_id = uuid_codec.new_id()
+        now = inventory.update_time or datetime.utcnow()
+        created = InventoryRead(
+            inventory_id=inventory_id,
             product_id=inventory.product_id,
             stock_quantity=inventory.stock_quantity,
             warehouse_location=inventory.warehouse_location,
             update_time=now,
         )
 
+        if InventoryResource.storage is not None:
+            InventoryResource.storage.insert("inventories", [InventoryResource._to_row(created)])
+        else:
+            conn = InventoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO inventories
+                        (inventory_id, product_id, stock_quantity, warehouse_location, update_time, created_at)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        """,
+                        (
+                            uuid_codec.to_db(inventory_id),
+                            uuid_codec.to_db(inventory.product_id),
+                            inventory.stock_quantity,
+                            inventory.warehouse_location,
+                            now,
+                            created.created_at,
+                        ),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+
+        if InventoryResource.aggregates is not None:
+            InventoryResource.aggregates.upsert_inventories(created)
+        return created
+
+    @staticmethod
+    def create_inventories(inventories: List[InventoryCreate]) -> List[InventoryRead]:
+        """Insert many inventory rows with one executemany in a single transaction."""
+        now = datetime.utcnow()
+        created = [
+            InventoryRead(
+                inventory_id=uuid_codec.new_id(),
+                product_id=inventory.product_id,
+                stock_quantity=inventory.stock_quantity,
+                warehouse_location=inventory.warehouse_location,
+                update_time=inventory.update_time or now,
+                created_at=now,
+            )
+            for inventory in inventories
+        ]
+
+        if InventoryResource.storage is not None:
+            try:
+                InventoryResource.storage.insert("inventories", [InventoryResource._to_row(i) for i in created])
+            except DuplicateKey as exc:
+                raise HTTPException(status_code=409, detail=f"Batch insert failed: {exc}")
+        else:
+            conn = InventoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        """
+                        INSERT INTO inventories
+                        (inventory_id, product_id, stock_quantity, warehouse_location, update_time, created_at)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (
+                                uuid_codec.to_db(i.inventory_id),
+                                uuid_codec.to_db(i.product_id),
+                                i.stock_quantity,
+                                i.warehouse_location,
+                                i.update_time,
+                                i.created_at,
+                            )
+                            for i in created
+                        ],
+                    )
+                conn.commit()
+            except IntegrityError as exc:
+                conn.rollback()
+                raise HTTPException(status_code=409, detail=f"Batch insert failed: {exc.args[-1]}")
+            finally:
+                conn.close()
+
+        if InventoryResource.aggregates is not None:
+            InventoryResource.aggregates.upsert_inventories(*created)
+        return created
+
     @staticmethod
     def get_inventories(
         product_id: Optional[UUID] = Query(None),
         warehouse_location: Optional[str] = Query(None),
-    ) -> List[InventoryRead]:
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[InventoryRead], Optional[str]]:
+        """Return one keyset page ordered by inventory_id, plus the next cursor.
+
+        With ``fields`` (whitelisted) only those columns, the key and
+        update_time are read, and raw rows are returned instead of models.
+        """
+        if InventoryResource.storage is not None:
+            rows = InventoryResource.storage.find(
+                "inventories",
+                where={
+                    k: v for k, v in (("product_id", product_id), ("warehouse_location", warehouse_location)) if v
+                },
+                after=(decode_id_cursor(cursor),) if cursor else None,
+                limit=limit + 1,
+            )
+            inventories = [InventoryResource._from_row(row) for row in rows]
+            return keyset_page(inventories, limit, key=lambda i: [str(i.inventory_id)])
 
-        conn = InventoryResource.get_connection()
+        conn = InventoryResource.get_read_connection()
 
-        query = "SELECT * FROM inventories WHERE 1=1"
+        query = f"SELECT {select_list(fields, 'inventory_id', 'update_time', 'version')} FROM inventories WHERE 1=1"
         params = []
 
         if product_id:
             query += " AND product_id = %s"
-            params.append(str(product_id))
+            params.append(uuid_codec.to_db(product_id))
 
         if warehouse_location:
             query += " AND warehouse_location = %s"
             params.append(warehouse_location)
 
-        with conn.cursor() as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
+        if cursor:
+            query += " AND inventory_id > %s"
+            params.append(uuid_codec.to_db(decode_id_cursor(cursor)))
 
-        return [
-            InventoryRead(
-                inventory_id=UUID(row["inventory_id"]),
-                product_id=UUID(row["product_id"]),
-                stock_quantity=row["stock_quantity"],
-                warehouse_location=row["warehouse_location"],
-                update_time=row["update_time"],
+        query += " ORDER BY inventory_id LIMIT %s"
+        params.append(limit + 1)
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = [InventoryResource._overlay(row) for row in cur.fetchall()]
+        finally:
+            conn.close()
+
+        if fields is not None:
+            rows = [uuid_codec.decode_row(row, *ID_FIELDS) for row in rows]
+            return keyset_page(rows, limit, key=lambda r: [r["inventory_id"]])
+
+        inventories = [InventoryResource._from_row(row) for row in rows]
+        return keyset_page(inventories, limit, key=lambda i: [str(i.inventory_id)])
+
+    @staticmethod
+    def export_inventories(
+        product_id: Optional[UUID] = None,
+        warehouse_location: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Stream every matching row through a server-side cursor."""
+        if InventoryResource.storage is not None:
+            return InventoryResource.storage.scan(
+                "inventories",
+                where={
+                    k: v for k, v in (("product_id", product_id), ("warehouse_location", warehouse_location)) if v
+                },
             )
-            for row in rows
-        ]
+
+        query = "SELECT * FROM inventories WHERE 1=1"
+        params = []
+
+        if product_id:
+            query += " AND product_id = %s"
+            params.append(uuid_codec.to_db(product_id))
+
+        if warehouse_location:
+            query += " AND warehouse_location = %s"
+            params.append(warehouse_location)
+
+        query += " ORDER BY inventory_id"
+        return stream_query(
+            InventoryResource.get_read_connection,
+            query,
+            params,
+            transform=lambda row: uuid_codec.decode_row(InventoryResource._overlay(row), *ID_FIELDS),
+        )
 
     @staticmethod
-    def get_inventory_by_id(inventory_id: UUID) -> InventoryRead:
-        conn = InventoryResource.get_connection()
+    def get_inventory_by_id(inventory_id: UUID, fields: Optional[Sequence[str]] = None) -> InventoryRead:
+        cache = InventoryResource.cache
+        if cache is not None:
+            cached = cache.get(inventory_id)
+            if cached is not None:
+                return cached
+
+        if InventoryResource.storage is not None:
+            row = InventoryResource.storage.get("inventories", inventory_id)
+        else:
+            conn = InventoryResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"SELECT {select_list(fields, 'inventory_id', 'update_time', 'version')} FROM inventories WHERE inventory_id = %s",
+                        (uuid_codec.to_db(inventory_id),),
+                    )
+                    row = cur.fetchone()
+            finally:
+                conn.close()
+            if row:
+                InventoryResource._overlay(row)
 
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT * FROM inventories WHERE inventory_id = %s",
-                (str(inventory_id),),
-            )
-            row = cur.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Inventory not found")
+
+        # Partial rows never go into the cache.
+        if fields is not None:
+            return uuid_codec.decode_row(row, *ID_FIELDS)
+
+        inventory = InventoryResource._from_row(row)
+        if cache is not None:
+            cache.set(inventory_id, inventory)
+        return inventory
+
+    @staticmethod
+    def get_inventory_validators(inventory_id: UUID) -> Tuple[int, datetime]:
+        """(version, update_time) for conditional GETs: cache hit or a two-column SELECT."""
+        cache = InventoryResource.cache
+        cached = cache.get(inventory_id) if cache is not None else None
+        if cached is not None:
+            return cached.version, cached.update_time
+
+        if InventoryResource.storage is not None:
+            row = InventoryResource.storage.get("inventories", inventory_id)
+        else:
+            conn = InventoryResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT inventory_id, version, update_time FROM inventories WHERE inventory_id = %s",
+                        (uuid_codec.to_db(inventory_id),),
+                    )
+                    row = cur.fetchone()
+            finally:
+                conn.close()
+            if row:
+                InventoryResource._overlay(row)
 
         if not row:
             raise HTTPException(status_code=404, detail="Inventory not found")
+        return row["version"], row["update_time"]
 
-        return InventoryRead(
-            inventory_id=UUID(row["inventory_id"]),
-            product_id=UUID(row["product_id"]),
-            stock_quantity=row["stock_quantity"],
-            warehouse_location=row["warehouse_location"],
-            update_time=row["update_time"],
+    @staticmethod
+    def get_inventories_by_ids(inventory_ids: List[UUID]) -> Tuple[List[InventoryRead], List[UUID]]:
+        """Fetch many inventory rows with chunked IN queries.
+
+        Returns (found rows in request order, ids that do not exist).
+        """
+        cache = InventoryResource.cache
+        found = {}
+        pending = []
+        for inventory_id in inventory_ids:
+            cached = cache.get(inventory_id) if cache is not None else None
+            if cached is not None:
+                found[inventory_id] = cached
+            else:
+                pending.append(inventory_id)
+
+        if pending and InventoryResource.storage is not None:
+            for row in InventoryResource.storage.get_many("inventories", pending).values():
+                inventory = InventoryResource._from_row(row)
+                found[inventory.inventory_id] = inventory
+        elif pending:
+            conn = InventoryResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    for chunk in chunked(pending):
+                        cur.execute(
+                            f"SELECT * FROM inventories WHERE inventory_id IN ({', '.join(['%s'] * len(chunk))})",
+                            uuid_codec.to_db_many(chunk),
+                        )
+                        for row in cur.fetchall():
+                            inventory = InventoryResource._from_row(InventoryResource._overlay(row))
+                            found[inventory.inventory_id] = inventory
+                            if cache is not None:
+                                cache.set(inventory.inventory_id, inventory)
+            finally:
+                conn.close()
+
+        return (
+            [found[i] for i in inventory_ids if i in found],
+            [i for i in inventory_ids if i not in found],
         )
 
     @staticmethod
     def update_inventory(
         inventory_id: UUID,
-        inventory_update: InventoryUpdate
+        inventory_update: InventoryUpdate,
+        expected_version: Optional[int] = None,
     ) -> InventoryRead:
 
         updates = inventory_update.model_dump(exclude_unset=True)
@@ -198,36 +476,256 @@ class InventoryResource:
 
         updates["update_time"] = datetime.utcnow()
 
-        set_clause = ", ".join(f"{k} = %s" for k in updates.keys())
-        params = list(updates.values()) + [str(inventory_id)]
-
-        conn = InventoryResource.get_connection()
-        with conn.cursor() as cur:
-            cur.execute(
-                f"""
-                UPDATE inventories
-                SET {set_clause}
-                WHERE inventory_id = %s
-                """,
-                params,
-            )
-            if cur.rowcount == 0:
+        if InventoryResource.write_buffer is not None:
+            # A conditional update must see the row as written, so it skips
+            # the buffer once the row's pending values are flushed.
+            if expected_version is None:
+                return InventoryResource._buffer_update(inventory_id, updates)
+            InventoryResource._flush_pending([inventory_id])
+
+        if InventoryResource.storage is not None:
+            try:
+                updated = InventoryResource.storage.update("inventories", inventory_id, updates, expected_version)
+            except VersionConflict as exc:
+                raise version_conflict(exc.expected, exc.current)
+            if updated is None:
                 raise HTTPException(status_code=404, detail="Inventory not found")
+        else:
+            set_clause = ", ".join(f"{k} = %s" for k in updates.keys())
+            params = list(updates.values()) + [uuid_codec.to_db(inventory_id)]
+            version_clause = ""
+            if expected_version is not None:
+                version_clause = " AND version = %s"
+                params.append(expected_version)
+
+            conn = InventoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        UPDATE inventories
+                        SET {set_clause}, version = version + 1
+                        WHERE inventory_id = %s{version_clause}
+                        """,
+                        params,
+                    )
+                    if cur.rowcount == 0:
+                        InventoryResource._missing_or_conflict(cur, inventory_id, expected_version)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+        # Drop the stale entry; the re-read below repopulates it.
+        if InventoryResource.cache is not None:
+            InventoryResource.cache.invalidate(inventory_id)
+        inventory = InventoryResource.get_inventory_by_id(inventory_id)
+        if InventoryResource.aggregates is not None:
+            InventoryResource.aggregates.upsert_inventories(inventory)
+        return inventory
+
+    @staticmethod
+    def _buffer_update(inventory_id: UUID, updates: dict) -> InventoryRead:
+        """Write-behind path: queue the change and answer from memory.
+
+        The existence check is usually a cache hit; the UPDATE, commit and
+        re-SELECT happen later, coalesced with other updates to the row.
+        """
+        current = InventoryResource.get_inventory_by_id(inventory_id)
+        InventoryResource.write_buffer.put(inventory_id, updates)
+        # The flush bumps the version relative to the row as written, so this
+        # is only this instance's view; If-Match writes flush before checking.
+        inventory = current.model_copy(update={**updates, "version": current.version + 1})
+        if InventoryResource.cache is not None:
+            InventoryResource.cache.set(inventory_id, inventory)
+        if InventoryResource.aggregates is not None:
+            InventoryResource.aggregates.upsert_inventories(inventory)
+        return inventory
 
-        conn.commit()
-        return InventoryResource.get_inventory_by_id(inventory_id)
+    @staticmethod
+    def adjust_stock(inventory_id: UUID, delta: int) -> InventoryStockLevel:
+        """Atomically add ``delta`` to stock_quantity, refusing to go negative.
+
+        One conditional UPDATE does the check and the write. Wrapping the new
+        value in LAST_INSERT_ID(expr) makes MySQL hand it back in the OK
+        packet, so no follow-up SELECT is needed on the success path.
+        """
+        if InventoryResource.storage is not None:
+            new_quantity = InventoryResource._increment({inventory_id: delta})[inventory_id]
+            return InventoryResource._after_adjust({inventory_id: new_quantity}, [inventory_id] if delta else [])[0]
+
+        InventoryResource._flush_pending([inventory_id])
+        conn = InventoryResource.get_connection()
+        try:
+            with conn.cursor() as cur:
+                changed = 0
+                if delta:
+                    cur.execute(
+                        """
+                        UPDATE inventories
+                        SET stock_quantity = LAST_INSERT_ID(stock_quantity + %s),
+                            update_time = %s,
+                            version = version + 1
+                        WHERE inventory_id = %s AND stock_quantity + %s >= 0
+                        """,
+                        (delta, datetime.utcnow(), uuid_codec.to_db(inventory_id), delta),
+                    )
+                    changed = cur.rowcount
+
+                if changed == 1:
+                    new_quantity = cur.lastrowid
+                else:
+                    # Only the failure (or no-op) path pays for a SELECT, to
+                    # tell a missing row apart from insufficient stock.
+                    cur.execute(
+                        "SELECT stock_quantity FROM inventories WHERE inventory_id = %s",
+                        (uuid_codec.to_db(inventory_id),),
+                    )
+                    row = cur.fetchone()
+                    if not row:
+                        raise HTTPException(status_code=404, detail="Inventory not found")
+                    if delta:
+                        raise HTTPException(status_code=409, detail="Insufficient stock")
+                    new_quantity = row["stock_quantity"]
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return InventoryResource._after_adjust({inventory_id: new_quantity}, [inventory_id])[0]
 
     @staticmethod
-    def delete_inventory(inventory_id: UUID) -> dict:
+    def adjust_stock_batch(items: List[InventoryAdjustItem]) -> List[InventoryStockLevel]:
+        """Apply many deltas all-or-nothing with a single CASE-based UPDATE.
+
+        Deltas for the same inventory_id are summed first. If any row is
+        missing or would go negative, nothing is applied.
+        """
+        deltas = {}
+        for item in items:
+            deltas[item.inventory_id] = deltas.get(item.inventory_id, 0) + item.delta
+
+        ids = list(deltas)
+        moving = [i for i in ids if deltas[i]]
+        placeholders = ", ".join(["%s"] * len(ids))
+
+        if InventoryResource.storage is not None:
+            return InventoryResource._after_adjust(InventoryResource._increment(deltas), moving)
+
+        InventoryResource._flush_pending(ids)
         conn = InventoryResource.get_connection()
+        try:
+            with conn.cursor() as cur:
+                changed = 0
+                if moving:
+                    case_sql = "CASE inventory_id " + " ".join("WHEN %s THEN %s" for _ in moving) + " END"
+                    case_params = [v for i in moving for v in (uuid_codec.to_db(i), deltas[i])]
+                    cur.execute(
+                        f"""
+                        UPDATE inventories
+                        SET stock_quantity = stock_quantity + {case_sql},
+                            update_time = %s,
+                            version = version + 1
+                        WHERE inventory_id IN ({", ".join(["%s"] * len(moving))})
+                          AND stock_quantity + {case_sql} >= 0
+                        """,
+                        case_params + [datetime.utcnow()] + uuid_codec.to_db_many(moving) + case_params,
+                    )
+                    changed = cur.rowcount
+
+                cur.execute(
+                    f"SELECT inventory_id, stock_quantity FROM inventories WHERE inventory_id IN ({placeholders})",
+                    uuid_codec.to_db_many(ids),
+                )
+                levels = {
+                    uuid_codec.from_db(row["inventory_id"]): row["stock_quantity"]
+                    for row in cur.fetchall()
+                }
+
+            missing = [i for i in ids if i not in levels]
+            if missing:
+                conn.rollback()
+                raise HTTPException(status_code=404, detail={"missing_ids": [str(i) for i in missing]})
+            if changed < len(moving):
+                conn.rollback()
+                raise HTTPException(status_code=409, detail="Insufficient stock")
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return InventoryResource._after_adjust(levels, moving, ids)
 
-        with conn.cursor() as cur:
-            cur.execute(
-                "DELETE FROM inventories WHERE inventory_id = %s",
-                (str(inventory_id),),
+    @staticmethod
+    def _increment(deltas: dict) -> dict:
+        """Storage-engine path for the adjust methods: all-or-nothing, never below zero."""
+        try:
+            return InventoryResource.storage.increment(
+                "inventories", "stock_quantity", deltas, minimum=0, values={"update_time": datetime.utcnow()}
             )
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Inventory not found")
+        except MissingRows as exc:
+            raise HTTPException(status_code=404, detail={"missing_ids": [str(i) for i in exc.keys]})
+        except CheckViolation:
+            raise HTTPException(status_code=409, detail="Insufficient stock")
+
+    @staticmethod
+    def _after_adjust(
+        levels: dict, moving: List[UUID], ids: Optional[List[UUID]] = None
+    ) -> List[InventoryStockLevel]:
+        if InventoryResource.cache is not None:
+            for i in moving:
+                InventoryResource.cache.invalidate(i)
+        if InventoryResource.aggregates is not None:
+            for i in moving:
+                InventoryResource.aggregates.set_stock(i, levels[i])
+        return [
+            InventoryStockLevel(inventory_id=i, stock_quantity=levels[i])
+            for i in (ids if ids is not None else levels)
+        ]
 
-        conn.commit()
+    @staticmethod
+    def _missing_or_conflict(cur, inventory_id: UUID, expected_version: Optional[int]) -> None:
+        """Raise 412 if a conditional write missed because the row moved on, else 404."""
+        if expected_version is not None:
+            cur.execute("SELECT version FROM inventories WHERE inventory_id = %s", (uuid_codec.to_db(inventory_id),))
+            row = cur.fetchone()
+            if row:
+                raise version_conflict(expected_version, row["version"])
+        raise HTTPException(status_code=404, detail="Inventory not found")
+
+    @staticmethod
+    def delete_inventory(inventory_id: UUID, expected_version: Optional[int] = None) -> dict:
+        if InventoryResource.storage is not None:
+            try:
+                deleted = InventoryResource.storage.delete("inventories", inventory_id, expected_version)
+            except VersionConflict as exc:
+                raise version_conflict(exc.expected, exc.current)
+            if not deleted:
+                raise HTTPException(status_code=404, detail="Inventory not found")
+        else:
+            InventoryResource._flush_pending([inventory_id])
+            conn = InventoryResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    if expected_version is None:
+                        cur.execute(
+                            "DELETE FROM inventories WHERE inventory_id = %s",
+                            (uuid_codec.to_db(inventory_id),),
+                        )
+                    else:
+                        cur.execute(
+                            "DELETE FROM inventories WHERE inventory_id = %s AND version = %s",
+                            (uuid_codec.to_db(inventory_id), expected_version),
+                        )
+                    if cur.rowcount == 0:
+                        InventoryResource._missing_or_conflict(cur, inventory_id, expected_version)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+        if InventoryResource.cache is not None:
+            InventoryResource.cache.invalidate(inventory_id)
+        if InventoryResource.aggregates is not None:
+            InventoryResource.aggregates.remove_inventory(inventory_id)
         return {"detail": "Inventory deleted successfully"}
@@ -73,50 +73,100 @@
 
 #         del products[product_id]
 #         return {"detail": "Product deleted successfully"}
-from typing import List, Optional
-from uuid import UUID, uuid4
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from pymysql.err import IntegrityError
 
 from models.product import ProductCreate, ProductRead, ProductUpdate
+from resources.category_resource import CategoryResource
+from resources.inventory_resource import InventoryResource
+from storage.base import DuplicateKey, VersionConflict
+from utils.batch import chunked
+from utils.export import stream_query
+from utils.fields import project, select_list
+from utils.http_cache import field_of, version_conflict
+from utils.pagination import (
+    DEFAULT_LIMIT,
+    decode_cursor,
+    decode_id_cursor,
+    keyset_after,
+    keyset_page,
+    parse_sort,
+)
+from utils.uuid_codec import uuid_codec
+
+# ID columns that come back from MySQL in storage form (CHAR or BINARY)
+ID_FIELDS = ("product_id", "category_id", "inventory_id")
+# Columns a client may ask for with ?fields=
+PRODUCT_FIELDS = (
+    "product_id", "name", "description", "price", "rating",
+    "category_id", "inventory_id", "created_at", "updated_at", "version",
+)
+# Relations a client may embed with ?expand=, and the column each one follows
+PRODUCT_EXPANSIONS = {"category": "category_id", "inventory": "inventory_id"}
+# Columns allowed in ?sort= (each backed by a (.., col, product_id) index)
+PRODUCT_SORTS = ("price", "rating")
+NULLABLE_SORTS = ("rating",)
 
 
 class ProductResource:
     """Resource class for Product CRUD operations (Cloud SQL backed)"""
 
-    # get_connection is injected from main.py
+    # get_connection is injected from main.py (a pooled checkout; close() returns it)
     get_connection = None
+    # Read-only methods use get_read_connection (may be a replica), also injected from main.py
+    get_read_connection = None
+    # Optional read-through cache for get_product_by_id, also injected from main.py
+    cache = None
+    # Optional ProductSearchIndex backing search_products, also injected from main.py
+    search_index = None
+    # Optional CategoryAggregates kept current by every write, also injected from main.py
+    aggregates = None
+    # Optional Storage engine used instead of MySQL (e.g. MemoryStorage), also injected from main.py
+    storage = None
 
     @staticmethod
     def create_product(product: ProductCreate) -> ProductRead:
-        conn = ProductResource.get_connection()
-        product_id = str(uuid4())
+        product_id = uuid_codec.new_id()
         now = datetime.utcnow()
 
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO products
-                (product_id, name, description, price, rating, category_id, inventory_id, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    product_id,
-                    product.name,
-                    product.description,
-                    product.price,
-                    product.rating,
-                    str(product.category_id) if product.category_id else None,
-                    str(product.inventory_id) if product.inventory_id else None,
-                    now,
-                    now,
-                ),
+        if ProductResource.storage is not None:
+            ProductResource.storage.insert(
+                "products",
+                [{"product_id": product_id, **product.model_dump(), "created_at": now, "updated_at": now}],
             )
-
-        conn.commit()
-        conn.close()
-
-        return ProductRead(
+        else:
+            conn = ProductResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO products
+                        (product_id, name, description, price, rating, category_id, inventory_id, created_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """,
+                        (
+                            uuid_codec.to_db(product_id),
+                            product.name,
+                            product.description,
+                            product.price,
+                            product.rating,
+                            uuid_codec.to_db(product.category_id),
+                            uuid_codec.to_db(product.inventory_id),
+                            now,
+                            now,
+                        ),
+                    )
+
+                conn.commit()
+            finally:
+                conn.close()
+
+        created = ProductRead(
             product_id=product_id,
             name=product.name,
             description=product.description,
@@ -127,72 +177,365 @@ class ProductResource:
             created_at=now,
             updated_at=now,
         )
+        if ProductResource.search_index is not None:
+            ProductResource.search_index.upsert(created)
+        if ProductResource.aggregates is not None:
+            ProductResource.aggregates.upsert_products(created)
+        return created
+
+    @staticmethod
+    def create_products(products: List[ProductCreate]) -> List[ProductRead]:
+        """Insert many products with one executemany in a single transaction."""
+        now = datetime.utcnow()
+        created = [
+            ProductRead(
+                product_id=uuid_codec.new_id(),
+                created_at=now,
+                updated_at=now,
+                **product.model_dump(),
+            )
+            for product in products
+        ]
+
+        if ProductResource.storage is not None:
+            try:
+                ProductResource.storage.insert("products", [p.model_dump() for p in created])
+            except DuplicateKey as exc:
+                raise HTTPException(status_code=409, detail=f"Batch insert failed: {exc}")
+        else:
+            conn = ProductResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        """
+                        INSERT INTO products
+                        (product_id, name, description, price, rating, category_id, inventory_id, created_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (
+                                uuid_codec.to_db(p.product_id),
+                                p.name,
+                                p.description,
+                                p.price,
+                                p.rating,
+                                uuid_codec.to_db(p.category_id),
+                                uuid_codec.to_db(p.inventory_id),
+                                now,
+                                now,
+                            )
+                            for p in created
+                        ],
+                    )
+                conn.commit()
+            except IntegrityError as exc:
+                conn.rollback()
+                raise HTTPException(status_code=409, detail=f"Batch insert failed: {exc.args[-1]}")
+            finally:
+                conn.close()
+
+        if ProductResource.search_index is not None:
+            ProductResource.search_index.upsert(*created)
+        if ProductResource.aggregates is not None:
+            ProductResource.aggregates.upsert_products(*created)
+        return created
 
     @staticmethod
     def get_products(
         category_id: Optional[UUID] = Query(None),
         inventory_id: Optional[UUID] = Query(None),
-    ) -> List[ProductRead]:
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        sort: Optional[str] = None,
+    ) -> Tuple[List[ProductRead], Optional[str]]:
+        """Return one keyset page plus the next cursor.
+
+        Pages are ordered by product_id, or by ``sort`` (``price``,
+        ``-rating``, ...) with product_id as the tie-breaker; sorted cursors
+        carry the sort value as well. ``fields`` (whitelisted) narrows the
+        SELECT list; the keys, updated_at and version are always read.
+        """
+        sort_column, descending = parse_sort(sort, PRODUCT_SORTS)
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise HTTPException(status_code=422, detail="min_price must not exceed max_price")
+
+        if ProductResource.storage is not None:
+            ranges = {}
+            if min_price is not None or max_price is not None:
+                ranges["price"] = (min_price, max_price)
+            if min_rating is not None:
+                ranges["rating"] = (min_rating, None)
+            after = None
+            if cursor:
+                after = (
+                    (decode_id_cursor(cursor),) if sort_column is None
+                    else ProductResource._decode_sort_cursor(cursor, sort)
+                )
+            rows = ProductResource.storage.find(
+                "products",
+                where={k: v for k, v in (("category_id", category_id), ("inventory_id", inventory_id)) if v},
+                ranges=ranges,
+                order_by=sort_column,
+                descending=descending,
+                after=after,
+                limit=limit + 1,
+            )
+            return ProductResource._page(rows, limit, sort, sort_column)
 
-        conn = ProductResource.get_connection()
-        query = "SELECT * FROM products WHERE 1=1"
+        columns = select_list(fields, "product_id", "updated_at", "version", *([sort_column] if sort_column else []))
+        query = f"SELECT {columns} FROM products WHERE 1=1"
         params = []
 
         if category_id:
             query += " AND category_id=%s"
-            params.append(str(category_id))
+            params.append(uuid_codec.to_db(category_id))
 
         if inventory_id:
             query += " AND inventory_id=%s"
-            params.append(str(inventory_id))
-
-        with conn.cursor() as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
+            params.append(uuid_codec.to_db(inventory_id))
+
+        if min_price is not None:
+            query += " AND price>=%s"
+            params.append(min_price)
+
+        if max_price is not None:
+            query += " AND price<=%s"
+            params.append(max_price)
+
+        if min_rating is not None:
+            query += " AND rating>=%s"
+            params.append(min_rating)
+
+        if sort_column is None:
+            if cursor:
+                query += " AND product_id>%s"
+                params.append(uuid_codec.to_db(decode_id_cursor(cursor)))
+            query += " ORDER BY product_id LIMIT %s"
+        else:
+            if cursor:
+                value, after_id = ProductResource._decode_sort_cursor(cursor, sort)
+                condition, condition_params = keyset_after(
+                    sort_column, "product_id", value, uuid_codec.to_db(after_id),
+                    descending=descending, nullable=sort_column in NULLABLE_SORTS,
+                )
+                query += f" AND {condition}"
+                params.extend(condition_params)
+            direction = "DESC" if descending else "ASC"
+            query += f" ORDER BY {sort_column} {direction}, product_id {direction} LIMIT %s"
+        params.append(limit + 1)
+
+        conn = ProductResource.get_read_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+        finally:
+            conn.close()
+
+        rows = [uuid_codec.decode_row(row, *ID_FIELDS) for row in rows]
+        return ProductResource._page(rows, limit, sort, sort_column)
 
-        conn.close()
-        return rows
+    @staticmethod
+    def _page(
+        rows: List[dict], limit: int, sort: Optional[str], sort_column: Optional[str]
+    ) -> Tuple[List[dict], Optional[str]]:
+        if sort_column is None:
+            return keyset_page(rows, limit, key=lambda r: [r["product_id"]])
+        return keyset_page(rows, limit, key=lambda r: [sort, r[sort_column], r["product_id"]])
 
     @staticmethod
-    def get_product_by_id(product_id: UUID) -> ProductRead:
-        conn = ProductResource.get_connection()
+    def _decode_sort_cursor(cursor: str, sort: str) -> Tuple[Any, UUID]:
+        values = decode_cursor(cursor)
+        # The sort is part of the cursor so a page from one ordering can't
+        # be used to continue another.
+        if len(values) != 3 or values[0] != sort:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort")
+        try:
+            # Sort columns are DECIMAL; compare against the exact value.
+            value = None if values[1] is None else Decimal(str(values[1]))
+            return value, UUID(str(values[2]))
+        except (ValueError, InvalidOperation):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT * FROM products WHERE product_id=%s",
-                (str(product_id),),
+    @staticmethod
+    def export_products(
+        category_id: Optional[UUID] = None,
+        inventory_id: Optional[UUID] = None,
+    ) -> Iterator[dict]:
+        """Stream every matching row through a server-side cursor."""
+        if ProductResource.storage is not None:
+            return ProductResource.storage.scan(
+                "products",
+                where={k: v for k, v in (("category_id", category_id), ("inventory_id", inventory_id)) if v},
             )
-            product = cur.fetchone()
 
-        conn.close()
+        query = "SELECT * FROM products WHERE 1=1"
+        params = []
+
+        if category_id:
+            query += " AND category_id=%s"
+            params.append(uuid_codec.to_db(category_id))
+
+        if inventory_id:
+            query += " AND inventory_id=%s"
+            params.append(uuid_codec.to_db(inventory_id))
+
+        query += " ORDER BY product_id"
+        return stream_query(
+            ProductResource.get_read_connection,
+            query,
+            params,
+            transform=lambda row: uuid_codec.decode_row(row, *ID_FIELDS),
+        )
+
+    @staticmethod
+    def search_products(q: str, limit: int) -> List[dict]:
+        """Ranked full-text matches on name/description, served from memory."""
+        index = ProductResource.search_index
+        if index is None or not index.loaded:
+            raise HTTPException(status_code=503, detail="Search index is not available yet")
+        return index.search(q, limit)
+
+    @staticmethod
+    def get_product_by_id(product_id: UUID, fields: Optional[Sequence[str]] = None) -> ProductRead:
+        cache = ProductResource.cache
+        if cache is not None:
+            cached = cache.get(product_id)
+            if cached is not None:
+                return cached
+
+        if ProductResource.storage is not None:
+            # Whole rows; the route projects ``fields``.
+            product = ProductResource.storage.get("products", product_id)
+        else:
+            conn = ProductResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"SELECT {select_list(fields, 'product_id', 'updated_at', 'version')} FROM products WHERE product_id=%s",
+                        (uuid_codec.to_db(product_id),),
+                    )
+                    product = uuid_codec.decode_row(cur.fetchone(), *ID_FIELDS)
+            finally:
+                conn.close()
 
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
 
+        # Partial rows never go into the cache.
+        if cache is not None and fields is None:
+            cache.set(product_id, product)
         return product
     
     @staticmethod
-    def get_inventory_by_product_id(product_id: UUID):
-        conn = ProductResource.get_connection()
+    def get_product_validators(product_id: UUID) -> Tuple[int, datetime]:
+        """(version, updated_at) for conditional GETs: cache hit or a two-column SELECT."""
+        cache = ProductResource.cache
+        cached = cache.get(product_id) if cache is not None else None
+        if cached is not None:
+            if isinstance(cached, dict):
+                return cached["version"], cached["updated_at"]
+            return cached.version, cached.updated_at
+
+        if ProductResource.storage is not None:
+            row = ProductResource.storage.get("products", product_id)
+        else:
+            conn = ProductResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT version, updated_at FROM products WHERE product_id=%s",
+                        (uuid_codec.to_db(product_id),),
+                    )
+                    row = cur.fetchone()
+            finally:
+                conn.close()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return row["version"], row["updated_at"]
 
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT
-                    i.inventory_id,
-                    i.product_id,
-                    i.stock_quantity,
-                    i.warehouse_location,
-                    i.update_time,
-                    i.created_at
-                FROM products p
-                JOIN inventories i
-                  ON p.inventory_id = i.inventory_id
-                WHERE p.product_id = %s
-                """,
-                (str(product_id),),
+    @staticmethod
+    def get_products_by_ids(product_ids: List[UUID]) -> Tuple[List[ProductRead], List[UUID]]:
+        """Fetch many products with chunked IN queries.
+
+        Returns (found rows in request order, ids that do not exist).
+        """
+        cache = ProductResource.cache
+        found = {}
+        pending = []
+        for product_id in product_ids:
+            cached = cache.get(product_id) if cache is not None else None
+            if cached is not None:
+                found[product_id] = cached
+            else:
+                pending.append(product_id)
+
+        if pending and ProductResource.storage is not None:
+            found.update(ProductResource.storage.get_many("products", pending))
+        elif pending:
+            conn = ProductResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    for chunk in chunked(pending):
+                        cur.execute(
+                            f"SELECT * FROM products WHERE product_id IN ({', '.join(['%s'] * len(chunk))})",
+                            uuid_codec.to_db_many(chunk),
+                        )
+                        for row in cur.fetchall():
+                            uuid_codec.decode_row(row, *ID_FIELDS)
+                            product_id = row["product_id"]
+                            found[product_id] = row
+                            if cache is not None:
+                                cache.set(product_id, row)
+            finally:
+                conn.close()
+
+        return (
+            [found[i] for i in product_ids if i in found],
+            [i for i in product_ids if i not in found],
+        )
+
+    @staticmethod
+    def get_inventory_by_product_id(product_id: UUID):
+        storage = ProductResource.storage
+        if storage is not None:
+            product = storage.get("products", product_id)
+            inventory = (
+                storage.get("inventories", product["inventory_id"])
+                if product and product["inventory_id"] else None
             )
-            inventory = cur.fetchone()
+        else:
+            conn = ProductResource.get_read_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT
+                            i.inventory_id,
+                            i.product_id,
+                            i.stock_quantity,
+                            i.warehouse_location,
+                            i.update_time,
+                            i.created_at,
+                            i.version
+                        FROM products p
+                        JOIN inventories i
+                          ON p.inventory_id = i.inventory_id
+                        WHERE p.product_id = %s
+                        """,
+                        (uuid_codec.to_db(product_id),),
+                    )
+                    row = cur.fetchone()
+                    if row:
+                        InventoryResource._overlay(row)
+                    inventory = uuid_codec.decode_row(row, "inventory_id", "product_id")
+            finally:
+                conn.close()
 
         if not inventory:
             raise HTTPException(
@@ -203,58 +546,163 @@ class ProductResource:
         return inventory
 
     @staticmethod
-    def update_product(product_id: UUID, product_update: ProductUpdate) -> ProductRead:
+    def expand_products(
+        products: Sequence[Any],
+        relations: Sequence[str],
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[dict]:
+        """Project products to ``fields`` and embed the related rows named in ``relations``.
+
+        Each relation is one batched lookup for the whole page (snapshot,
+        cache, then chunked IN queries), never one query per product. A
+        dangling or unset foreign key embeds None. ``products`` must carry
+        the foreign-key columns even when ``fields`` leaves them out.
+        """
+        lookups = {
+            "category": CategoryResource.get_categories_by_ids,
+            "inventory": InventoryResource.get_inventories_by_ids,
+        }
+        related = {}
+        for relation in relations:
+            column = PRODUCT_EXPANSIONS[relation]
+            ids = list(dict.fromkeys(
+                field_of(p, column) for p in products if field_of(p, column) is not None
+            ))
+            found, _ = lookups[relation](ids) if ids else ([], [])
+            related[relation] = {getattr(row, column): row for row in found}
+
+        expanded = []
+        for product in products:
+            base = project(product, fields)
+            row = base.model_dump() if isinstance(base, BaseModel) else dict(base)
+            for relation in relations:
+                row[relation] = related[relation].get(field_of(product, PRODUCT_EXPANSIONS[relation]))
+            expanded.append(row)
+        return expanded
+
+    @staticmethod
+    def update_product(
+        product_id: UUID,
+        product_update: ProductUpdate,
+        expected_version: Optional[int] = None,
+    ) -> ProductRead:
+        """Apply a partial update and bump the row's version.
+
+        With ``expected_version`` (from If-Match) the version check rides on
+        the UPDATE's WHERE clause, so a lost race costs no extra round trip;
+        only the failure path reads the row again to tell 404 from 412.
+        """
         updates = product_update.model_dump(exclude_unset=True)
 
         if not updates:
             raise HTTPException(status_code=400, detail="No fields to update")
 
+        if ProductResource.storage is not None:
+            try:
+                product = ProductResource.storage.update(
+                    "products", product_id, {**updates, "updated_at": datetime.utcnow()}, expected_version
+                )
+            except VersionConflict as exc:
+                raise version_conflict(exc.expected, exc.current)
+            if product is None:
+                raise HTTPException(status_code=404, detail="Product not found")
+            return ProductResource._after_update(product_id, product)
+
         conn = ProductResource.get_connection()
         set_clause = ", ".join(f"{k}=%s" for k in updates.keys())
         values = [
-            str(v) if isinstance(v, UUID) else v
+            uuid_codec.to_db(v) if isinstance(v, UUID) else v
             for v in updates.values()
         ]
 
         values.append(datetime.utcnow())
-        values.append(str(product_id))
-
-        with conn.cursor() as cur:
-            cur.execute(
-                f"""
-                UPDATE products
-                SET {set_clause}, updated_at=%s
-                WHERE product_id=%s
-                """,
-                values,
-            )
+        values.append(uuid_codec.to_db(product_id))
+        version_clause = ""
+        if expected_version is not None:
+            version_clause = " AND version=%s"
+            values.append(expected_version)
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    UPDATE products
+                    SET {set_clause}, updated_at=%s, version=version+1
+                    WHERE product_id=%s{version_clause}
+                    """,
+                    values,
+                )
+
+                if cur.rowcount == 0:
+                    ProductResource._missing_or_conflict(cur, product_id, expected_version)
+
+                cur.execute(
+                    "SELECT * FROM products WHERE product_id=%s",
+                    (uuid_codec.to_db(product_id),),
+                )
+                product = uuid_codec.decode_row(cur.fetchone(), *ID_FIELDS)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return ProductResource._after_update(product_id, product)
 
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Product not found")
-
-            cur.execute(
-                "SELECT * FROM products WHERE product_id=%s",
-                (str(product_id),),
-            )
-            product = cur.fetchone()
+    @staticmethod
+    def _missing_or_conflict(cur, product_id: UUID, expected_version: Optional[int]) -> None:
+        """Raise 412 if a conditional write missed because the row moved on, else 404."""
+        if expected_version is not None:
+            cur.execute("SELECT version FROM products WHERE product_id=%s", (uuid_codec.to_db(product_id),))
+            row = cur.fetchone()
+            if row:
+                raise version_conflict(expected_version, row["version"])
+        raise HTTPException(status_code=404, detail="Product not found")
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _after_update(product_id: UUID, product: dict) -> dict:
+        if ProductResource.cache is not None:
+            ProductResource.cache.set(product_id, product)
+        if ProductResource.search_index is not None:
+            ProductResource.search_index.upsert(product)
+        if ProductResource.aggregates is not None:
+            ProductResource.aggregates.upsert_products(product)
         return product
 
     @staticmethod
-    def delete_product(product_id: UUID) -> dict:
-        conn = ProductResource.get_connection()
-
-        with conn.cursor() as cur:
-            cur.execute(
-                "DELETE FROM products WHERE product_id=%s",
-                (str(product_id),),
-            )
-
-            if cur.rowcount == 0:
+    def delete_product(product_id: UUID, expected_version: Optional[int] = None) -> dict:
+        if ProductResource.storage is not None:
+            try:
+                deleted = ProductResource.storage.delete("products", product_id, expected_version)
+            except VersionConflict as exc:
+                raise version_conflict(exc.expected, exc.current)
+            if not deleted:
                 raise HTTPException(status_code=404, detail="Product not found")
-
-        conn.commit()
-        conn.close()
+        else:
+            conn = ProductResource.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    if expected_version is None:
+                        cur.execute(
+                            "DELETE FROM products WHERE product_id=%s",
+                            (uuid_codec.to_db(product_id),),
+                        )
+                    else:
+                        cur.execute(
+                            "DELETE FROM products WHERE product_id=%s AND version=%s",
+                            (uuid_codec.to_db(product_id), expected_version),
+                        )
+
+                    if cur.rowcount == 0:
+                        ProductResource._missing_or_conflict(cur, product_id, expected_version)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+        if ProductResource.cache is not None:
+            ProductResource.cache.invalidate(product_id)
+        if ProductResource.search_index is not None:
+            ProductResource.search_index.remove(product_id)
+        if ProductResource.aggregates is not None:
+            ProductResource.aggregates.remove_product(product_id)
         return {"detail": "Product deleted successfully"}
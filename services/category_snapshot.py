@@ -0,0 +1,187 @@
+from __future__ import annotations
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from models.category import CategoryRead
+from utils.pagination import decode_cursor, keyset_page
+from utils.uuid_codec import uuid_codec
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    """Immutable view of the categories table. Never mutated once built."""
+
+    __slots__ = ("ordered", "keys", "by_id", "by_name", "loaded_at")
+
+    def __init__(self, categories: List[CategoryRead]):
+        self.ordered: Tuple[CategoryRead, ...] = tuple(
+            sorted(categories, key=lambda c: str(c.category_id))
+        )
+        self.keys: Tuple[str, ...] = tuple(str(c.category_id) for c in self.ordered)
+        self.by_id: Dict[UUID, CategoryRead] = {c.category_id: c for c in self.ordered}
+        by_name: Dict[str, List[CategoryRead]] = {}
+        for c in self.ordered:
+            # lower(), not casefold(): the database fallback compares LOWER(name).
+            by_name.setdefault(c.name.lower(), []).append(c)
+        self.by_name: Dict[str, Tuple[CategoryRead, ...]] = {
+            k: tuple(v) for k, v in by_name.items()
+        }
+        self.loaded_at = time.time()
+
+
+class CategorySnapshot:
+    """Whole categories table held in memory, refreshed in the background.
+
+    Readers grab ``self._snapshot`` once and work on that immutable object,
+    so swapping in a new snapshot is a single atomic reference assignment.
+    Local writes patch a copy and swap it in immediately; the periodic
+    refresh picks up writes made by other instances, replaying any local
+    patches made while it was reading.
+    """
+
+    def __init__(self, get_connection: Callable[[], Any], refresh_interval: float = 60.0):
+        self._get_connection = get_connection
+        self.refresh_interval = refresh_interval
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._write_lock = threading.Lock()
+        self._journal: Optional[List[Callable[[Dict[UUID, CategoryRead]], Any]]] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    # ------------------------------------------------------------------
+    # Loading / background refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        with self._write_lock:
+            if self._journal is not None:
+                return  # another refresh is already running
+            self._journal = []
+
+        try:
+            conn = self._get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT * FROM categories")
+                    rows = cur.fetchall()
+            finally:
+                conn.close()
+        except BaseException:
+            with self._write_lock:
+                self._journal = None
+            raise
+
+        by_id = {}
+        for row in rows:
+            category = CategoryRead.model_construct(
+                category_id=uuid_codec.from_db(row["category_id"]),
+                name=row["name"],
+                description=row["description"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+                version=row["version"],
+            )
+            by_id[category.category_id] = category
+
+        with self._write_lock:
+            # Our rows may predate local writes made while we were reading.
+            for change in self._journal:
+                change(by_id)
+            self._journal = None
+            self._snapshot = _Snapshot(list(by_id.values()))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Initial category snapshot load failed; reads fall back to the database")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="category-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Category snapshot refresh failed; keeping previous snapshot")
+
+    # ------------------------------------------------------------------
+    # Local write hooks
+    # ------------------------------------------------------------------
+
+    def upsert(self, *categories: CategoryRead) -> None:
+        self._patch(lambda by_id: by_id.update({c.category_id: c for c in categories}))
+
+    def remove(self, category_id: UUID) -> None:
+        self._patch(lambda by_id: by_id.pop(category_id, None))
+
+    def _patch(self, change: Callable[[Dict[UUID, CategoryRead]], Any]) -> None:
+        with self._write_lock:
+            if self._journal is not None:
+                self._journal.append(change)
+            current = self._snapshot
+            if current is None:
+                return
+            by_id = dict(current.by_id)
+            change(by_id)
+            self._snapshot = _Snapshot(list(by_id.values()))
+
+    # ------------------------------------------------------------------
+    # Reads (never touch the database)
+    # ------------------------------------------------------------------
+
+    def get(self, category_id: UUID) -> Optional[CategoryRead]:
+        snapshot = self._snapshot
+        return snapshot.by_id.get(category_id) if snapshot else None
+
+    def page(
+        self,
+        name: Optional[str],
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[CategoryRead], Optional[str]]:
+        snapshot = self._snapshot
+
+        if name:
+            candidates = snapshot.by_name.get(name.lower(), ())
+            if cursor:
+                after = str(decode_cursor(cursor)[0])
+                candidates = [c for c in candidates if str(c.category_id) > after]
+            rows = list(candidates[:limit + 1])
+        else:
+            start = 0
+            if cursor:
+                start = bisect.bisect_right(snapshot.keys, str(decode_cursor(cursor)[0]))
+            rows = list(snapshot.ordered[start:start + limit + 1])
+
+        return keyset_page(rows, limit, key=lambda c: [str(c.category_id)])
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "size": len(snapshot.ordered) if snapshot else 0,
+            "age_seconds": round(time.time() - snapshot.loaded_at, 3) if snapshot else None,
+            "refresh_interval": self.refresh_interval,
+        }
@@ -0,0 +1,275 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from utils.export import stream_query
+from utils.http_cache import field_of
+from utils.uuid_codec import uuid_codec
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    # Rows carry DECIMAL, models carry float; sum exactly either way.
+    if value is None or isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+class _Totals:
+    __slots__ = ("product_count", "price_sum", "rated_count", "rating_sum", "total_stock")
+
+    def __init__(self):
+        self.product_count = 0
+        self.price_sum = Decimal(0)
+        self.rated_count = 0
+        self.rating_sum = Decimal(0)
+        self.total_stock = 0
+
+
+class _Aggregates:
+    """Per-category running totals plus the few columns needed to move them.
+
+    Every mutation takes absolute values (not deltas), so re-applying one
+    that is already reflected is a no-op. Not thread-safe.
+    """
+
+    def __init__(self):
+        # product_id -> (category_id, price, rating)
+        self.products: Dict[UUID, Tuple[Optional[UUID], Decimal, Optional[Decimal]]] = {}
+        # product_id -> stock summed over its inventory rows
+        self.product_stock: Dict[UUID, int] = {}
+        # inventory_id -> (product_id, stock_quantity)
+        self.inventories: Dict[UUID, Tuple[UUID, int]] = {}
+        self.totals: Dict[Optional[UUID], _Totals] = {}
+
+    def _contribute(self, product_id: UUID, sign: int) -> None:
+        category_id, price, rating = self.products[product_id]
+        totals = self.totals.get(category_id)
+        if totals is None:
+            totals = self.totals[category_id] = _Totals()
+        totals.product_count += sign
+        totals.price_sum += sign * price
+        if rating is not None:
+            totals.rated_count += sign
+            totals.rating_sum += sign * rating
+        totals.total_stock += sign * self.product_stock.get(product_id, 0)
+        if totals.product_count == 0:
+            del self.totals[category_id]
+
+    def set_product(self, product_id: UUID, category_id: Optional[UUID], price: Any, rating: Any) -> None:
+        if product_id in self.products:
+            self._contribute(product_id, -1)
+        self.products[product_id] = (category_id, _decimal(price), _decimal(rating))
+        self._contribute(product_id, +1)
+
+    def remove_product(self, product_id: UUID) -> None:
+        if product_id in self.products:
+            self._contribute(product_id, -1)
+            del self.products[product_id]
+
+    def _move_stock(self, product_id: UUID, delta: int) -> None:
+        self.product_stock[product_id] = self.product_stock.get(product_id, 0) + delta
+        if product_id in self.products:
+            self.totals[self.products[product_id][0]].total_stock += delta
+
+    def set_inventory(self, inventory_id: UUID, product_id: UUID, quantity: int) -> None:
+        self.remove_inventory(inventory_id)
+        self.inventories[inventory_id] = (product_id, quantity)
+        self._move_stock(product_id, quantity)
+
+    def set_stock(self, inventory_id: UUID, quantity: int) -> None:
+        current = self.inventories.get(inventory_id)
+        # Unknown rows were created elsewhere; the next rebuild picks them up.
+        if current is not None:
+            self.set_inventory(inventory_id, current[0], quantity)
+
+    def remove_inventory(self, inventory_id: UUID) -> None:
+        current = self.inventories.pop(inventory_id, None)
+        if current is not None:
+            self._move_stock(current[0], -current[1])
+
+    def summary(self, category_id: Optional[UUID]) -> dict:
+        totals = self.totals.get(category_id) or _Totals()
+        return {
+            "category_id": category_id,
+            "product_count": totals.product_count,
+            "average_price": (
+                float(round(totals.price_sum / totals.product_count, 2)) if totals.product_count else None
+            ),
+            "rated_product_count": totals.rated_count,
+            "average_rating": (
+                float(round(totals.rating_sum / totals.rated_count, 2)) if totals.rated_count else None
+            ),
+            "total_stock": totals.total_stock,
+        }
+
+
+class CategoryAggregates:
+    """Product count, average price/rating and total stock per category.
+
+    Built from MySQL at startup, then moved incrementally by the product
+    and inventory write paths, so reading a category's stats is a dict
+    lookup. A periodic rebuild picks up writes from other instances; local
+    writes that land during a rebuild are journaled and replayed onto the
+    new totals before they are swapped in.
+    """
+
+    def __init__(
+        self,
+        get_connection: Optional[Callable[[], Any]],
+        refresh_interval: float = 300.0,
+        scan: Optional[Callable[[str], Iterable[dict]]] = None,
+    ):
+        self._get_connection = get_connection
+        # Reads a whole table from a storage engine instead of MySQL.
+        self._scan = scan
+        self.refresh_interval = refresh_interval
+
+        self._aggregates: Optional[_Aggregates] = None
+        self._lock = threading.Lock()
+        self._journal: Optional[List[Tuple[str, tuple]]] = None
+        self._loaded_at: Optional[float] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._aggregates is not None
+
+    # ------------------------------------------------------------------
+    # Loading / background refresh
+    # ------------------------------------------------------------------
+
+    def _rows(self, table: str, columns: str) -> Iterable[dict]:
+        if self._scan is not None:
+            return self._scan(table)
+        return stream_query(self._get_connection, f"SELECT {columns} FROM {table}")
+
+    def refresh(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                return  # another refresh is already running
+            self._journal = []
+
+        try:
+            aggregates = _Aggregates()
+            for row in self._rows("inventories", "inventory_id, product_id, stock_quantity"):
+                uuid_codec.decode_row(row, "inventory_id", "product_id")
+                aggregates.set_inventory(row["inventory_id"], row["product_id"], row["stock_quantity"])
+            for row in self._rows("products", "product_id, category_id, price, rating"):
+                uuid_codec.decode_row(row, "product_id", "category_id")
+                aggregates.set_product(row["product_id"], row["category_id"], row["price"], row["rating"])
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for method, args in self._journal:
+                getattr(aggregates, method)(*args)
+            self._journal = None
+            self._aggregates = aggregates
+            self._loaded_at = time.time()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Initial category stats build failed; stats are unavailable until the next refresh")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="category-stats", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Category stats refresh failed; keeping previous totals")
+
+    # ------------------------------------------------------------------
+    # Local write hooks
+    # ------------------------------------------------------------------
+
+    def _record(self, method: str, *args: Any) -> None:
+        with self._lock:
+            if self._aggregates is not None:
+                getattr(self._aggregates, method)(*args)
+            if self._journal is not None:
+                self._journal.append((method, args))
+
+    def upsert_products(self, *products: Any) -> None:
+        for p in products:
+            self._record(
+                "set_product",
+                field_of(p, "product_id"),
+                field_of(p, "category_id"),
+                field_of(p, "price"),
+                field_of(p, "rating"),
+            )
+
+    def remove_product(self, product_id: UUID) -> None:
+        self._record("remove_product", product_id)
+
+    def upsert_inventories(self, *inventories: Any) -> None:
+        for i in inventories:
+            self._record(
+                "set_inventory",
+                field_of(i, "inventory_id"),
+                field_of(i, "product_id"),
+                field_of(i, "stock_quantity"),
+            )
+
+    def set_stock(self, inventory_id: UUID, quantity: int) -> None:
+        self._record("set_stock", inventory_id, quantity)
+
+    def remove_inventory(self, inventory_id: UUID) -> None:
+        self._record("remove_inventory", inventory_id)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, category_id: UUID) -> Optional[dict]:
+        with self._lock:
+            if self._aggregates is None:
+                return None
+            return self._aggregates.summary(category_id)
+
+    def all(self) -> Optional[List[dict]]:
+        """Stats for every category that has at least one product."""
+        with self._lock:
+            if self._aggregates is None:
+                return None
+            return [
+                self._aggregates.summary(category_id)
+                for category_id in self._aggregates.totals
+                if category_id is not None
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            aggregates = self._aggregates
+            return {
+                "loaded": aggregates is not None,
+                "categories": len(aggregates.totals) if aggregates else 0,
+                "products": len(aggregates.products) if aggregates else 0,
+                "inventories": len(aggregates.inventories) if aggregates else 0,
+                "age_seconds": round(time.time() - self._loaded_at, 3) if self._loaded_at else None,
+                "refresh_interval": self.refresh_interval,
+            }
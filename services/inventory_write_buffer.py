@@ -0,0 +1,197 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from utils.batch import IN_CHUNK_SIZE, chunked
+from utils.uuid_codec import uuid_codec
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryWriteBuffer:
+    """Write-behind buffer for ``PUT /inventories/{id}``.
+
+    Updates to the same row are merged in memory (later values win per
+    column) and written by a background thread in one transaction: one
+    CASE-based UPDATE per chunk of rows. Versions are never written as
+    values: each row's version moves by the number of updates merged into
+    it, relative to whatever MySQL holds at flush time, so writes from
+    other instances or paths are never numbered over. A flush runs every
+    ``flush_interval`` seconds, or as soon as ``max_pending`` rows are
+    waiting, so the database is never more than about one interval behind
+    this instance. Reads through InventoryResource overlay pending values,
+    and writes that bypass the buffer (stock adjustments, deletes) flush
+    their rows first so they never race an older buffered value.
+    """
+
+    def __init__(
+        self,
+        get_connection: Callable[[], Any],
+        flush_interval: float = 0.1,
+        max_pending: int = 500,
+    ):
+        self._get_connection = get_connection
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending: Dict[UUID, Dict[str, Any]] = {}
+        # Updates merged into each pending row, i.e. how far its version moves.
+        self._bumps: Dict[UUID, int] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes, so a row's writes reach MySQL in order.
+        self._flush_lock = threading.Lock()
+
+        self._enqueued = 0
+        self._coalesced = 0
+        self._flushes = 0
+        self._rows_flushed = 0
+        self._failures = 0
+        self._last_flush_seconds: Optional[float] = None
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Writes / reads
+    # ------------------------------------------------------------------
+
+    def put(self, inventory_id: UUID, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self._enqueued += 1
+            pending = self._pending.get(inventory_id)
+            if pending is None:
+                self._pending[inventory_id] = dict(values)
+            else:
+                self._coalesced += 1
+                pending.update(values)
+            self._bumps[inventory_id] = self._bumps.get(inventory_id, 0) + 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def pending(self, inventory_id: UUID) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Values buffered for a row but not yet written, and the version bumps they carry."""
+        with self._lock:
+            values = self._pending.get(inventory_id)
+            return (dict(values), self._bumps[inventory_id]) if values is not None else None
+
+    def flush(self, inventory_ids: Optional[Iterable[UUID]] = None) -> int:
+        """Write buffered rows now (all of them, or just ``inventory_ids``).
+
+        Returns the number of rows written. On failure the rows go back into
+        the buffer, under any newer values that arrived meanwhile.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if inventory_ids is None:
+                    batch, self._pending = self._pending, {}
+                    bumps, self._bumps = self._bumps, {}
+                else:
+                    batch = {i: self._pending.pop(i) for i in inventory_ids if i in self._pending}
+                    bumps = {i: self._bumps.pop(i) for i in batch}
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                self._write(batch, bumps)
+            except BaseException:
+                with self._lock:
+                    self._failures += 1
+                    for inventory_id, values in batch.items():
+                        self._pending[inventory_id] = {**values, **self._pending.get(inventory_id, {})}
+                        self._bumps[inventory_id] = bumps[inventory_id] + self._bumps.get(inventory_id, 0)
+                raise
+
+            with self._lock:
+                self._flushes += 1
+                self._rows_flushed += len(batch)
+                self._last_flush_seconds = time.perf_counter() - start
+            return len(batch)
+
+    def _write(self, batch: Dict[UUID, Dict[str, Any]], bumps: Dict[UUID, int]) -> None:
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                for ids in chunked(list(batch), IN_CHUNK_SIZE):
+                    columns: List[str] = sorted({c for i in ids for c in batch[i]})
+                    assignments, params = [], []
+                    for column in columns:
+                        rows = [i for i in ids if column in batch[i]]
+                        assignments.append(
+                            f"{column} = CASE inventory_id "
+                            + " ".join("WHEN %s THEN %s" for _ in rows)
+                            + f" ELSE {column} END"
+                        )
+                        params += [v for i in rows for v in (uuid_codec.to_db(i), batch[i][column])]
+                    assignments.append(
+                        "version = version + CASE inventory_id "
+                        + " ".join("WHEN %s THEN %s" for _ in ids)
+                        + " ELSE 0 END"
+                    )
+                    params += [v for i in ids for v in (uuid_codec.to_db(i), bumps[i])]
+                    cur.execute(
+                        f"UPDATE inventories SET {', '.join(assignments)} "
+                        f"WHERE inventory_id IN ({', '.join(['%s'] * len(ids))})",
+                        params + uuid_codec.to_db_many(ids),
+                    )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Background flushing
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="inventory-write-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered.
+
+        Never raises: a failed final flush is logged, so the rest of the
+        shutdown (other services, the pools) still runs.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final inventory write-behind flush failed; %d rows not written", self.stats()["pending"])
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Inventory write-behind flush failed; retrying next interval")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "enqueued": self._enqueued,
+                "coalesced": self._coalesced,
+                "flushes": self._flushes,
+                "rows_flushed": self._rows_flushed,
+                "failures": self._failures,
+                "last_flush_seconds": self._last_flush_seconds,
+                "flush_interval": self.flush_interval,
+                "max_pending": self.max_pending,
+            }
@@ -0,0 +1,256 @@
+from __future__ import annotations
+import bisect
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from utils.export import stream_query
+from utils.uuid_codec import uuid_codec
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Name hits count for more than description hits (a cheap BM25F).
+NAME_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Prefix matches score a bit below the exact term.
+PREFIX_PENALTY = 0.7
+# Cap on vocabulary terms a single query prefix may expand to.
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Casefold, strip accents and split on non-word characters."""
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(plain)
+
+
+class _InvertedIndex:
+    """Postings, document lengths and a sorted vocabulary. Not thread-safe."""
+
+    def __init__(self):
+        self.docs: Dict[UUID, dict] = {}
+        self.lengths: Dict[UUID, int] = {}
+        self.terms: Dict[UUID, Tuple[str, ...]] = {}
+        self.postings: Dict[str, Dict[UUID, int]] = {}
+        self.vocabulary: List[str] = []
+        self.total_length = 0
+
+    def add(self, product_id: UUID, doc: dict) -> None:
+        self.remove(product_id)
+
+        freqs: Dict[str, int] = {}
+        for token in tokenize(doc.get("name")):
+            freqs[token] = freqs.get(token, 0) + NAME_WEIGHT
+        for token in tokenize(doc.get("description")):
+            freqs[token] = freqs.get(token, 0) + DESCRIPTION_WEIGHT
+
+        for term, tf in freqs.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            postings[product_id] = tf
+
+        length = sum(freqs.values())
+        self.docs[product_id] = doc
+        self.lengths[product_id] = length
+        self.terms[product_id] = tuple(freqs)
+        self.total_length += length
+
+    def remove(self, product_id: UUID) -> None:
+        if product_id not in self.docs:
+            return
+        for term in self.terms.pop(product_id):
+            postings = self.postings[term]
+            del postings[product_id]
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        self.total_length -= self.lengths.pop(product_id)
+        del self.docs[product_id]
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Vocabulary terms matching ``token``: the exact term plus its completions."""
+        matches = []
+        if token in self.postings:
+            matches.append((token, 1.0))
+        start = bisect.bisect_right(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, PREFIX_PENALTY))
+        return matches
+
+    def search(self, query: str, limit: int) -> List[Tuple[UUID, float]]:
+        count = len(self.docs)
+        if not count:
+            return []
+        avg_length = self.total_length / count or 1.0
+        lengths = self.lengths
+        length_scale = K1 * B / avg_length
+        length_base = K1 * (1 - B)
+
+        scores: Dict[UUID, float] = {}
+        for token in dict.fromkeys(tokenize(query)):
+            for term, weight in self._expand(token):
+                postings = self.postings[term]
+                df = len(postings)
+                boost = weight * math.log(1 + (count - df + 0.5) / (df + 0.5)) * (K1 + 1)
+                for product_id, tf in postings.items():
+                    score = boost * tf / (tf + length_base + length_scale * lengths[product_id])
+                    scores[product_id] = scores.get(product_id, 0.0) + score
+
+        # Only the top ``limit`` are needed; avoid sorting every match.
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+
+class ProductSearchIndex:
+    """Full-text index over product name and description, held in memory.
+
+    Built from MySQL at startup, patched by the product write paths, and
+    rebuilt periodically to pick up writes made by other instances. Local
+    writes that land during a rebuild are journaled and replayed onto the
+    new index before it is swapped in. Queries never touch the database.
+    """
+
+    def __init__(
+        self,
+        get_connection: Optional[Callable[[], Any]],
+        refresh_interval: float = 300.0,
+        scan: Optional[Callable[[str], Iterable[dict]]] = None,
+    ):
+        self._get_connection = get_connection
+        # Reads a whole table from a storage engine instead of MySQL.
+        self._scan = scan
+        self.refresh_interval = refresh_interval
+
+        self._index: Optional[_InvertedIndex] = None
+        self._lock = threading.Lock()
+        self._journal: Optional[List[Tuple[str, tuple]]] = None
+        self._loaded_at: Optional[float] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    # ------------------------------------------------------------------
+    # Loading / background refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                return  # another refresh is already running
+            self._journal = []
+
+        # Build off-lock from a server-side cursor; searches keep using the old index.
+        try:
+            index = _InvertedIndex()
+            if self._scan is not None:
+                rows = self._scan("products")
+            else:
+                rows = stream_query(self._get_connection, "SELECT * FROM products")
+            for row in rows:
+                uuid_codec.decode_row(row, "product_id", "category_id", "inventory_id")
+                index.add(row["product_id"], row)
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for method, args in self._journal:
+                getattr(index, method)(*args)
+            self._journal = None
+            self._index = index
+            self._loaded_at = time.time()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Initial product search index build failed; search is unavailable until the next refresh")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="product-search-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Product search index refresh failed; keeping previous index")
+
+    # ------------------------------------------------------------------
+    # Local write hooks
+    # ------------------------------------------------------------------
+
+    def upsert(self, *products: Any) -> None:
+        docs = [p.model_dump() if isinstance(p, BaseModel) else dict(p) for p in products]
+        for doc in docs:
+            self._record("add", doc["product_id"], doc)
+
+    def remove(self, product_id: UUID) -> None:
+        self._record("remove", product_id)
+
+    def _record(self, method: str, *args: Any) -> None:
+        with self._lock:
+            if self._index is not None:
+                getattr(self._index, method)(*args)
+            if self._journal is not None:
+                self._journal.append((method, args))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int) -> List[dict]:
+        """Best ``limit`` matches as product rows with a ``score`` field."""
+        with self._lock:
+            index = self._index
+            if index is None:
+                return []
+            return [
+                {**index.docs[product_id], "score": round(score, 4)}
+                for product_id, score in index.search(query, limit)
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            index = self._index
+            return {
+                "loaded": index is not None,
+                "documents": len(index.docs) if index else 0,
+                "terms": len(index.postings) if index else 0,
+                "age_seconds": round(time.time() - self._loaded_at, 3) if self._loaded_at else None,
+                "refresh_interval": self.refresh_interval,
+            }
@@ -0,0 +1,244 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+
+class StorageError(Exception):
+    """Base class for errors raised by a storage engine."""
+
+
+class DuplicateKey(StorageError):
+    """An insert reused an existing primary key."""
+
+
+class MissingRows(StorageError):
+    """Some of the keys an all-or-nothing write needed do not exist."""
+
+    def __init__(self, keys: Sequence[Any]):
+        super().__init__(f"Missing rows: {', '.join(str(k) for k in keys)}")
+        self.keys = list(keys)
+
+
+class CheckViolation(StorageError):
+    """A write would break a column constraint (e.g. negative stock)."""
+
+
+class VersionConflict(StorageError):
+    """A conditional write named a version the row no longer has."""
+
+    def __init__(self, expected: int, current: int):
+        super().__init__(f"Version mismatch: expected {expected}, current is {current}")
+        self.expected = expected
+        self.current = current
+
+
+class ReadOnlyStorage(StorageError):
+    """A write reached an engine opened read-only."""
+
+
+# ----------------------------------------------------------------------
+# Table definitions
+# ----------------------------------------------------------------------
+
+
+def _uuid(value: Any) -> Optional[UUID]:
+    if value is None or isinstance(value, UUID):
+        return value
+    return UUID(str(value))
+
+
+def _decimal(places: str) -> Callable[[Any], Optional[Decimal]]:
+    quantum = Decimal(places)
+
+    # Same values MySQL would store in a DECIMAL column of that scale.
+    def coerce(value: Any) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return Decimal(str(value)).quantize(quantum)
+
+    return coerce
+
+
+def _datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def _optional(kind: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else kind(value)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Columns (with coercions to their storage types) and secondary indexes of a table.
+
+    ``indexes`` maps an index name to the function computing its value from
+    a row, so derived keys (``name_folded``) index the same way columns do.
+    ``version`` names the column every write increments, if the table has one.
+    """
+
+    name: str
+    key: str
+    columns: Mapping[str, Callable[[Any], Any]]
+    indexes: Mapping[str, Callable[[dict], Any]] = field(default_factory=dict)
+    version: Optional[str] = None
+
+    def coerce(self, values: Mapping[str, Any]) -> dict:
+        unknown = [c for c in values if c not in self.columns]
+        if unknown:
+            raise StorageError(f"Unknown column(s) for {self.name}: {', '.join(unknown)}")
+        return {c: self.columns[c](v) for c, v in values.items()}
+
+
+def _column(name: str) -> Callable[[dict], Any]:
+    return lambda row: row.get(name)
+
+
+PRODUCTS = TableSpec(
+    name="products",
+    key="product_id",
+    columns={
+        "product_id": _uuid,
+        "name": str,
+        "description": _optional(str),
+        "price": _decimal("0.01"),
+        "rating": _decimal("0.01"),
+        "category_id": _uuid,
+        "inventory_id": _uuid,
+        "created_at": _datetime,
+        "updated_at": _datetime,
+        "version": int,
+    },
+    indexes={"category_id": _column("category_id"), "inventory_id": _column("inventory_id")},
+    version="version",
+)
+
+CATEGORIES = TableSpec(
+    name="categories",
+    key="category_id",
+    columns={
+        "category_id": _uuid,
+        "name": str,
+        "description": _optional(str),
+        "created_at": _datetime,
+        "updated_at": _datetime,
+        "version": int,
+    },
+    # Mirrors the name_folded generated column from migration 0002: LOWER(name),
+    # so lower() rather than casefold() ("Straße" must not match "strasse").
+    indexes={"name_folded": lambda row: row["name"].lower() if row.get("name") is not None else None},
+    version="version",
+)
+
+INVENTORIES = TableSpec(
+    name="inventories",
+    key="inventory_id",
+    columns={
+        "inventory_id": _uuid,
+        "product_id": _uuid,
+        "stock_quantity": int,
+        "warehouse_location": _optional(str),
+        "update_time": _datetime,
+        "created_at": _datetime,
+        "version": int,
+    },
+    indexes={"product_id": _column("product_id"), "warehouse_location": _column("warehouse_location")},
+    version="version",
+)
+
+TABLES: Dict[str, TableSpec] = {spec.name: spec for spec in (PRODUCTS, CATEGORIES, INVENTORIES)}
+
+
+# ----------------------------------------------------------------------
+# Engine interface
+# ----------------------------------------------------------------------
+
+# Inclusive (low, high) bounds; either side may be None.
+Range = Tuple[Optional[Any], Optional[Any]]
+
+
+class Storage(ABC):
+    """Row store the resources can run on instead of MySQL.
+
+    Rows go in and come out in API form: UUIDs, Decimals and naive UTC
+    datetimes, keyed by column name. Returned rows are copies. Ordering
+    and NULL handling follow MySQL, so keyset cursors work the same on
+    every backend: primary-key order by default, and NULLs sort first
+    ascending and last descending.
+    """
+
+    read_only: bool = False
+
+    @abstractmethod
+    def insert(self, table: str, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert all rows or none; raises DuplicateKey."""
+
+    @abstractmethod
+    def get(self, table: str, key: Any) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_many(self, table: str, keys: Iterable[Any]) -> Dict[Any, dict]:
+        """Rows for the keys that exist, by key."""
+
+    @abstractmethod
+    def find(
+        self,
+        table: str,
+        where: Optional[Mapping[str, Any]] = None,
+        ranges: Optional[Mapping[str, Range]] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Matching rows, ordered by ``order_by`` then the key (or the key alone).
+
+        ``where`` holds equality conditions on columns or index names.
+        ``after`` is the keyset position to resume from: ``(key,)``, or
+        ``(value, key)`` when ordering by a column.
+        """
+
+    @abstractmethod
+    def scan(self, table: str, where: Optional[Mapping[str, Any]] = None) -> Iterator[dict]:
+        """Every matching row in key order."""
+
+    @abstractmethod
+    def update(
+        self,
+        table: str,
+        key: Any,
+        values: Mapping[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[dict]:
+        """Apply ``values`` to one row and return it, or None if it does not exist.
+
+        Bumps the table's version column. With ``expected_version``, raises
+        VersionConflict instead of writing if the row has moved on.
+        """
+
+    @abstractmethod
+    def delete(self, table: str, key: Any, expected_version: Optional[int] = None) -> bool:
+        """Delete one row; False if it does not exist. VersionConflict as for update."""
+
+    @abstractmethod
+    def increment(
+        self,
+        table: str,
+        column: str,
+        deltas: Mapping[Any, int],
+        minimum: Optional[int] = None,
+        values: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[Any, int]:
+        """Add each delta to ``column`` of its row, all or nothing.
+
+        Rows whose delta is non-zero also get ``values`` applied and their
+        version bumped. Raises
+        MissingRows if any key is missing, or CheckViolation if a result
+        would drop below ``minimum``. Returns the new value for every key.
+        """
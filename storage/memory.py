@@ -0,0 +1,350 @@
+from __future__ import annotations
+import bisect
+import heapq
+import json
+import os
+import threading
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from storage.base import (
+    TABLES,
+    CheckViolation,
+    DuplicateKey,
+    MissingRows,
+    Range,
+    ReadOnlyStorage,
+    Storage,
+    StorageError,
+    TableSpec,
+    VersionConflict,
+)
+
+_ZERO = Decimal(0)
+
+
+class _Table:
+    """Rows by primary key, plus the keys kept sorted for keyset scans.
+
+    Each secondary index maps a value to the sorted keys of the rows that
+    hold it, so an equality filter is one dict lookup and its keyset page
+    a bisect into that posting list. NULLs are not indexed (``= NULL``
+    never matches in SQL either). Not thread-safe; MemoryStorage locks.
+    """
+
+    def __init__(self, spec: TableSpec):
+        self.spec = spec
+        self.rows: Dict[Any, dict] = {}
+        self.keys: List[Any] = []
+        self.indexes: Dict[str, Dict[Any, List[Any]]] = {name: {} for name in spec.indexes}
+
+    def _index(self, key: Any, row: dict) -> None:
+        for name, compute in self.spec.indexes.items():
+            value = compute(row)
+            if value is not None:
+                bisect.insort(self.indexes[name].setdefault(value, []), key)
+
+    def _unindex(self, key: Any, row: dict) -> None:
+        for name, compute in self.spec.indexes.items():
+            value = compute(row)
+            if value is None:
+                continue
+            posting = self.indexes[name][value]
+            del posting[bisect.bisect_left(posting, key)]
+            if not posting:
+                del self.indexes[name][value]
+
+    def add(self, row: dict) -> None:
+        key = row[self.spec.key]
+        self.rows[key] = row
+        bisect.insort(self.keys, key)
+        self._index(key, row)
+
+    def replace(self, key: Any, row: dict) -> None:
+        self._unindex(key, self.rows[key])
+        self.rows[key] = row
+        self._index(key, row)
+
+    def remove(self, key: Any) -> None:
+        self._unindex(key, self.rows.pop(key))
+        del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def candidates(self, where: Mapping[str, Any]) -> Tuple[List[Any], Dict[str, Any]]:
+        """Sorted candidate keys from the most selective index, plus the conditions left to check."""
+        sizes = {
+            name: len(self.indexes[name].get(value, ()))
+            for name, value in where.items()
+            if name in self.indexes
+        }
+        if not sizes:
+            return self.keys, dict(where)
+        best = min(sizes, key=sizes.get)
+        remaining = {k: v for k, v in where.items() if k != best}
+        return self.indexes[best].get(where[best], []), remaining
+
+    def bound(self, column: str, value: Any) -> Any:
+        """A range bound in the column's type, so float bounds compare with Decimal columns.
+
+        Decimal bounds are taken exactly rather than quantized to the column's
+        scale: MySQL compares ``price <= 19.995`` against the literal, not a
+        rounded 20.00.
+        """
+        if value is None:
+            return None
+        coerced = self.spec.columns[column](value)
+        return Decimal(str(value)) if isinstance(coerced, Decimal) else coerced
+
+    def matches(self, row: dict, where: Mapping[str, Any], ranges: Mapping[str, Range]) -> bool:
+        for name, value in where.items():
+            compute = self.spec.indexes.get(name)
+            actual = compute(row) if compute is not None else row.get(name)
+            if actual is None or actual != value:
+                return False
+        for column, (low, high) in ranges.items():
+            actual = row.get(column)
+            # SQL comparisons with NULL are never true.
+            if actual is None:
+                return False
+            if low is not None and actual < low:
+                return False
+            if high is not None and actual > high:
+                return False
+        return True
+
+
+class MemoryStorage(Storage):
+    """In-process storage engine with hash indexes, for edge, benchmark and test runs.
+
+    Every operation takes one lock and touches only dicts and sorted lists,
+    so reads stay well under a millisecond. Nothing is persisted. The engine
+    can start from the NDJSON files the ``/export`` endpoints produce, and
+    when opened ``read_only`` it refuses writes.
+    """
+
+    def __init__(self, tables: Sequence[TableSpec] = tuple(TABLES.values()), read_only: bool = False):
+        self.read_only = read_only
+        self._tables: Dict[str, _Table] = {spec.name: _Table(spec) for spec in tables}
+        self._lock = threading.RLock()
+
+    def _table(self, name: str) -> _Table:
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise StorageError(f"Unknown table: {name}")
+
+    def _writable(self) -> None:
+        if self.read_only:
+            raise ReadOnlyStorage("Storage is read-only")
+
+    @staticmethod
+    def _check_version(t: _Table, row: dict, expected_version: Optional[int]) -> None:
+        if expected_version is not None and row[t.spec.version] != expected_version:
+            raise VersionConflict(expected_version, row[t.spec.version])
+
+    @staticmethod
+    def _bumped(t: _Table, row: dict) -> dict:
+        if t.spec.version is not None:
+            row[t.spec.version] = row.get(t.spec.version, 0) + 1
+        return row
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, table: str, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Bulk-load rows (read-only engines included); later duplicates win."""
+        t = self._table(table)
+        coerced = [self._new_row(t, row) for row in rows]
+        with self._lock:
+            for row in coerced:
+                key = row[t.spec.key]
+                if key in t.rows:
+                    t.replace(key, row)
+                else:
+                    t.add(row)
+        return len(coerced)
+
+    def load_ndjson(self, table: str, path: str) -> int:
+        def rows() -> Iterator[dict]:
+            with open(path) as fh:
+                for line in fh:
+                    if line.strip():
+                        yield json.loads(line)
+
+        return self.load(table, rows())
+
+    def load_dir(self, directory: str) -> Dict[str, int]:
+        """Load ``<table>.ndjson`` for every table that has a file in ``directory``."""
+        counts = {}
+        for name in self._tables:
+            path = os.path.join(directory, f"{name}.ndjson")
+            if os.path.exists(path):
+                counts[name] = self.load_ndjson(name, path)
+        return counts
+
+    # ------------------------------------------------------------------
+    # Storage interface
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _new_row(t: _Table, values: Mapping[str, Any]) -> dict:
+        row = t.spec.coerce(values)
+        # Like the column's DEFAULT 1 in MySQL.
+        if t.spec.version is not None and row.get(t.spec.version) is None:
+            row[t.spec.version] = 1
+        return row
+
+    def insert(self, table: str, rows: Sequence[Mapping[str, Any]]) -> None:
+        self._writable()
+        t = self._table(table)
+        coerced = [self._new_row(t, row) for row in rows]
+        with self._lock:
+            seen = set()
+            for row in coerced:
+                key = row[t.spec.key]
+                if key in t.rows or key in seen:
+                    raise DuplicateKey(f"Duplicate entry '{key}' for key '{table}.PRIMARY'")
+                seen.add(key)
+            for row in coerced:
+                t.add(row)
+
+    def get(self, table: str, key: Any) -> Optional[dict]:
+        t = self._table(table)
+        with self._lock:
+            row = t.rows.get(key)
+            return dict(row) if row is not None else None
+
+    def get_many(self, table: str, keys: Iterable[Any]) -> Dict[Any, dict]:
+        t = self._table(table)
+        with self._lock:
+            return {key: dict(t.rows[key]) for key in keys if key in t.rows}
+
+    def find(
+        self,
+        table: str,
+        where: Optional[Mapping[str, Any]] = None,
+        ranges: Optional[Mapping[str, Range]] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        t = self._table(table)
+        ranges = {
+            column: (t.bound(column, low), t.bound(column, high))
+            for column, (low, high) in (ranges or {}).items()
+        }
+        key_column = t.spec.key
+
+        with self._lock:
+            keys, remaining = t.candidates(where or {})
+
+            if order_by is None:
+                start = bisect.bisect_right(keys, after[0]) if after else 0
+                out: List[dict] = []
+                for key in keys[start:] if start else keys:
+                    row = t.rows[key]
+                    if t.matches(row, remaining, ranges):
+                        out.append(dict(row))
+                        if limit is not None and len(out) >= limit:
+                            break
+                return out
+
+            # Column order: (NULLs first, value, key), reversed for DESC.
+            def sort_key(row: dict) -> tuple:
+                value = row.get(order_by)
+                return (value is not None, value if value is not None else _ZERO, row[key_column])
+
+            position = None
+            if after:
+                value, key = after
+                position = (value is not None, value if value is not None else _ZERO, key)
+
+            matching = (t.rows[key] for key in keys)
+            matching = (row for row in matching if t.matches(row, remaining, ranges))
+            if position is not None:
+                if descending:
+                    matching = (row for row in matching if sort_key(row) < position)
+                else:
+                    matching = (row for row in matching if sort_key(row) > position)
+
+            if limit is None:
+                ordered = sorted(matching, key=sort_key, reverse=descending)
+            elif descending:
+                ordered = heapq.nlargest(limit, matching, key=sort_key)
+            else:
+                ordered = heapq.nsmallest(limit, matching, key=sort_key)
+            return [dict(row) for row in ordered]
+
+    def scan(self, table: str, where: Optional[Mapping[str, Any]] = None) -> Iterator[dict]:
+        # Copy under the lock, yield outside it: a slow consumer (an export
+        # stream) must not block writers.
+        return iter(self.find(table, where=where))
+
+    def update(
+        self,
+        table: str,
+        key: Any,
+        values: Mapping[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[dict]:
+        self._writable()
+        t = self._table(table)
+        changes = t.spec.coerce(values)
+        if t.spec.key in changes and changes[t.spec.key] != key:
+            raise StorageError("Primary keys cannot be updated")
+        with self._lock:
+            current = t.rows.get(key)
+            if current is None:
+                return None
+            self._check_version(t, current, expected_version)
+            row = self._bumped(t, {**current, **changes})
+            t.replace(key, row)
+            return dict(row)
+
+    def delete(self, table: str, key: Any, expected_version: Optional[int] = None) -> bool:
+        self._writable()
+        t = self._table(table)
+        with self._lock:
+            current = t.rows.get(key)
+            if current is None:
+                return False
+            self._check_version(t, current, expected_version)
+            t.remove(key)
+            return True
+
+    def increment(
+        self,
+        table: str,
+        column: str,
+        deltas: Mapping[Any, int],
+        minimum: Optional[int] = None,
+        values: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[Any, int]:
+        self._writable()
+        t = self._table(table)
+        changes = t.spec.coerce(values or {})
+        with self._lock:
+            missing = [key for key in deltas if key not in t.rows]
+            if missing:
+                raise MissingRows(missing)
+            results = {key: t.rows[key][column] + delta for key, delta in deltas.items()}
+            if minimum is not None and any(value < minimum for value in results.values()):
+                raise CheckViolation(f"{table}.{column} would drop below {minimum}")
+            for key, delta in deltas.items():
+                if delta:
+                    t.replace(key, self._bumped(t, {**t.rows[key], column: results[key], **changes}))
+            return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "read_only": self.read_only,
+                "tables": {
+                    name: {
+                        "rows": len(t.rows),
+                        "indexes": {index: len(values) for index, values in t.indexes.items()},
+                    }
+                    for name, t in self._tables.items()
+                },
+            }
@@ -0,0 +1,59 @@
+import json
+import zlib
+
+import anyio
+
+from middleware.compression import CompressionMiddleware
+
+
+def _rows(start, count):
+    return b"".join(
+        json.dumps({"product_id": str(i), "name": f"Product {i}", "price": i * 1.25}).encode() + b"\n"
+        for i in range(start, start + count)
+    )
+
+
+async def _streaming_app(scope, receive, send):
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/x-ndjson")],
+    })
+    for start in range(0, 300, 100):
+        await send({"type": "http.response.body", "body": _rows(start, 100), "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _call(app, headers):
+    sent = []
+    scope = {"type": "http", "method": "GET", "path": "/products/export", "query_string": b"", "headers": headers}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    anyio.run(app, scope, receive, send)
+    return sent
+
+
+def test_streamed_chunks_are_flushed_before_the_stream_ends():
+    sent = _call(CompressionMiddleware(_streaming_app), [(b"accept-encoding", b"gzip")])
+    bodies = [m["body"] for m in sent if m["type"] == "http.response.body"]
+
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # The first chunk decodes completely on its own, without the gzip trailer.
+    assert decoder.decompress(bodies[0]) == _rows(0, 100)
+    assert decoder.decompress(b"".join(bodies[1:])) == _rows(100, 200)
+    assert decoder.eof
+
+
+def test_not_modified_varies_on_accept_encoding():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 304, "headers": [(b"etag", b'"3"')]})
+        await send({"type": "http.response.body", "body": b""})
+
+    for accept in (b"gzip", b"identity"):
+        start = _call(CompressionMiddleware(app), [(b"accept-encoding", accept)])[0]
+        assert (b"vary", b"Accept-Encoding") in start["headers"]
@@ -0,0 +1,43 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from storage.memory import MemoryStorage
+
+
+def _storage_with_prices(*prices):
+    storage = MemoryStorage()
+    storage.load(
+        "products",
+        [
+            {"product_id": uuid4(), "name": f"p{i}", "price": price, "rating": price, "category_id": uuid4()}
+            for i, price in enumerate(prices)
+        ],
+    )
+    return storage
+
+
+def _prices(rows):
+    return sorted(row["price"] for row in rows)
+
+
+def test_float_bounds_are_inclusive_like_mysql():
+    storage = _storage_with_prices("19.99", "20.00", "4.50")
+
+    assert _prices(storage.find("products", ranges={"price": (None, 19.99)})) == [Decimal("4.50"), Decimal("19.99")]
+    assert _prices(storage.find("products", ranges={"price": (19.99, None)})) == [Decimal("19.99"), Decimal("20.00")]
+    assert _prices(storage.find("products", ranges={"rating": (4.5, None)})) == _prices(storage.find("products"))
+
+
+def test_bounds_are_not_rounded_to_the_column_scale():
+    storage = _storage_with_prices("19.99", "20.00")
+
+    assert _prices(storage.find("products", ranges={"price": (None, 19.995)})) == [Decimal("19.99")]
+    assert _prices(storage.find("products", ranges={"price": (19.995, None)})) == [Decimal("20.00")]
+
+
+def test_category_names_fold_like_mysql_lower():
+    storage = MemoryStorage()
+    storage.load("categories", [{"category_id": uuid4(), "name": "Straße"}])
+
+    assert len(storage.find("categories", where={"name_folded": "STRAßE".lower()})) == 1
+    assert storage.find("categories", where={"name_folded": "strasse"}) == []
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import Any, Iterator, List, Sequence, Tuple, Type, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from models.batch import BatchItemError
+
+MAX_BATCH_SIZE = 1000
+# Keep IN (...) lists well below max_allowed_packet and optimizer limits.
+IN_CHUNK_SIZE = 500
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def validate_batch(model: Type[M], items: Sequence[Any]) -> Tuple[List[M], List[BatchItemError]]:
+    """Validate each raw item independently so one bad item can't sink the batch."""
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} items)",
+        )
+
+    valid: List[M] = []
+    errors: List[BatchItemError] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append(model.model_validate(item))
+        except ValidationError as exc:
+            errors.append(
+                BatchItemError(index=index, errors=exc.errors(include_url=False, include_context=False))
+            )
+    return valid, errors
+
+
+def parse_ids(raw: Sequence[str]) -> List[UUID]:
+    """Accept ``?ids=a&ids=b`` and ``?ids=a,b``; de-duplicate, keep order."""
+    ids: List[UUID] = []
+    seen = set()
+    for chunk in raw:
+        for part in chunk.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                value = UUID(part)
+            except ValueError:
+                raise HTTPException(status_code=422, detail=f"Invalid id: {part}")
+            if value not in seen:
+                seen.add(value)
+                ids.append(value)
+
+    if not ids:
+        raise HTTPException(status_code=422, detail="At least one id is required")
+    if len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many ids (max {MAX_BATCH_SIZE})",
+        )
+    return ids
+
+
+def chunked(items: Sequence[Any], size: int = IN_CHUNK_SIZE) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -0,0 +1,230 @@
+from __future__ import annotations
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints beyond this many distinct statements share one bucket, so
+# ad-hoc SQL cannot grow the table (or the /metrics label set) without bound.
+MAX_FINGERPRINTS = 500
+OTHER_FINGERPRINT = "<other>"
+
+_COMMENT = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_CASE_ARMS = re.compile(r"(?:WHEN \? THEN \? )+", re.I)
+_SPACE = re.compile(r"\s+")
+
+
+def _normalize(sql: str) -> str:
+    sql = _COMMENT.sub(" ", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    # Batch paths build IN (...) lists and CASE arms sized to the batch;
+    # every size is the same statement for profiling purposes.
+    sql = _LIST.sub("?+", sql)
+    return _CASE_ARMS.sub("WHEN ? THEN ? ... ", sql)
+
+
+_fingerprints: Dict[str, str] = {}
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with literals, placeholders and list sizes folded away.
+
+    Resource code reuses a handful of statement strings, so results are
+    memoized by the raw text (and the memo is dropped if it ever fills up).
+    """
+    result = _fingerprints.get(sql)
+    if result is None:
+        if len(_fingerprints) >= MAX_FINGERPRINTS * 4:
+            _fingerprints.clear()
+        result = _fingerprints[sql] = _normalize(sql)
+    return result
+
+
+class _RequestTally:
+    """Statements run on behalf of the current request (see ``middleware/query_stats.py``)."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_tally: ContextVar[Optional[_RequestTally]] = ContextVar("db_request_tally", default=None)
+
+
+def begin_request() -> Token:
+    return _tally.set(_RequestTally())
+
+
+def end_request(token: Token) -> None:
+    _tally.reset(token)
+
+
+def current_request() -> Optional[_RequestTally]:
+    return _tally.get()
+
+
+class _Timing:
+    __slots__ = ("count", "seconds", "max_seconds", "errors", "slow")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = 0
+        self.slow = 0
+
+
+class QueryStats:
+    """Per-fingerprint timing for every statement run through an instrumented cursor.
+
+    Statements slower than ``slow_threshold`` seconds are logged with their
+    fingerprint (never their parameters). ``None`` disables the slow log.
+    """
+
+    def __init__(self, slow_threshold: Optional[float] = 0.2, max_fingerprints: int = MAX_FINGERPRINTS):
+        self.slow_threshold = slow_threshold
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._timings: Dict[str, _Timing] = {}
+
+    def wrap(self, raw: Any) -> "InstrumentedConnection":
+        return InstrumentedConnection(raw, self)
+
+    def record(self, sql: str, seconds: float, failed: bool = False) -> None:
+        key = fingerprint(sql)
+        slow = self.slow_threshold is not None and seconds >= self.slow_threshold
+
+        tally = _tally.get()
+        if tally is not None:
+            tally.queries += 1
+            tally.seconds += seconds
+
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                if len(self._timings) >= self.max_fingerprints:
+                    key = OTHER_FINGERPRINT
+                timing = self._timings.setdefault(key, _Timing())
+            timing.count += 1
+            timing.seconds += seconds
+            if seconds > timing.max_seconds:
+                timing.max_seconds = seconds
+            if failed:
+                timing.errors += 1
+            if slow:
+                timing.slow += 1
+
+        if slow:
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000, key)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                key: {
+                    "count": t.count,
+                    "seconds": t.seconds,
+                    "max_seconds": t.max_seconds,
+                    "errors": t.errors,
+                    "slow": t.slow,
+                }
+                for key, t in self._timings.items()
+            }
+
+    def top(self, limit: int = 20) -> List[dict]:
+        """Fingerprints ordered by total time spent, heaviest first."""
+        rows = [
+            {
+                "fingerprint": key,
+                "count": t["count"],
+                "total_ms": round(t["seconds"] * 1000, 3),
+                "mean_ms": round(t["seconds"] * 1000 / t["count"], 3) if t["count"] else 0.0,
+                "max_ms": round(t["max_seconds"] * 1000, 3),
+                "errors": t["errors"],
+                "slow": t["slow"],
+            }
+            for key, t in self.snapshot().items()
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times ``execute``/``executemany``; everything else passes through."""
+
+    def __init__(self, raw: Any, stats: QueryStats):
+        self._raw = raw
+        self._stats = stats
+
+    def _timed(self, method: Any, sql: str, args: Any) -> Any:
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = method(sql, args)
+            failed = False
+            return result
+        finally:
+            self._stats.record(sql, time.perf_counter() - start, failed)
+
+    def execute(self, query: str, args: Any = None) -> Any:
+        return self._timed(self._raw.execute, query, args)
+
+    def executemany(self, query: str, args: Any) -> Any:
+        # One statement (and, for INSERTs, one round trip) however many rows.
+        return self._timed(self._raw.executemany, query, args)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __enter__(self) -> "InstrumentedCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._raw.close()
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are instrumented.
+
+    Sits under the pool's ``PooledConnection``, so pooling, pings and
+    rollbacks behave exactly as with the raw pymysql connection.
+    """
+
+    def __init__(self, raw: Any, stats: QueryStats):
+        self._raw = raw
+        self._stats = stats
+
+    def cursor(self, *args: Any, **kwargs: Any) -> InstrumentedCursor:
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs), self._stats)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __enter__(self) -> "InstrumentedConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._raw.close()
@@ -0,0 +1,243 @@
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out before the timeout."""
+
+
+class PooledConnection:
+    """Thin proxy around a raw pymysql connection.
+
+    Resource code keeps calling ``conn.cursor()``, ``conn.commit()`` and
+    ``conn.close()`` exactly as before; ``close()`` hands the connection
+    back to the pool instead of tearing down the socket.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw: Any, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._released = False
+
+    @property
+    def raw(self) -> Any:
+        return self._raw
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._raw, self._created_at)
+
+    def invalidate(self) -> None:
+        """Discard the underlying connection instead of returning it.
+
+        Use when the socket is in an unknown state, e.g. an unbuffered
+        cursor was abandoned with rows still unread.
+        """
+        if self._released:
+            return
+        self._released = True
+        self._pool._discard(self._raw)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self):
+        # Safety net for code paths that forget to close(): return the
+        # connection rather than leaking a slot until the socket dies.
+        if not getattr(self, "_released", True):
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    * ``pool_size`` connections are kept open and reused.
+    * Up to ``max_overflow`` extra connections may be opened under burst
+      load; they are closed when returned.
+    * ``connect()`` blocks for at most ``timeout`` seconds waiting for a
+      free slot, then raises :class:`PoolTimeout`.
+    * Connections older than ``recycle`` seconds are replaced on checkout,
+      and idle connections are pinged first when ``pre_ping`` is enabled.
+    """
+
+    def __init__(
+        self,
+        creator: Callable[[], Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        recycle: Optional[float] = 1800.0,
+        pre_ping: bool = True,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+        if max_overflow < 0:
+            raise ValueError("max_overflow must be >= 0")
+
+        self._creator = creator
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._opened = 0
+        self._checked_out = 0
+
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._timeouts = 0
+
+    # ------------------------------------------------------------------
+    # Checkout / release
+    # ------------------------------------------------------------------
+
+    def connect(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        entry: Optional[Tuple[Any, float]] = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._opened < self.pool_size + self.max_overflow:
+                    self._opened += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"Connection pool exhausted (size={self.pool_size}, "
+                        f"overflow={self.max_overflow}, timeout={self.timeout}s)"
+                    )
+                self._cond.wait(remaining)
+            self._checked_out += 1
+            self._checkouts += 1
+
+        try:
+            if entry is None:
+                raw, created_at = self._open()
+            else:
+                raw, created_at = self._revalidate(*entry)
+        except Exception:
+            with self._cond:
+                self._opened -= 1
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw, created_at)
+
+    def _open(self) -> Tuple[Any, float]:
+        raw = self._creator()
+        with self._cond:
+            self._created += 1
+        return raw, time.monotonic()
+
+    def _revalidate(self, raw: Any, created_at: float) -> Tuple[Any, float]:
+        if self.recycle is not None and time.monotonic() - created_at > self.recycle:
+            with self._cond:
+                self._recycled += 1
+            self._close_quietly(raw)
+            return self._open()
+
+        if self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._ping_failures += 1
+                self._close_quietly(raw)
+                return self._open()
+
+        return raw, created_at
+
+    def _release(self, raw: Any, created_at: float) -> None:
+        # Never hand out a connection with a half-finished transaction.
+        healthy = True
+        try:
+            raw.rollback()
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            self._checked_out -= 1
+            if healthy and self._opened <= self.pool_size:
+                self._idle.append((raw, created_at))
+                raw = None
+            else:
+                self._opened -= 1
+            self._cond.notify()
+
+        if raw is not None:
+            self._close_quietly(raw)
+
+    def _discard(self, raw: Any) -> None:
+        with self._cond:
+            self._checked_out -= 1
+            self._opened -= 1
+            self._cond.notify()
+        self._close_quietly(raw)
+
+    @staticmethod
+    def _close_quietly(raw: Any) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Maintenance / introspection
+    # ------------------------------------------------------------------
+
+    @property
+    def checked_out(self) -> int:
+        """Connections currently in use (a cheap load signal for routing)."""
+        return self._checked_out
+
+    def dispose(self) -> None:
+        """Close every idle connection. Checked-out ones close on release."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._opened -= len(idle)
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "opened": self._opened,
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "overflow": max(0, self._opened - self.pool_size),
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "ping_failures": self._ping_failures,
+                "timeouts": self._timeouts,
+            }
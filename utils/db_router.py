@@ -0,0 +1,133 @@
+from __future__ import annotations
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Sequence
+
+from utils.db_pool import ConnectionPool, PooledConnection
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+
+
+class _Session:
+    """Per-request routing state (see ``middleware/read_your_writes.py``)."""
+
+    __slots__ = ("primary_until", "wrote")
+
+    def __init__(self, primary_until: float = 0.0):
+        self.primary_until = primary_until
+        self.wrote = False
+
+
+_session: ContextVar[Optional[_Session]] = ContextVar("db_routing_session", default=None)
+
+
+def begin_session(primary_until: float = 0.0) -> Token:
+    return _session.set(_Session(primary_until))
+
+
+def end_session(token: Token) -> None:
+    _session.reset(token)
+
+
+def current_session() -> Optional[_Session]:
+    return _session.get()
+
+
+class ConnectionRouter:
+    """Sends writes to the primary pool and reads to replica pools.
+
+    Reads stay on the primary when there are no replicas, when the current
+    request has already written, or while the client is inside its
+    read-your-writes window (carried between requests by the middleware).
+    A replica that fails to hand out a connection is skipped; if all of
+    them fail the read falls back to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: ConnectionPool,
+        replicas: Optional[Dict[str, ConnectionPool]] = None,
+        strategy: str = ROUND_ROBIN,
+        read_your_writes: float = 5.0,
+    ):
+        if strategy not in (ROUND_ROBIN, LEAST_LOADED):
+            raise ValueError(f"Unknown read strategy: {strategy}")
+        self.primary = primary
+        self.replicas: Dict[str, ConnectionPool] = dict(replicas or {})
+        self.strategy = strategy
+        self.read_your_writes = read_your_writes
+
+        self._names: List[str] = list(self.replicas)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._counts = {"writes": 0, "replica_reads": 0, "primary_reads": 0, "replica_failures": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    # ------------------------------------------------------------------
+    # Checkout
+    # ------------------------------------------------------------------
+
+    def write_connection(self) -> PooledConnection:
+        session = _session.get()
+        if session is not None:
+            session.wrote = True
+        self._count("writes")
+        return self.primary.connect()
+
+    def read_connection(self) -> PooledConnection:
+        if self._names and not self._pinned():
+            for name in self._candidates():
+                try:
+                    conn = self.replicas[name].connect()
+                except Exception:
+                    self._count("replica_failures")
+                    logger.warning("Replica %s unavailable; trying the next one", name, exc_info=True)
+                    continue
+                self._count("replica_reads")
+                return conn
+
+        self._count("primary_reads")
+        return self.primary.connect()
+
+    def _pinned(self) -> bool:
+        session = _session.get()
+        return session is not None and (session.wrote or time.time() < session.primary_until)
+
+    def _candidates(self) -> Sequence[str]:
+        # Rotate the starting point so ties (and round robin) spread evenly.
+        start = next(self._turn) % len(self._names)
+        ordered = self._names[start:] + self._names[:start]
+        if self.strategy == LEAST_LOADED:
+            ordered.sort(key=lambda name: self.replicas[name].checked_out)
+        return ordered
+
+    # ------------------------------------------------------------------
+    # Maintenance / introspection
+    # ------------------------------------------------------------------
+
+    def dispose(self) -> None:
+        self.primary.dispose()
+        for pool in self.replicas.values():
+            pool.dispose()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            **self.primary.stats(),
+            "replicas": {name: pool.stats() for name, pool in self.replicas.items()},
+            "routing": {
+                "strategy": self.strategy,
+                "read_your_writes_seconds": self.read_your_writes,
+                **counts,
+            },
+        }
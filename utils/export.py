@@ -0,0 +1,64 @@
+from __future__ import annotations
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from pymysql.cursors import SSDictCursor
+
+EXPORT_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def stream_query(
+    get_connection: Callable[[], Any],
+    query: str,
+    params: Optional[Sequence[Any]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    transform: Optional[Callable[[dict], dict]] = None,
+) -> Iterator[dict]:
+    """Yield rows one by one through an unbuffered server-side cursor.
+
+    Memory stays bounded by ``batch_size`` regardless of table size. If the
+    consumer stops early (client disconnect) the connection still has unread
+    rows on the wire, so it is invalidated rather than returned to the pool.
+    """
+    conn = get_connection()
+    exhausted = False
+    try:
+        cur = conn.cursor(SSDictCursor)
+        cur.execute(query, params or ())
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            if transform is not None:
+                rows = [transform(row) for row in rows]
+            yield from rows
+        cur.close()
+        exhausted = True
+    finally:
+        if exhausted or not hasattr(conn, "invalidate"):
+            conn.close()
+        else:
+            conn.invalidate()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def ndjson_chunks(rows: Iterable[dict], rows_per_chunk: int = 100) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, grouped into write-sized chunks."""
+    buf = []
+    for row in rows:
+        buf.append(json.dumps(row, default=_json_default, separators=(",", ":")))
+        if len(buf) >= rows_per_chunk:
+            yield ("\n".join(buf) + "\n").encode()
+            buf = []
+    if buf:
+        yield ("\n".join(buf) + "\n").encode()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # orjson handles UUID/datetime natively; these are the leftovers.
+    if isinstance(value, BaseModel):
+        # Field values only -- no validation or model_dump() machinery.
+        return value.__dict__
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_response(content: Any, response: Response, status_code: int = 200) -> FastJSONResponse:
+    """Serialize rows/models we built ourselves straight to JSON.
+
+    Returning a Response makes FastAPI skip re-validating ``content`` against
+    the route's ``response_model`` (which stays on the route for the OpenAPI
+    schema). Only use it for data that was read from our own tables or built
+    with validated input. Headers already set on the injected ``response``
+    (cursor, ETag, ...) are carried over.
+    """
+    fast = FastJSONResponse(content, status_code=status_code)
+    for name, value in response.headers.items():
+        if name not in ("content-length", "content-type"):
+            fast.headers[name] = value
+    return fast
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from utils.http_cache import field_of
+
+
+def parse_fields(
+    raw: Optional[Sequence[str]],
+    allowed: Sequence[str],
+    key: str,
+) -> Optional[Tuple[str, ...]]:
+    """Parse ``?fields=name,price`` (or repeated) against a column whitelist.
+
+    Returns None when no projection was asked for. The primary key is always
+    part of the projection so clients can still tell rows apart.
+    """
+    if not raw:
+        return None
+
+    fields = [key]
+    for chunk in raw:
+        for part in chunk.split(","):
+            part = part.strip()
+            if part and part not in fields:
+                fields.append(part)
+
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return tuple(fields)
+
+
+def select_list(fields: Optional[Sequence[str]], *required: str) -> str:
+    """SELECT column list for a projection.
+
+    ``required`` columns (keyset key, ETag timestamp) are read even when the
+    client did not ask for them. Only call with whitelisted names.
+    """
+    if fields is None:
+        return "*"
+    return ", ".join(list(fields) + [c for c in required if c not in fields])
+
+
+def project(row: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Trim a row or model down to the requested fields (no-op without a projection)."""
+    if fields is None:
+        return row
+    return {f: field_of(row, f) for f in fields}
+
+
+def fields_variant(fields: Optional[Sequence[str]]) -> str:
+    """Representation tag mixed into ETags so each projection validates separately."""
+    return ",".join(fields) if fields else ""
+
+
+def with_columns(fields: Optional[Sequence[str]], *columns: str) -> Optional[Tuple[str, ...]]:
+    """Widen a projection with columns the server needs itself (e.g. foreign keys for ?expand=)."""
+    if fields is None:
+        return None
+    return tuple(fields) + tuple(c for c in columns if c not in fields)
+
+
+def parse_expand(raw: Optional[Sequence[str]], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """Parse ``?expand=category,inventory`` (or repeated) against the relations a route offers."""
+    relations = []
+    for chunk in raw or ():
+        for part in chunk.split(","):
+            part = part.strip()
+            if part and part not in relations:
+                relations.append(part)
+
+    unknown = [r for r in relations if r not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown expansion(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return tuple(relations)
+
+
+def expand_variant(rows: Sequence[Dict[str, Any]], relations: Sequence[str]) -> str:
+    """ETag variant for embedded rows: the relations and each embedded row's version.
+
+    The parent's own version does not move when a related row changes, so
+    the embedded versions have to be part of the validator.
+    """
+    return ";".join(
+        relation + "=" + ",".join(
+            str(field_of(row[relation], "version")) if row[relation] is not None else "-" for row in rows
+        )
+        for relation in relations
+    )
@@ -0,0 +1,156 @@
+from __future__ import annotations
+import hashlib
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+# Content codings CompressionMiddleware may tag onto a strong ETag (coded_etag).
+CONTENT_CODINGS = ("gzip", "br")
+
+# Strong ETags built by version_etag: "<version>" or "<version>-<variant hash>",
+# plus a "-<coding>" suffix when the body went out compressed.
+_VERSION_ETAG = re.compile(r'"(\d+)(?:-[0-9a-f]+)?(?:-(?:gzip|br))?"')
+
+
+def field_of(obj: Any, name: str) -> Any:
+    """Read a column from either a raw DictCursor row or a Pydantic model."""
+    return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # DATETIME columns come back naive and are written with utcnow().
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def version_etag(version: int, variant: str = "") -> str:
+    """Strong ETag from the row's version column, so clients can send it back in If-Match."""
+    if variant:
+        # Distinguishes representations of the same row (e.g. ?fields=).
+        return f'"{version}-{hashlib.sha1(variant.encode()).hexdigest()[:8]}"'
+    return f'"{version}"'
+
+
+def if_match_version(request: Request) -> Optional[int]:
+    """The row version a PUT/DELETE is conditional on, from If-Match.
+
+    None when there is no If-Match, or it is ``*`` (the row only has to
+    exist). A weak or foreign tag can never match a version: 412.
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    tags = [tag.strip() for tag in header.split(",") if tag.strip()]
+    if len(tags) != 1:
+        raise HTTPException(status_code=400, detail="If-Match must name exactly one ETag")
+    match = _VERSION_ETAG.fullmatch(tags[0])
+    if match is None:
+        raise HTTPException(status_code=412, detail="If-Match does not name a current version")
+    return int(match.group(1))
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """ETag of a response body sent in ``coding``.
+
+    Strong validators must differ between content codings (RFC 9110
+    8.8.3), so they get a ``-<coding>`` suffix; weak ones are shared.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+def _uncoded(tag: str) -> str:
+    """Opaque tag with any weak prefix and coded_etag suffix removed, for weak comparison."""
+    tag = tag.strip().removeprefix("W/")
+    for coding in CONTENT_CODINGS:
+        suffix = f'-{coding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def version_conflict(expected: int, current: int) -> HTTPException:
+    return HTTPException(status_code=412, detail=f"Version mismatch: expected {expected}, current is {current}")
+
+
+def list_etag(versions: Iterable[Tuple[Any, int]], extra: str = "") -> str:
+    """ETag for a page: changes whenever any row on it (or the page bounds) change.
+
+    Built from row versions, not timestamps: DATETIME columns only resolve
+    to the second, so two writes within one would leave the ETag unchanged.
+    """
+    h = hashlib.sha1(extra.encode())
+    for entity_id, version in versions:
+        h.update(f"{entity_id}|{version};".encode())
+    return f'W/"{h.hexdigest()[:20]}"'
+
+
+def page_validators(
+    rows: Iterable[Any],
+    id_field: str,
+    time_field: str,
+    next_cursor: Optional[str] = None,
+    variant: str = "",
+) -> Tuple[str, Optional[datetime]]:
+    rows = list(rows)
+    last_modified = max((field_of(r, time_field) for r in rows), default=None)
+    extra = next_cursor or ""
+    if variant:
+        extra += f"|{variant}"
+    return list_etag([(field_of(r, id_field), field_of(r, "version")) for r in rows], extra=extra), last_modified
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime],
+    honor_if_modified_since: bool = True,
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2).
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: any coding of the same representation matches.
+        wanted = _uncoded(etag)
+        return any(_uncoded(tag) == wanted for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if honor_if_modified_since and if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime],
+    honor_if_modified_since: bool = True,
+) -> Optional[Response]:
+    """Return a ready 304 if the client copy is fresh, else stamp validators on ``response``."""
+    if is_not_modified(request, etag, last_modified, honor_if_modified_since):
+        not_modified = Response(status_code=304)
+        set_validators(not_modified, etag, last_modified)
+        return not_modified
+    set_validators(response, etag, last_modified)
+    return None
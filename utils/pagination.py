@@ -0,0 +1,94 @@
+from __future__ import annotations
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Pack the keyset position (last row's sort key) into an opaque token."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def decode_id_cursor(cursor: str) -> UUID:
+    """Decode a cursor whose first key is a primary-key UUID."""
+    try:
+        return UUID(str(decode_cursor(cursor)[0]))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(
+    rows: List[Any],
+    limit: int,
+    key: Callable[[Any], Sequence[Any]],
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim a ``LIMIT limit + 1`` result to one page and build the next cursor.
+
+    Queries fetch one extra row so we know whether another page exists
+    without a separate COUNT(*).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
+
+
+def parse_sort(sort: Optional[str], allowed: Sequence[str]) -> Tuple[Optional[str], bool]:
+    """``price`` / ``-price`` -> (column, descending); None keeps primary-key order."""
+    if not sort:
+        return None, False
+    descending = sort.startswith("-")
+    column = sort[1:] if descending else sort
+    if column not in allowed:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unsupported sort: {sort}. Allowed: {', '.join(allowed)} (prefix '-' for descending)",
+        )
+    return column, descending
+
+
+def keyset_after(
+    column: str,
+    key_column: str,
+    value: Any,
+    key: Any,
+    descending: bool = False,
+    nullable: bool = False,
+) -> Tuple[str, List[Any]]:
+    """WHERE fragment for rows after ``(value, key)`` in ``ORDER BY column, key_column``.
+
+    Spelled out as OR'd comparisons rather than a row constructor so MySQL
+    turns it into an index range. MySQL sorts NULL first ascending and last
+    descending; ``column`` and ``key_column`` must be whitelisted names.
+    """
+    op = "<" if descending else ">"
+    if value is None:
+        if descending:
+            return f"({column} IS NULL AND {key_column} < %s)", [key]
+        return f"(({column} IS NULL AND {key_column} > %s) OR {column} IS NOT NULL)", [key]
+
+    sql = f"{column} {op} %s OR ({column} = %s AND {key_column} {op} %s)"
+    if nullable and descending:
+        sql += f" OR {column} IS NULL"
+    return f"({sql})", [value, value, key]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+import os
+import time
+from typing import Any, Iterable, Optional, Union
+from uuid import UUID
+
+DbId = Union[str, bytes]
+
+
+def uuid7() -> UUID:
+    """Time-ordered UUID (RFC 9562 v7): 48-bit ms timestamp, then random bits.
+
+    New rows land at the right-hand edge of the primary-key B-tree instead of
+    at random pages, which keeps inserts sequential.
+    """
+    value = bytearray((time.time_ns() // 1_000_000).to_bytes(6, "big") + os.urandom(10))
+    value[6] = (value[6] & 0x0F) | 0x70  # version 7
+    value[8] = (value[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return UUID(bytes=bytes(value))
+
+
+class UUIDCodec:
+    """The one place that knows how IDs are stored in MySQL.
+
+    Text mode (default) matches the original CHAR(36) schema. Binary mode
+    stores the 16 raw bytes in BINARY(16) columns; run
+    ``migrations/optional/9001_binary_uuid_storage.sql`` before enabling it.
+    Lowercase hex sorts like the raw bytes, so keyset cursors work in both.
+    """
+
+    def __init__(self, binary: bool = False):
+        self.binary = binary
+
+    def configure(self, binary: bool) -> None:
+        self.binary = binary
+
+    def new_id(self) -> UUID:
+        return uuid7()
+
+    def to_db(self, value: Any) -> Optional[DbId]:
+        if value is None:
+            return None
+        if not isinstance(value, UUID):
+            value = UUID(str(value))
+        return value.bytes if self.binary else str(value)
+
+    def to_db_many(self, values: Iterable[Any]) -> list:
+        return [self.to_db(v) for v in values]
+
+    @staticmethod
+    def from_db(value: Any) -> Optional[UUID]:
+        # Accept either representation so reads keep working mid-migration.
+        if value is None or isinstance(value, UUID):
+            return value
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) == 16:
+                return UUID(bytes=bytes(value))
+            value = value.decode()
+        return UUID(value)
+
+    def decode_row(self, row: Optional[dict], *fields: str) -> Optional[dict]:
+        """Convert the given ID columns of a DictCursor row to UUID in place."""
+        if row is not None:
+            for field in fields:
+                if field in row:
+                    row[field] = self.from_db(row[field])
+        return row
+
+
+# Shared instance; main.py switches it to binary mode via DB_BINARY_UUIDS.
+uuid_codec = UUIDCodec()